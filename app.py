@@ -1,14 +1,19 @@
 import streamlit as st
-import streamlit.components.v1 as components
 import pandas as pd
-import json
+import numpy as np
 import os
-from datetime import date, datetime
+from datetime import date, timedelta
+
+from athletikplus import assignments, bulk_import, metrics, models, series, storage, tenants, timeseries, training_load
+from athletikplus.athletes import LIMITS, name_ids
+from athletikplus.date_index import week_range
+from athletikplus.writer import WriteBehind
 
 # -----------------------------
 # Page config (muss früh kommen)
 # -----------------------------
 st.set_page_config(page_title="AthletikPlus", layout="wide")
+metrics.begin_run(st.session_state.get("page", "Dashboard"))
 
 # -----------------------------
 # Global CSS (Figma Look + stabile Cards + Feinschliff)
@@ -22,8 +27,8 @@ st.markdown(
 /* Streamlit Sidebar komplett ausblenden (wir nutzen eigene) */
 [data-testid="stSidebar"] { display: none; }
 
-/* Cards via JS marker */
-.ap-card-parent{
+/* Cards: Container mit key "ap-card-..." tragen die Klasse st-key-ap-card-... (kein JS nötig) */
+div[class*="st-key-ap-card-"]{
   background:#FFFFFF !important;
   border-radius:16px !important;
   border: 0px solid transparent !important;
@@ -31,7 +36,7 @@ st.markdown(
   padding: 18px !important;
 }
 
-.ap-card-parent > div{
+div[class*="st-key-ap-card-"] > div{
   background:#FFFFFF !important;
   border-radius:16px !important;
 }
@@ -101,11 +106,11 @@ div[data-testid="stRadio"] div[role="radiogroup"] label:hover{
 }
 
 /* Markdown Standard-Margins in Cards entfernen */
-.ap-card-parent div[data-testid="stMarkdownContainer"]{
+div[class*="st-key-ap-card-"] div[data-testid="stMarkdownContainer"]{
   margin:0 !important;
   padding:0 !important;
 }
-.ap-card-parent div[data-testid="stMarkdownContainer"] p{
+div[class*="st-key-ap-card-"] div[data-testid="stMarkdownContainer"] p{
   margin:0 !important;
   line-height:1.25 !important;
 }
@@ -117,134 +122,78 @@ div[data-testid="stCheckbox"] label p { margin-bottom:0; }
     unsafe_allow_html=True,
 )
 
-# -----------------------------
-# JS: Marker -> Parent bekommt Klasse ap-card-parent
-# -----------------------------
-components.html(
-    """
-<script>
-(function(){
-  function markCards(){
-    const markers = window.parent.document.querySelectorAll('.ap-card-marker');
-    markers.forEach(m => {
-      let el = m;
-      let best = null;
-
-      for (let i = 0; i < 18; i++){
-        if (!el || !el.parentElement) break;
-        el = el.parentElement;
-
-        const dt = el.getAttribute && el.getAttribute('data-testid');
-        const cls = (el.className || "").toString();
-
-        if (el.tagName === 'DIV' && (dt || cls.includes('st'))){
-          best = el;
-        }
-
-        if (dt && (dt.toLowerCase().includes('border') || dt.toLowerCase().includes('wrapper'))){
-          best = el;
-          break;
-        }
-      }
-
-      if (best) best.classList.add('ap-card-parent');
-    });
-  }
-
-  markCards();
-  setTimeout(markCards, 80);
-  setTimeout(markCards, 250);
-  setTimeout(markCards, 600);
-  setTimeout(markCards, 1200);
-})();
-</script>
-""",
-    height=0,
-)
-
-# -----------------------------
-# Storage files
-# -----------------------------
-ATHLETES_FILE = "athletes.csv"
-PLANS_FILE = "training_plans.json"
-PERFORMANCE_FILE = "performance_data.json"
-SETTINGS_FILE = "settings.json"
-
 # -----------------------------
 # Data load/save
 # -----------------------------
-def load_data():
-    # Settings
-    if os.path.exists(SETTINGS_FILE):
-        try:
-            with open(SETTINGS_FILE, "r") as f:
-                st.session_state.settings = json.load(f)
-        except Exception:
-            st.session_state.settings = {"trainer_name": "Trainer"}
-    else:
-        st.session_state.settings = {"trainer_name": "Trainer"}
-
-    # Athletes
-    if os.path.exists(ATHLETES_FILE):
-        df = pd.read_csv(ATHLETES_FILE)
-        if "Löschen" not in df.columns:
-            df["Löschen"] = False
-        st.session_state.athletes = df
-    else:
-        st.session_state.athletes = pd.DataFrame(
-            columns=["Löschen", "Name", "Alter", "Größe (cm)", "Gewicht (kg)", "Mannschaft", "Sportart"]
-        )
+@st.cache_resource
+def load_catalog(root: str):
+    return tenants.Catalog(root)
 
-    # Plans (+ statuses)
-    if os.path.exists(PLANS_FILE):
-        try:
-            with open(PLANS_FILE, "r") as f:
-                data = json.load(f)
-                if isinstance(data, dict) and "plans" in data:
-                    st.session_state.training_plans = data["plans"]
-                    st.session_state.plan_statuses = data.get("statuses", {})
-                else:
-                    st.session_state.training_plans = data
-                    st.session_state.plan_statuses = {name: True for name in data.keys()}
-        except Exception:
-            st.session_state.training_plans = {}
-            st.session_state.plan_statuses = {}
-    else:
-        st.session_state.training_plans = {}
-        st.session_state.plan_statuses = {}
-
-    # Performance
-    if os.path.exists(PERFORMANCE_FILE):
-        try:
-            with open(PERFORMANCE_FILE, "r") as f:
-                st.session_state.performance_data = json.load(f)
-        except Exception:
-            st.session_state.performance_data = {}
-    else:
-        st.session_state.performance_data = {}
+@st.cache_resource
+def load_metrics_config(root: str) -> bool:
+    # Profiling gilt prozessweit (alle Mandanten), daher aus dem Wurzelverzeichnis
+    metrics.configure_root(root)
+    return True
 
-def save_data():
-    st.session_state.athletes.to_csv(ATHLETES_FILE, index=False)
+MAX_OPEN_TENANTS = int(os.environ.get("ATHLETIKPLUS_MAX_TENANTS", "16"))  # gleichzeitig im Speicher
 
-    plans_to_save = {
-        "plans": st.session_state.training_plans,
-        "statuses": st.session_state.plan_statuses,
-    }
-    with open(PLANS_FILE, "w") as f:
-        json.dump(plans_to_save, f)
+def release_data(loaded) -> None:
+    # Verdrängter Mandant: Ausstehendes schreiben, Schreib-Thread beenden. Sitzungen, die
+    # ihn noch halten, schreiben danach synchron (WriteBehind.request nach close)
+    loaded[1].close()
 
-    with open(PERFORMANCE_FILE, "w") as f:
-        json.dump(st.session_state.performance_data, f)
+@st.cache_resource(max_entries=MAX_OPEN_TENANTS, on_release=release_data)
+def load_data(data_dir: str, tenant: str):
+    # Prozessweit geteilt je Mandant: ein Parse und eine Kopie im Speicher für alle seine Sitzungen.
+    # Der Writer schreibt im Hintergrund; schnelle Änderungsfolgen ergeben einen Schreibvorgang
+    db = storage.open_backend(data_dir, tenant=tenant)
+    return db, WriteBehind(db)
 
-    with open(SETTINGS_FILE, "w") as f:
-        json.dump(st.session_state.settings, f)
+def save_data():
+    # Änderungen sind schon im Speicher sichtbar; geschrieben wird im Hintergrund
+    with metrics.section("save_data"):
+        writer.request()
 
 # -----------------------------
 # Init
 # -----------------------------
-if "data_loaded" not in st.session_state:
-    load_data()
-    st.session_state.data_loaded = True
+DATA_ROOT = os.path.abspath(os.environ.get("ATHLETIKPLUS_DATA", "."))
+catalog = load_catalog(DATA_ROOT)
+load_metrics_config(DATA_ROOT)
+
+def current_tenant() -> str:
+    # Mandant aus der URL (?mandant=...) bzw. der Sitzung; gibt es nur einen, direkt diesen
+    known = catalog.tenants()
+    tenant = st.query_params.get("mandant", st.session_state.get("tenant"))
+    if tenant not in known and len(known) == 1:
+        tenant = next(iter(known))
+    if tenant in known:
+        st.session_state.tenant = tenant
+        return tenant
+    st.title("AthletikPlus")
+    choice = st.selectbox("Mandant", list(known), format_func=known.get, key="tenant_choice")
+    if st.button("Öffnen", key="tenant_open"):
+        st.query_params["mandant"] = choice
+        st.session_state.tenant = choice
+        st.rerun()
+    st.stop()
+
+TENANT = current_tenant()
+DATA_DIR = catalog.data_dir(TENANT)  # nur dieser Mandant wird geladen und geschrieben
+try:
+    with metrics.section("load_data"):
+        db, writer = load_data(DATA_DIR, TENANT)
+    with metrics.section("refresh"):
+        db.refresh()  # Änderungen anderer Prozesse (mtime/Version) übernehmen
+except storage.CorruptFileError as e:
+    # Nicht mit leerem Stand weiterarbeiten: der würde beim nächsten Speichern die Datei ersetzen
+    st.error(str(e))
+    st.stop()
+
+UNITS_PAGE_SIZE = 20  # Einheiten pro "Mehr laden"
+WEEK_VIEW_LIMIT = 30  # Einheiten im Wochenplan des Dashboards
+SERIES_PREVIEW_DAYS = 28  # Serien-Termine werden nur für diesen Zeitraum erzeugt
+ROSTER_PAGE_SIZE = 50  # Zeilen pro Seite im Athleten-Editor
 
 if "page" not in st.session_state:
     st.session_state.page = "Dashboard"
@@ -253,10 +202,17 @@ def set_page(new_page: str):
     st.session_state.page = new_page
     st.rerun()
 
+def card(name: str):
+    # Der key landet als Klasse "st-key-ap-card-<name>" im DOM -> Styling per CSS oben
+    return st.container(border=True, key=f"ap-card-{name}")
+
+def athlete_label(athlete_id: int) -> str:
+    return f"{db.athletes().at[athlete_id, 'Name']} (#{athlete_id})"
+
 # -----------------------------
 # Header (über beide Spalten)
 # -----------------------------
-trainer_name = st.session_state.settings.get("trainer_name", "Trainer")
+trainer_name = db.get_settings().get("trainer_name", "Trainer")
 if st.session_state.page == "Dashboard":
     st.markdown('<div class="ap-label">Dashboard</div>', unsafe_allow_html=True)
     st.markdown(f'<div class="ap-title">Willkommen, {trainer_name}!</div>', unsafe_allow_html=True)
@@ -268,10 +224,9 @@ col_nav, col_main = st.columns([1.15, 3.4], gap="large")
 
 # --- LEFT NAV ---
 with col_nav:
-    trainer_name = st.session_state.settings.get("trainer_name", "Trainer")
+    trainer_name = db.get_settings().get("trainer_name", "Trainer")
 
-    with st.container(border=True):
-        st.markdown('<div class="ap-card-marker"></div>', unsafe_allow_html=True)
+    with card("nav"):
         st.markdown('<div class="ap-nav-title">AthletikPlus</div>', unsafe_allow_html=True)
 
         nav_labels = ["📊 Dashboard", "🧍 Athlet:innen", "📁 Trainingspläne", "📈 Entwicklung", "⚙️ Einstellungen"]
@@ -294,36 +249,66 @@ with col_nav:
             """,
             unsafe_allow_html=True,
         )
+        known_tenants = catalog.tenants()
+        if len(known_tenants) > 1:
+            st.caption(f"🏢 {known_tenants[TENANT]}")
+            if st.button("Mandant wechseln", key="tenant_switch"):
+                st.query_params.pop("mandant", None)
+                st.session_state.pop("tenant", None)
+                st.rerun()
 
 # --- MAIN ---
 with col_main:
-    trainer_name = st.session_state.settings.get("trainer_name", "Trainer")
+    trainer_name = db.get_settings().get("trainer_name", "Trainer")
+
+    if writer.last_error:
+        failed_at, message = writer.last_error
+        st.error(
+            f"Speichern fehlgeschlagen ({failed_at:%H:%M:%S}): {message}. "
+            "Die Änderungen sind noch nicht auf der Festplatte; es wird automatisch erneut versucht."
+        )
+    # Konflikte beim Zusammenführen mit Änderungen anderer Prozesse (seit dem letzten Lauf dieser Sitzung)
+    seen_key = f"conflicts_seen_{TENANT}"
+    for happened_at, message in db.conflicts.since(st.session_state.get(seen_key, db.conflicts.count)):
+        st.warning(f"Konflikt ({happened_at:%H:%M:%S}): {message}")
+    st.session_state[seen_key] = db.conflicts.count
 
     # -------- DASHBOARD --------
     if st.session_state.page == "Dashboard":
-        k1, k2 = st.columns(2, gap="large")
+        k1, k2, k3 = st.columns(3, gap="large")
         with k1:
-            with st.container(border=True):
-                st.markdown('<div class="ap-card-marker"></div>', unsafe_allow_html=True)
+            with card("kpi-athletes"):
                 st.markdown('<div class="ap-kpi-label">Athlet:innen gesamt</div>', unsafe_allow_html=True)
-                st.markdown(f'<div class="ap-kpi-value">{len(st.session_state.athletes)}</div>', unsafe_allow_html=True)
+                st.markdown(f'<div class="ap-kpi-value">{db.athlete_count()}</div>', unsafe_allow_html=True)
 
         with k2:
-            with st.container(border=True):
-                st.markdown('<div class="ap-card-marker"></div>', unsafe_allow_html=True)
+            with card("kpi-plans"):
                 st.markdown('<div class="ap-kpi-label">Trainingspläne gesamt</div>', unsafe_allow_html=True)
-                st.markdown(f'<div class="ap-kpi-value">{len(st.session_state.training_plans)}</div>', unsafe_allow_html=True)
+                st.markdown(f'<div class="ap-kpi-value">{db.plan_count()}</div>', unsafe_allow_html=True)
+
+        # Athlet:innen ohne aktiven zugeordneten Plan (über den Zuordnungsindex, ohne Einheiten anzufassen)
+        roster = db.athlete_index()
+        with metrics.section("dashboard_unassigned"):
+            active_plans = [name for name in db.plan_names() if db.plan_status(name)]
+            unassigned = db.assignment_index().athletes_without_plan(roster, active_plans)
+        with k3:
+            with card("kpi-unassigned"):
+                st.markdown('<div class="ap-kpi-label">Ohne aktiven Plan</div>', unsafe_allow_html=True)
+                st.markdown(f'<div class="ap-kpi-value">{len(unassigned)}</div>', unsafe_allow_html=True)
+        if unassigned:
+            with st.expander(f"Athlet:innen ohne aktiven Plan ({len(unassigned)})"):
+                st.write(", ".join(athlete_label(i) for i in unassigned[:ROSTER_PAGE_SIZE])
+                         + (" …" if len(unassigned) > ROSTER_PAGE_SIZE else ""))
 
         # --- Heute ---
         today_str = str(pd.Timestamp.now().date())
-        units_today = []
-        for plan_name, units in st.session_state.training_plans.items():
-            for u in units:
-                if isinstance(u, dict) and u.get("datum") == today_str:
-                    units_today.append(f"{plan_name}: {u.get('schwerpunkt','')}")
-
-        with st.container(border=True):
-            st.markdown('<div class="ap-card-marker"></div>', unsafe_allow_html=True)
+        with metrics.section("dashboard_today"):
+            units_today = [
+                f"{plan_name}: {u.schwerpunkt}"
+                for plan_name, u in db.units_between(today_str, today_str)
+            ]
+
+        with card("today"):
             st.markdown('<div class="ap-kpi-label">Das steht heute an</div>', unsafe_allow_html=True)
             if units_today:
                 st.markdown(
@@ -338,25 +323,69 @@ with col_main:
                     unsafe_allow_html=True,
                 )
 
+        # --- Wochenplan (gefiltert) ---
+        @st.fragment
+        def week_card():
+            # Fragment: Filter und Woche wechseln rendern nur diese Karte neu
+            with card("week"):
+                st.markdown('<div class="ap-kpi-label">Wochenplan</div>', unsafe_allow_html=True)
+                roster = db.athlete_index()
+                c1, c2, c3 = st.columns([1, 1.6, 1])
+                view = c1.selectbox("Ansicht", ["Alle", "Mannschaft", "Sportart", "Athlet:in"], key="week_view")
+                target = value = None
+                if view == "Mannschaft":
+                    target, value = "teams", c2.selectbox("Mannschaft", roster.teams(), key="week_team")
+                elif view == "Sportart":
+                    target, value = "sports", c2.selectbox("Sportart", roster.sports(), key="week_sport")
+                elif view == "Athlet:in":
+                    target = "athletes"
+                    value = c2.selectbox("Athlet:in", roster.search(), format_func=athlete_label, key="week_athlete")
+                offset = c3.selectbox("Woche", [0, 1], format_func=["Diese Woche", "Nächste Woche"].__getitem__,
+                                      key="week_offset")
+                if target is not None and value is None:
+                    st.caption("Keine Auswahl vorhanden.")
+                    return
+                start, end = week_range(date.today() + timedelta(weeks=offset))
+                with metrics.section("dashboard_week"):
+                    found = assignments.schedule(db, start, end, target, value)
+                if not found:
+                    st.caption("Keine Einheiten in dieser Woche (aktive, zugeordnete Pläne).")
+                    return
+                lines = [
+                    f"{series.WEEKDAYS[date.fromisoformat(u.datum).weekday()]} {u.datum_anzeige} · "
+                    f"<b>{plan_name}</b>: {u.schwerpunkt}"
+                    for plan_name, u in found[:WEEK_VIEW_LIMIT]
+                ]
+                st.markdown("<div style='color:#111827; font-size:14px;'>" + "<br>".join(lines) + "</div>",
+                            unsafe_allow_html=True)
+                if len(found) > WEEK_VIEW_LIMIT:
+                    st.caption(f"… und {len(found) - WEEK_VIEW_LIMIT} weitere")
+
+        week_card()
+
         # --- To Do ---
-        with st.container(border=True):
-            st.markdown('<div class="ap-card-marker"></div>', unsafe_allow_html=True)
-            st.markdown('<div class="ap-kpi-label">To Do:</div>', unsafe_allow_html=True)
-
-            def todo_row(key: str, text: str):
-                c1, c2 = st.columns([0.08, 0.92])
-                with c1:
-                    st.checkbox("", key=key, label_visibility="collapsed")
-                with c2:
-                    st.markdown(
-                        f"<div style='color:#111827; font-weight:400; margin-top:2px;'>{text}</div>",
-                        unsafe_allow_html=True,
-                    )
-
-            todo_row("todo_1", "Athlet:innen check-in")
-            todo_row("todo_2", "Trainingsplan aktualisieren")
-            todo_row("todo_3", "Messwerte eintragen")
-            todo_row("todo_4", "Woche planen")
+        @st.fragment
+        def todo_card():
+            # Fragment: Abhaken rendert nur diese Karte neu
+            with card("todo"):
+                st.markdown('<div class="ap-kpi-label">To Do:</div>', unsafe_allow_html=True)
+
+                def todo_row(key: str, text: str):
+                    c1, c2 = st.columns([0.08, 0.92])
+                    with c1:
+                        st.checkbox("", key=key, label_visibility="collapsed")
+                    with c2:
+                        st.markdown(
+                            f"<div style='color:#111827; font-weight:400; margin-top:2px;'>{text}</div>",
+                            unsafe_allow_html=True,
+                        )
+
+                todo_row("todo_1", "Athlet:innen check-in")
+                todo_row("todo_2", "Trainingsplan aktualisieren")
+                todo_row("todo_3", "Messwerte eintragen")
+                todo_row("todo_4", "Woche planen")
+
+        todo_card()
 
     # -------- ATHLETENVERWALTUNG --------
     elif st.session_state.page == "Athletenverwaltung":
@@ -375,7 +404,7 @@ with col_main:
                 if not name:
                     st.error("Bitte Name eingeben.")
                 else:
-                    new_athlete = pd.DataFrame([{
+                    db.add_athlete({
                         "Löschen": False,
                         "Name": name,
                         "Alter": alter,
@@ -383,22 +412,74 @@ with col_main:
                         "Gewicht (kg)": gewicht,
                         "Mannschaft": mannschaft,
                         "Sportart": sportart,
-                    }])
-                    st.session_state.athletes = pd.concat([st.session_state.athletes, new_athlete], ignore_index=True)
+                    })
                     save_data()
                     st.success("Gespeichert!")
                     st.rerun()
 
         st.subheader("Athlet:innen")
-        edited = st.data_editor(
-            st.session_state.athletes,
+        roster = db.athlete_index()
+
+        # Filter: Index liefert nur IDs, der Editor bekommt nur die aktuelle Seite
+        f1, f2, f3, f4 = st.columns([1.4, 1, 1, 1.2])
+        name_query = f1.text_input("Suche (Name)", key="roster_name", placeholder="z. B. Mül")
+        team_filter = f2.multiselect("Mannschaft", roster.teams(), key="roster_teams")
+        sport_filter = f3.multiselect("Sportart", roster.sports(), key="roster_sports")
+        age_bounds = roster.age_bounds()
+        age_min = age_max = None
+        if age_bounds and age_bounds[0] < age_bounds[1]:
+            age_min, age_max = f4.slider("Alter", *age_bounds, value=age_bounds, key="roster_age")
+            if (age_min, age_max) == age_bounds:
+                age_min = age_max = None  # volle Spanne = kein Filter (auch ohne Alter erfasst)
+
+        with metrics.section("roster_search"):
+            row_ids = roster.search(name_query, team_filter, sport_filter, age_min, age_max)
+
+        page_count = max(1, -(-len(row_ids) // ROSTER_PAGE_SIZE))
+        if st.session_state.get("roster_page", 1) > page_count:
+            st.session_state.roster_page = page_count  # weniger Treffer nach Filter/Löschen
+        if page_count > 1:
+            p1, p2 = st.columns([1, 3])
+            page = p1.number_input("Seite", 1, page_count, 1, key="roster_page") - 1
+            p2.caption(f"{len(row_ids)} Treffer · Seite {page + 1} von {page_count}")
+        else:
+            page = 0
+            st.caption(f"{len(row_ids)} Treffer")
+        page_ids = row_ids[page * ROSTER_PAGE_SIZE:(page + 1) * ROSTER_PAGE_SIZE]
+        athletes = db.athletes().loc[page_ids]
+        metrics.count("athlete_rows_rendered", len(athletes))
+        for message in st.session_state.pop("athlete_conflicts", []):
+            st.warning(message)
+        # Nach jeder übernommenen Änderung (und je Seite) neuer Key -> Editor startet ohne alte Deltas
+        editor_key = f"athlete_editor_{st.session_state.get('athlete_editor_version', 0)}_{hash(tuple(page_ids))}"
+
+        def apply_athlete_edits(editor_key: str, row_ids: list, versions: dict):
+            # Nur die Deltas des Editors übernehmen (Positionen -> stabile IDs); Versionen vom Anzeigen
+            # -> zwischenzeitlich von anderen geänderte Zeilen werden nicht überschrieben
+            delta = st.session_state[editor_key]
+            conflicts = db.update_athletes({row_ids[pos]: cols for pos, cols in delta["edited_rows"].items()}, versions)
+            conflicts += db.delete_athletes([row_ids[pos] for pos in delta["deleted_rows"]], versions)
+            try:
+                db.add_athletes(delta["added_rows"])
+            except ValueError as e:
+                conflicts.append(str(e))
+            st.session_state.athlete_conflicts = conflicts
+            save_data()
+            st.session_state.athlete_editor_version = st.session_state.get("athlete_editor_version", 0) + 1
+
+        st.data_editor(
+            # Kategorien als Text, damit neue Mannschaften/Sportarten eintippbar bleiben
+            athletes.astype({"Mannschaft": "string", "Sportart": "string"}),
             num_rows="dynamic",
-            use_container_width=True,
-            key="athlete_editor",
+            width="stretch",
+            hide_index=True,
+            key=editor_key,
+            on_change=apply_athlete_edits,
+            args=(editor_key, page_ids, db.athlete_versions(page_ids)),
+            # Grenzen wie im Formular; die Spalten sind Int16
+            column_config={col: st.column_config.NumberColumn(min_value=low, max_value=high, step=1)
+                           for col, (low, high) in LIMITS.items()},
         )
-        if not edited.equals(st.session_state.athletes):
-            st.session_state.athletes = edited
-            save_data()
 
     # -------- TRAININGSPLÄNE --------
     elif st.session_state.page == "Trainingspläne":
@@ -409,58 +490,101 @@ with col_main:
             if st.button("Plan anlegen"):
                 if not new_plan_name:
                     st.error("Bitte einen Namen eingeben.")
-                elif new_plan_name in st.session_state.training_plans:
+                elif db.has_plan(new_plan_name):
                     st.warning("Plan existiert bereits.")
                 else:
-                    st.session_state.training_plans[new_plan_name] = []
-                    st.session_state.plan_statuses[new_plan_name] = True
+                    db.create_plan(new_plan_name)
                     save_data()
+                    st.session_state.selected_plan = new_plan_name
                     st.success("Plan angelegt!")
                     st.rerun()
 
-        if not st.session_state.training_plans:
+        if not db.plan_count():
             st.info("Noch keine Trainingspläne vorhanden.")
         else:
-            for plan_name, units in st.session_state.training_plans.items():
-                with st.expander(f"📁 {plan_name}", expanded=False):
-                    is_active = st.session_state.plan_statuses.get(plan_name, True)
+            plan_names = db.plan_names()
+            # Nur der ausgewählte Plan baut seine Widgets auf
+            plan_name = st.selectbox("📁 Plan auswählen", plan_names, key="selected_plan")
+            with st.container(border=True):
+                @st.fragment
+                def plan_status_toggle(plan_name: str):
+                    # Fragment: Umschalten rendert nur den Schalter neu
+                    is_active = db.plan_status(plan_name)
                     new_status = st.toggle("Aktiv", value=is_active, key=f"status_{plan_name}")
                     if new_status != is_active:
-                        st.session_state.plan_statuses[plan_name] = new_status
+                        db.set_plan_status(plan_name, new_status)
                         save_data()
-                        st.rerun()
 
-                    st.write("---")
-                    
-                    # Tabs für bessere Organisation
-                    tab1, tab2 = st.tabs(["📋 Einheiten", "➕ Neue Einheit"])
-                    
-                    with tab2:
+                plan_status_toggle(plan_name)
+
+                st.write("---")
+                
+                # Tabs für bessere Organisation
+                tab1, tab2, tab3 = st.tabs(["📋 Einheiten", "➕ Neue Einheit", "👥 Zuordnung"])
+
+                with tab3:
+                    @st.fragment
+                    def assignment_form(plan_name: str):
+                        # Für wen gilt der Plan: ganze Mannschaften/Sportarten und/oder einzelne Athlet:innen
+                        roster = db.athlete_index()
+                        current = db.plan_assignment(plan_name)
+                        with st.form(f"assign_form_{plan_name}"):
+                            teams = st.multiselect("Mannschaften", sorted(set(roster.teams()) | set(current["teams"])),
+                                                   default=current["teams"], key=f"assign_teams_{plan_name}")
+                            sports = st.multiselect("Sportarten", sorted(set(roster.sports()) | set(current["sports"])),
+                                                    default=current["sports"], key=f"assign_sports_{plan_name}")
+                            athlete_ids = st.multiselect(
+                                "Einzelne Athlet:innen", roster.search(), format_func=athlete_label,
+                                default=[i for i in current["athletes"] if i in roster], key=f"assign_athletes_{plan_name}",
+                            )
+                            if st.form_submit_button("Zuordnung speichern"):
+                                db.assign_plan(plan_name, athlete_ids, teams, sports)
+                                save_data()
+                                st.success("Zuordnung gespeichert!")
+                        covered = db.assignment_index().athletes_for_plan(plan_name, roster)
+                        st.caption(f"Gilt für {len(covered)} Athlet:innen.")
+
+                    assignment_form(plan_name)
+                
+                with tab2:
+                    @st.fragment
+                    def new_unit_form(plan_name: str):
+                        # Fragment: Übungen sammeln ohne kompletten Rerun
                         st.write("**Neue Trainingseinheit erstellen**")
-                        
+                    
                         # Einheits-Grunddaten
                         col1, col2 = st.columns(2)
                         unit_datum = col1.text_input("Datum (TT.MM.JJJJ)", placeholder="01.02.2026", key=f"unit_datum_{plan_name}")
                         unit_schwerpunkt = col2.text_input("Schwerpunkt", placeholder="z.B. Kraft", key=f"unit_schwerpunkt_{plan_name}")
-                        
+
+                        # Serie: eine Regel mit gemeinsamer Übungsvorlage statt vieler Kopien
+                        repeat = st.checkbox("🔁 Wöchentlich wiederholen", key=f"unit_repeat_{plan_name}")
+                        if repeat:
+                            col3, col4 = st.columns(2)
+                            repeat_days = col3.multiselect(
+                                "Wochentage", list(range(7)), format_func=series.WEEKDAYS.__getitem__,
+                                key=f"unit_repeat_days_{plan_name}",
+                            )
+                            repeat_until = col4.text_input("Bis (TT.MM.JJJJ)", placeholder="30.06.2026", key=f"unit_repeat_until_{plan_name}")
+                    
                         st.write("---")
                         st.write("**Übungen hinzufügen**")
-                        
+                    
                         # Session State für temporäre Übungen
                         if f"temp_exercises_{plan_name}" not in st.session_state:
                             st.session_state[f"temp_exercises_{plan_name}"] = []
-                        
+                    
                         # Übungsformular
                         with st.form(f"exercise_form_{plan_name}", clear_on_submit=True):
                             st.write("**Neue Übung**")
                             exc1, exc2 = st.columns(2)
                             ex_name = exc1.text_input("Übungsname", placeholder="z.B. Kniebeugen")
                             ex_saetze = exc2.number_input("Sätze", min_value=1, max_value=20, value=3)
-                            
+                        
                             exc3, exc4 = st.columns(2)
                             ex_wdh = exc3.text_input("Wiederholungen", placeholder="z.B. 10 oder 8-12")
                             ex_intensitaet = exc4.text_input("Intensität/Gewicht", placeholder="z.B. 80% oder 60kg")
-                            
+                        
                             if st.form_submit_button("Übung hinzufügen ➕"):
                                 if ex_name:
                                     new_exercise = {
@@ -470,27 +594,29 @@ with col_main:
                                         "intensitaet": ex_intensitaet
                                     }
                                     st.session_state[f"temp_exercises_{plan_name}"].append(new_exercise)
-                                    st.rerun()
                                 else:
                                     st.error("Bitte Übungsname eingeben!")
-                        
+                    
                         # Zeige hinzugefügte Übungen
                         if st.session_state[f"temp_exercises_{plan_name}"]:
                             st.write("---")
                             st.write("**Übungen in dieser Einheit:**")
-                            
+                        
                             for idx, ex in enumerate(st.session_state[f"temp_exercises_{plan_name}"]):
                                 col_ex1, col_ex2 = st.columns([0.85, 0.15])
                                 with col_ex1:
                                     st.markdown(f"**{idx+1}. {ex['name']}**")
                                     st.caption(f"Sätze: {ex['saetze']} | Wiederholungen: {ex['wiederholungen']} | Intensität: {ex['intensitaet']}")
                                 with col_ex2:
-                                    if st.button("🗑️", key=f"delete_temp_ex_{plan_name}_{idx}"):
-                                        st.session_state[f"temp_exercises_{plan_name}"].pop(idx)
-                                        st.rerun()
-                        
+                                    st.button(
+                                        "🗑️",
+                                        key=f"delete_temp_ex_{plan_name}_{idx}",
+                                        on_click=st.session_state[f"temp_exercises_{plan_name}"].pop,
+                                        args=(idx,),
+                                    )
+                    
                         st.write("---")
-                        
+                    
                         # Einheit speichern
                         col_save1, col_save2 = st.columns([0.7, 0.3])
                         with col_save1:
@@ -502,102 +628,469 @@ with col_main:
                                 else:
                                     try:
                                         # Datum parsen
-                                        if "." in unit_datum:
-                                            dt = datetime.strptime(unit_datum.strip(), "%d.%m.%Y")
-                                        else:
-                                            dt = datetime.fromisoformat(unit_datum.strip())
-                                        
+                                        dt = storage.parse_date(unit_datum)
+                                        until = storage.parse_date(repeat_until) if repeat else None
+                                    except ValueError:
+                                        st.error(f"Fehler beim Datum-Format. Bitte TT.MM.JJJJ verwenden (z.B. 01.02.2026)")
+                                    else:
                                         # Neue Einheit erstellen
                                         new_unit = {
-                                            "datum": dt.date().isoformat(),
+                                            "datum": dt.isoformat(),
                                             "schwerpunkt": unit_schwerpunkt,
                                             "uebungen": st.session_state[f"temp_exercises_{plan_name}"].copy()
                                         }
-                                        
-                                        st.session_state.training_plans[plan_name].append(new_unit)
-                                        st.session_state[f"temp_exercises_{plan_name}"] = []  # Reset
-                                        save_data()
-                                        st.success("✅ Einheit gespeichert!")
-                                        st.rerun()
-                                    except Exception as e:
-                                        st.error(f"Fehler beim Datum-Format. Bitte TT.MM.JJJJ verwenden (z.B. 01.02.2026)")
-                        
-                        with col_save2:
-                            if st.button("🗑️ Alle löschen", key=f"clear_temp_{plan_name}"):
-                                st.session_state[f"temp_exercises_{plan_name}"] = []
-                                st.rerun()
+
+                                        if repeat and until < dt:
+                                            st.error("Das Enddatum der Serie liegt vor dem Startdatum.")
+                                        else:
+                                            if repeat:
+                                                db.add_series(plan_name, {
+                                                    "start": new_unit.pop("datum"),
+                                                    "ende": until.isoformat(),
+                                                    "wochentage": sorted(repeat_days or [dt.weekday()]),
+                                                    **new_unit,
+                                                })
+                                            else:
+                                                db.add_unit(plan_name, new_unit)
+                                            st.session_state[f"temp_exercises_{plan_name}"] = []  # Reset
+                                            save_data()
+                                            st.success("✅ Serie gespeichert!" if repeat else "✅ Einheit gespeichert!")
+                                            st.rerun()
                     
-                    with tab1:
-                        # Bestehende Einheiten anzeigen
-                        if not units:
-                            st.info("Noch keine Einheiten vorhanden. Wechsle zum Tab '➕ Neue Einheit'.")
+                        with col_save2:
+                            st.button(
+                                "🗑️ Alle löschen",
+                                key=f"clear_temp_{plan_name}",
+                                on_click=st.session_state[f"temp_exercises_{plan_name}"].clear,
+                            )
+
+                    new_unit_form(plan_name)
+
+                with tab1:
+                    def delete_unit(plan_name: str, unit_id: str):
+                        db.delete_unit(plan_name, unit_id)
+                        save_data()
+
+                    @st.fragment
+                    @metrics.timed("plan_units")
+                    def unit_list(plan_name: str):
+                        # Fragment: Löschen/"Mehr laden" rendert nur die Liste neu
+                        # Bestehende Einheiten anzeigen (neueste zuerst, seitenweise)
+                        units_total = db.unit_count(plan_name)
+                        limit_key = f"units_limit_{plan_name}"
+                        units_limit = st.session_state.get(limit_key, UNITS_PAGE_SIZE)
+                        if not units_total:
+                            if not db.series(plan_name):
+                                st.info("Noch keine Einheiten vorhanden. Wechsle zum Tab '➕ Neue Einheit'.")
                         else:
-                            # Sortiere nach Datum
-                            sorted_units = sorted(enumerate(units), 
-                                                key=lambda x: x[1].get("datum", ""), 
-                                                reverse=True)
-                            
-                            for original_idx, u in sorted_units:
-                                if isinstance(u, dict):
-                                    st.markdown('<div class="ap-card-marker"></div>', unsafe_allow_html=True)
-                                    with st.container(border=True):
-                                        col_header1, col_header2 = st.columns([0.85, 0.15])
-                                        
-                                        with col_header1:
-                                            dt_val = pd.to_datetime(u.get("datum", ""), errors="coerce")
-                                            display_date = dt_val.strftime("%d.%m.%Y") if not pd.isna(dt_val) else "?"
-                                            st.markdown(f"### 📅 {display_date}")
-                                            st.markdown(f"**🎯 {u.get('schwerpunkt','Kein Schwerpunkt')}**")
-                                        
-                                        with col_header2:
-                                            if st.button("🗑️", key=f"delete_unit_{plan_name}_{original_idx}"):
-                                                st.session_state.training_plans[plan_name].pop(original_idx)
-                                                save_data()
-                                                st.rerun()
-                                        
-                                        st.write("---")
-                                        
-                                        # Übungen anzeigen
-                                        uebungen = u.get("uebungen", [])
-                                        
-                                        if uebungen:
-                                            for idx, ex in enumerate(uebungen):
-                                                if isinstance(ex, dict):
-                                                    # Neue strukturierte Übungen
-                                                    st.markdown(f"**{idx+1}. {ex.get('name', 'Übung')}**")
-                                                    
-                                                    col_detail1, col_detail2, col_detail3 = st.columns(3)
-                                                    with col_detail1:
-                                                        st.caption(f"🔢 Sätze: {ex.get('saetze', '-')}")
-                                                    with col_detail2:
-                                                        st.caption(f"🔁 Wdh: {ex.get('wiederholungen', '-')}")
-                                                    with col_detail3:
-                                                        st.caption(f"💪 Intensität: {ex.get('intensitaet', '-')}")
-                                                    
-                                                    if idx < len(uebungen) - 1:
-                                                        st.write("")
-                                                
-                                                elif isinstance(ex, str):
-                                                    # Alte einfache Übungen (Rückwärtskompatibilität)
-                                                    st.markdown(f"**{idx+1}.** {ex}")
-                                                    if idx < len(uebungen) - 1:
-                                                        st.write("")
+                            units_page = db.recent_units(plan_name, units_limit)
+                            metrics.count("units_rendered", len(units_page))
+                            metrics.count("widgets_rendered", len(units_page))  # Löschen-Button je Einheit
+                            for u in units_page:
+                                with card(f"unit-{u.id}"):
+                                    col_header1, col_header2 = st.columns([0.85, 0.15])
+
+                                    with col_header1:
+                                        st.markdown(f"### 📅 {u.datum_anzeige}")
+                                        st.markdown(f"**🎯 {u.schwerpunkt or 'Kein Schwerpunkt'}**")
+
+                                    with col_header2:
+                                        st.button(
+                                            "🗑️",
+                                            key=f"delete_unit_{plan_name}_{u.id}",
+                                            on_click=delete_unit,
+                                            args=(plan_name, u.id),
+                                        )
+
+                                    st.write("---")
+
+                                    # Übungen anzeigen
+                                    for idx, ex in enumerate(u.uebungen):
+                                        if ex.is_text:
+                                            # Freitext-Übung (Altdaten)
+                                            st.markdown(f"**{idx+1}.** {ex.name}")
                                         else:
-                                            st.caption("Keine Übungen eingetragen.")
-                                    
-                                    st.write("")  # Abstand zwischen Karten
+                                            st.markdown(f"**{idx+1}. {ex.name or 'Übung'}**")
+
+                                            col_detail1, col_detail2, col_detail3 = st.columns(3)
+                                            with col_detail1:
+                                                st.caption(f"🔢 Sätze: {'-' if ex.saetze is None else ex.saetze}")
+                                            with col_detail2:
+                                                st.caption(f"🔁 Wdh: {ex.wiederholungen or '-'}")
+                                            with col_detail3:
+                                                st.caption(f"💪 Intensität: {ex.intensitaet or '-'}")
+
+                                        if idx < len(u.uebungen) - 1:
+                                            st.write("")
+                                    if not u.uebungen:
+                                        st.caption("Keine Übungen eingetragen.")
+
+                                st.write("")  # Abstand zwischen Karten
+
+                            if units_total > units_limit:
+                                st.caption(f"{units_limit} von {units_total} Einheiten angezeigt")
+                                st.button(
+                                    "⬇️ Mehr laden",
+                                    key=f"more_units_{plan_name}",
+                                    on_click=st.session_state.__setitem__,
+                                    args=(limit_key, units_limit + UNITS_PAGE_SIZE),
+                                )
+
+                    def delete_series(plan_name: str, series_id: str):
+                        db.delete_series(plan_name, series_id)
+                        save_data()
+
+                    def skip_occurrence(plan_name: str, series_id: str, select_key: str):
+                        db.skip_occurrence(plan_name, series_id, st.session_state[select_key])
+                        save_data()
+
+                    @st.fragment
+                    @metrics.timed("plan_series")
+                    def series_list(plan_name: str):
+                        # Fragment: Serien als Regel anzeigen, Termine nur für die nächsten Wochen erzeugen
+                        rules = db.series(plan_name)
+                        if not rules:
+                            return
+                        today = date.today()
+                        start = today.isoformat()
+                        end = (today + timedelta(days=SERIES_PREVIEW_DAYS - 1)).isoformat()
+                        for rule in rules:
+                            upcoming = series.materialize(rule, start, end)
+                            metrics.count("series_units_materialized", len(upcoming))
+                            with card(f"series-{rule['id']}"):
+                                col_header1, col_header2 = st.columns([0.85, 0.15])
+                                with col_header1:
+                                    st.markdown(f"### 🔁 {series.describe(rule)}")
+                                    st.markdown(f"**🎯 {rule['schwerpunkt'] or 'Kein Schwerpunkt'}**")
+                                with col_header2:
+                                    st.button(
+                                        "🗑️",
+                                        key=f"delete_series_{rule['id']}",
+                                        help="Serie löschen",
+                                        on_click=delete_series,
+                                        args=(plan_name, rule["id"]),
+                                    )
+
+                                with st.expander(f"{len(rule['uebungen'])} Übungen"):
+                                    for idx, ex in enumerate(models.exercises_from_dicts(rule["uebungen"])):
+                                        if ex.is_text:
+                                            st.caption(f"{idx+1}. {ex.name}")
+                                        else:
+                                            st.caption(
+                                                f"{idx+1}. {ex.name or 'Übung'} · {'-' if ex.saetze is None else ex.saetze} Sätze · "
+                                                f"{ex.wiederholungen or '-'} Wdh · {ex.intensitaet or '-'}"
+                                            )
+
+                                if upcoming:
+                                    st.caption("Nächste Termine: " + ", ".join(u.datum_anzeige for u in upcoming))
+                                    col_skip1, col_skip2 = st.columns([0.6, 0.4])
+                                    skip_key = f"skip_{rule['id']}"
+                                    col_skip1.selectbox(
+                                        "Termin", [u.datum for u in upcoming], format_func=storage.display_date,
+                                        key=skip_key, label_visibility="collapsed",
+                                    )
+                                    col_skip2.button(
+                                        "Termin entfällt",
+                                        key=f"skip_series_{rule['id']}",
+                                        on_click=skip_occurrence,
+                                        args=(plan_name, rule["id"], skip_key),
+                                    )
+                                else:
+                                    st.caption(f"Keine Termine in den nächsten {SERIES_PREVIEW_DAYS} Tagen.")
+                                if rule.get("ausnahmen"):
+                                    st.caption("Entfällt: " + ", ".join(storage.display_date(d) for d in rule["ausnahmen"]))
+
+                    series_list(plan_name)
+                    unit_list(plan_name)
 
     # -------- ENTWICKLUNG --------
     elif st.session_state.page == "Entwicklung":
         st.title("Entwicklung")
-        st.info("Dieser Bereich kommt als nächstes (Charts, Messwerte, Trends).")
+        measurements = db.measurements()
+        roster = db.athletes()
+        # Messwerte hängen an der ID; angezeigt wird der Name
+        athlete_labels = {int(i): name if isinstance(name, str) and name else f"#{i}"
+                          for i, name in roster["Name"].items()}
+        athlete_ids = sorted(athlete_labels, key=lambda i: athlete_labels[i].casefold())
+
+        with st.expander("➕ Messwert eintragen"):
+            with st.form("measurement_form", clear_on_submit=True):
+                c1, c2 = st.columns(2)
+                m_athlete = c1.selectbox("Athlet:in", athlete_ids, format_func=athlete_labels.get)
+                m_metric = c2.text_input("Metrik", placeholder="z. B. Sprint 30 m (s)")
+                m_date = c1.date_input("Datum", value=date.today())
+                m_value = c2.number_input("Wert", value=0.0, step=0.1, format="%.2f")
+
+                if st.form_submit_button("Messwert speichern"):
+                    if m_athlete is None or not m_metric.strip():
+                        st.error("Bitte Athlet:in und Metrik angeben.")
+                    else:
+                        db.record_measurement(m_athlete, m_metric.strip(), str(m_date), float(m_value))
+                        save_data()
+                        st.success("Gespeichert!")
+                        st.rerun()
+
+        tab_person, tab_team, tab_load = st.tabs(["👤 Athlet:in", "👥 Team", "🏋️ Trainingslast"])
+        if not len(measurements):
+            tab_person.info("Noch keine Messwerte erfasst.")
+            tab_team.info("Noch keine Messwerte erfasst.")
+        else:
+            with tab_person:
+                @st.fragment
+                @metrics.timed("dev_progress")
+                def progress_card():
+                    # Fragment: Auswahl ändern rendert nur diesen Chart neu
+                    with card("progress"):
+                        c1, c2, c3 = st.columns(3)
+                        measured = set(measurements.athletes())
+                        options = [i for i in athlete_ids if i in measured]  # gelöschte Athlet:innen nicht
+                        if not options:
+                            st.caption("Noch keine Messwerte erfasst.")
+                            return
+                        athlete = c1.selectbox("Athlet:in", options, format_func=athlete_labels.get,
+                                               key="dev_athlete")
+                        metric = c2.selectbox("Metrik", measurements.metrics(athlete), key="dev_metric")
+                        window = c3.selectbox("Gleitendes Mittel", [7, 14, 28], format_func=lambda d: f"{d} Tage", key="dev_window")
+                        lower_is_better = st.checkbox("Kleiner ist besser (z. B. Zeiten)", key=f"dev_lower_{metric}")
+
+                        series = measurements.series(athlete, metric)
+                        if not len(series):
+                            st.caption("Keine Messwerte für diese Auswahl.")
+                            return
+                        best = measurements.personal_best(athlete, metric, lower_is_better)
+                        _, _, delta = measurements.week_over_week(athlete, metric)
+
+                        k1, k2, k3 = st.columns(3)
+                        k1.metric("Letzter Wert", f"{series.values[-1]:.2f}")
+                        k2.metric("Bestwert", f"{best[1]:.2f}", help=f"am {timeseries.to_dates([best[0]])[0]}")
+                        if len(delta) and not np.isnan(delta[-1]):
+                            k3.metric("Δ Vorwoche (Ø)", f"{delta[-1]:+.2f}",
+                                      delta_color="inverse" if lower_is_better else "normal")
+                        else:
+                            k3.metric("Δ Vorwoche (Ø)", "–")
+
+                        rolling = measurements.rolling_mean(athlete, metric, window)
+                        idx = timeseries.downsample_index(series.values)
+                        st.line_chart(pd.DataFrame(
+                            {"Wert": series.values[idx], f"Ø {window} Tage": rolling[idx]},
+                            index=pd.Index(timeseries.to_dates(series.days[idx]), name="Datum"),
+                        ))
+
+                progress_card()
+
+            with tab_team:
+                @st.fragment
+                @metrics.timed("dev_team")
+                def team_card():
+                    with card("team"):
+                        teams = sorted(roster["Mannschaft"].dropna().unique())
+                        if not teams:
+                            st.caption("Keine Mannschaften eingetragen.")
+                            return
+                        c1, c2, c3 = st.columns(3)
+                        team = c1.selectbox("Mannschaft", teams, key="dev_team")
+                        members = roster.index[roster["Mannschaft"] == team].tolist()
+                        team_metrics = sorted({m for athlete_id in members for m in measurements.metrics(athlete_id)})
+                        if not team_metrics:
+                            st.caption("Für diese Mannschaft gibt es noch keine Messwerte.")
+                            return
+                        metric = c2.selectbox("Metrik", team_metrics, key="dev_team_metric")
+                        how_labels = {"mean": "Mittel", "max": "Maximum", "min": "Minimum", "count": "Anzahl"}
+                        how = c3.selectbox("Wochenwert", list(how_labels), format_func=how_labels.get, key="dev_team_how")
+
+                        weeks, values = measurements.team_aggregate(members, metric, how)
+                        idx = timeseries.downsample_index(values)
+                        st.line_chart(pd.DataFrame(
+                            {how_labels[how]: values[idx]},
+                            index=pd.Index(timeseries.week_start(weeks[idx]), name="Woche"),
+                        ))
+                        st.caption(f"{len(members)} Athlet:innen, {len(weeks)} Wochen mit Messwerten")
+
+                team_card()
+
+        with tab_load:
+            @st.fragment
+            @metrics.timed("dev_load")
+            def load_card():
+                load = db.training_load()
+                with card("load"):
+                    if not len(load):
+                        st.caption("Noch keine Einheiten mit Übungen.")
+                        return
+                    c1, c2 = st.columns([3, 1])
+                    plans = c1.multiselect("Pläne", load.plan_names, key="load_plans", placeholder="Alle Pläne")
+                    measure = c2.selectbox("Größe", list(training_load.MEASURES),
+                                           format_func=training_load.MEASURES.get, key="load_measure")
+                    label = training_load.MEASURES[measure]
+
+                    weeks, sums = load.weekly(measure, plans)
+                    if not len(weeks):
+                        st.caption("Keine Einheiten in dieser Auswahl.")
+                        return
+                    today = int(timeseries.to_days([date.today().isoformat()])[0])
+                    days, acute, chronic, ratio = load.acwr(measure, plans)
+                    # Bezugstag: heute, außerhalb der Daten der erste bzw. letzte Tag mit Daten
+                    i = int(np.clip(today - days[0], 0, len(days) - 1))
+                    k1, k2, k3 = st.columns(3)
+                    k1.metric("Akut (7 Tage)", f"{acute[i]:,.0f}".replace(",", "."))
+                    k2.metric("Chronisch (Ø Woche, 28 Tage)", f"{chronic[i]:,.0f}".replace(",", "."))
+                    k3.metric("ACWR", "–" if np.isnan(ratio[i]) else f"{ratio[i]:.2f}",
+                              help="Akute zu chronischer Last; üblicher Zielbereich etwa 0,8–1,3.")
+
+                    st.caption(f"{label} je Woche")
+                    st.bar_chart(pd.DataFrame({label: sums}, index=pd.Index(timeseries.week_start(weeks), name="Woche")))
+                    idx = timeseries.downsample_index(np.nan_to_num(ratio[:i + 1]))
+                    st.caption("ACWR je Tag")
+                    st.line_chart(pd.DataFrame({"ACWR": ratio[idx]}, index=pd.Index(timeseries.to_dates(days[idx]), name="Datum")))
+
+                    c1, c2 = st.columns(2)
+                    with c1:
+                        st.caption("Sätze je Intensitätszone (% 1RM)")
+                        st.bar_chart(pd.DataFrame(
+                            {"Sätze": load.intensity_distribution(plans)},
+                            index=pd.Index(training_load.INTENSITY_LABELS, name="Zone"),
+                        ))
+                    with c2:
+                        st.caption("ACWR je Plan")
+                        by_plan = load.acwr_by_plan(measure, day=int(days[i]))
+                        st.dataframe(
+                            pd.DataFrame(
+                                [(name, *values) for name, values in by_plan.items() if not plans or name in plans],
+                                columns=["Plan", "Akut", "Chronisch", "ACWR"],
+                            ).sort_values("ACWR", ascending=False, na_position="last"),
+                            hide_index=True, height=300,
+                        )
+
+                    # Je Athlet:in: Summe der Tageslast ihrer Pläne (direkt, Mannschaft, Sportart)
+                    st.caption("ACWR je Athlet:in (Summe der zugeordneten Pläne)")
+                    index, roster_index = db.assignment_index(), db.athlete_index()
+                    by_athlete = load.acwr_by_athlete(index, roster_index, measure, day=int(days[i]), plans=plans)
+                    if not by_athlete:
+                        st.caption("Keiner Athlet:in ist ein Plan dieser Auswahl zugeordnet.")
+                        return
+                    c1, c2 = st.columns(2)
+                    with c1:
+                        st.dataframe(
+                            pd.DataFrame(
+                                [(athlete_labels.get(athlete_id, f"#{athlete_id}"), *values)
+                                 for athlete_id, values in by_athlete.items()],
+                                columns=["Athlet:in", "Akut", "Chronisch", "ACWR"],
+                            ).sort_values("ACWR", ascending=False, na_position="last"),
+                            hide_index=True, height=300,
+                        )
+                    with c2:
+                        options = sorted(by_athlete, key=lambda a: athlete_labels.get(a, "").casefold())
+                        athlete = st.selectbox("Athlet:in", options, key="load_athlete",
+                                               format_func=lambda a: athlete_labels.get(a, f"#{a}"))
+                        own = index.plans_for_athlete(athlete, roster_index)
+                        a_days, _, _, a_ratio = load.acwr(measure, [p for p in own if not plans or p in plans])
+                        j = int(np.clip(today - a_days[0], 0, len(a_days) - 1))
+                        idx = timeseries.downsample_index(np.nan_to_num(a_ratio[:j + 1]))
+                        st.line_chart(pd.DataFrame({"ACWR": a_ratio[idx]},
+                                                   index=pd.Index(timeseries.to_dates(a_days[idx]), name="Datum")))
+
+            load_card()
 
     # -------- SETTINGS --------
     elif st.session_state.page == "Settings":
         st.title("Einstellungen")
         new_name = st.text_input("Trainer Name", trainer_name)
         if st.button("Speichern"):
-            st.session_state.settings["trainer_name"] = new_name
+            db.set_setting("trainer_name", new_name)
             save_data()
             st.success("Gespeichert!")
             st.rerun()
+
+        # --- Mandanten ---
+        st.subheader("🏢 Mandanten")
+        st.caption("Jeder Mandant (Trainer:in, Verein) hat eigene Athlet:innen, Pläne und Messwerte. "
+                   "Aufruf über ?mandant=<ID> in der Adresse.")
+        st.dataframe(
+            pd.DataFrame(list(catalog.tenants().items()), columns=["ID", "Name"]),
+            hide_index=True,
+        )
+        with st.form("tenant_form", clear_on_submit=True):
+            tenant_name = st.text_input("Neuer Mandant", placeholder="z. B. TSV U17")
+            if st.form_submit_button("Mandant anlegen"):
+                try:
+                    tenant_id = catalog.add(tenant_name)
+                except ValueError as e:
+                    st.error(str(e))
+                else:
+                    st.success(f"Angelegt: ?mandant={tenant_id}")
+
+        # --- Datenimport ---
+        st.subheader("📥 Datenimport")
+        import_labels = {
+            bulk_import.ATHLETES: "Athlet:innen",
+            bulk_import.UNITS: "Trainingseinheiten (eine Zeile je Übung)",
+            bulk_import.MEASUREMENTS: "Messwerte",
+        }
+        import_kind = st.selectbox("Was wird importiert?", list(import_labels), format_func=import_labels.get)
+        st.caption("Spalten: " + ", ".join(
+            f"{col}{'' if required else ' (optional)'}" for col, required in bulk_import.COLUMNS[import_kind].items()
+        ))
+        upload = st.file_uploader("Datei (CSV, Excel, JSON)", type=["csv", "txt", "xlsx", "xls", "json", "jsonl"])
+
+        if upload is not None:
+            # Prüfergebnis pro Datei merken, damit Reruns nicht erneut parsen
+            check_key = (upload.file_id, import_kind)
+            if st.session_state.get("import_done") == check_key:
+                st.success("Import abgeschlossen!")
+            elif st.session_state.get("import_check", (None, None))[0] != check_key:
+                try:
+                    result = bulk_import.validate_file(upload, upload.name, import_kind,
+                                                       name_ids=name_ids(db.athletes()))
+                except ValueError as e:
+                    result = str(e)  # Fehlermeldung (z. B. unbekanntes Format)
+                st.session_state.import_check = (check_key, result)
+            result = st.session_state.get("import_check", (None, None))[1]
+
+            if isinstance(result, str):
+                st.error(result)
+            elif result is not None and st.session_state.get("import_done") != check_key:
+                st.write(f"{result.rows} Zeilen gelesen, **{result.valid}** Datensätze gültig, "
+                         f"{result.error_rows()} Zeilen fehlerhaft.")
+                if result.error_rows():
+                    st.dataframe(result.errors.head(500), hide_index=True, width="stretch")
+                if result.valid and st.button(f"✅ {result.valid} Datensätze importieren", type="primary"):
+                    bulk_import.apply(db, result)
+                    save_data()
+                    st.session_state.import_done = check_key  # gleiche Datei nicht doppelt importieren
+                    st.session_state.pop("import_check", None)
+                    st.rerun()
+
+        # --- Profiling ---
+        st.subheader("⏱️ Profiling")
+        profiling = st.toggle(
+            "Laufzeiten messen",
+            value=metrics.enabled(),
+            help=f"Misst Laden, Speichern und Rendering und schreibt jeden Lauf nach {metrics.LOG_FILE} "
+                 "im Wurzelverzeichnis. Gilt für die ganze Installation (alle Mandanten).",
+        )
+        if profiling != metrics.enabled():
+            metrics.save_enabled(DATA_ROOT, profiling)
+            st.rerun()
+
+        if metrics.enabled():
+            section_rows = metrics.sections()
+            if section_rows:
+                st.dataframe(pd.DataFrame(section_rows), hide_index=True, width="stretch")
+            else:
+                st.caption("Noch keine Messwerte - einfach durch die App klicken.")
+            counter_values = metrics.counters()
+            if counter_values:
+                st.dataframe(
+                    pd.DataFrame({"Zähler": list(counter_values), "Wert": list(counter_values.values())}),
+                    hide_index=True, width="stretch",
+                )
+            runs = metrics.recent_runs()
+            if runs:
+                runs_df = pd.DataFrame(runs)
+                st.caption(f"Letzte {len(runs)} Läufe (ms je Lauf)")
+                st.line_chart(runs_df["ms"])
+                c1, c2 = st.columns(2)
+                c1.download_button("⬇️ Läufe als CSV", runs_df.to_csv(index=False), "metrics.csv", "text/csv")
+                c2.button("Zurücksetzen", on_click=metrics.reset)
+
+metrics.end_run()
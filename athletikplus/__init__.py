@@ -0,0 +1 @@
+"""Datenkern von AthletikPlus (ohne Streamlit-Abhängigkeit)."""
@@ -0,0 +1,6 @@
+"""``python -m athletikplus ...`` (siehe ``athletikplus.cli``)."""
+import sys
+
+from athletikplus.cli import main
+
+sys.exit(main())
@@ -0,0 +1,110 @@
+"""Zuordnung von Plänen zu Athlet:innen, Mannschaften und Sportarten.
+
+Ein Plan gilt für die direkt zugeordneten Athlet:innen und für alle
+Mitglieder der zugeordneten Mannschaften und Sportarten. Mitglieder werden
+über ``RosterIndex`` aufgelöst, neue Mitglieder einer Mannschaft bekommen
+deren Pläne also ohne eigene Zuordnung.
+
+``AssignmentIndex`` hält beide Richtungen (Plan -> Ziele, Ziel -> Pläne) und
+wird bei jeder Zuordnung nachgeführt (wie ``DateIndex``/``RosterIndex``).
+Wochenpläne je Athlet:in oder Mannschaft fragen damit nur die betroffenen
+Pläne im ``DateIndex`` ab (``schedule``).
+"""
+TARGETS = ("athletes", "teams", "sports")
+TARGET_LABELS = {"athletes": "Athlet:innen", "teams": "Mannschaften", "sports": "Sportarten"}
+
+
+def normalize_assignment(assignment: dict) -> dict:
+    """``{"athletes": [id, ...], "teams": [...], "sports": [...]}``, sortiert und ohne Doppelte."""
+    assignment = assignment or {}
+    return {
+        "athletes": sorted({int(i) for i in assignment.get("athletes", ())}),
+        "teams": sorted({str(t) for t in assignment.get("teams", ()) if str(t)}),
+        "sports": sorted({str(s) for s in assignment.get("sports", ()) if str(s)}),
+    }
+
+
+class AssignmentIndex:
+    def __init__(self, assignments: dict = None):
+        self._plans = {}                                # plan -> Zuordnung
+        self._by = {target: {} for target in TARGETS}   # ziel -> {wert: {plan}}
+        for plan, assignment in (assignments or {}).items():
+            self.set(plan, assignment)
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+    # -----------------------------
+    # Nachführen
+    # -----------------------------
+    def set(self, plan: str, assignment: dict) -> None:
+        """Ersetzt die Zuordnung von ``plan`` (leer = keine)."""
+        self.remove(plan)
+        assignment = normalize_assignment(assignment)
+        if not any(assignment.values()):
+            return
+        self._plans[plan] = assignment
+        for target, values in assignment.items():
+            for value in values:
+                self._by[target].setdefault(value, set()).add(plan)
+
+    def remove(self, plan: str) -> None:
+        assignment = self._plans.pop(plan, None)
+        if assignment is None:
+            return
+        for target, values in assignment.items():
+            for value in values:
+                plans = self._by[target][value]
+                plans.discard(plan)
+                if not plans:
+                    del self._by[target][value]
+
+    def to_dict(self) -> dict:
+        return {plan: dict(assignment) for plan, assignment in self._plans.items()}
+
+    # -----------------------------
+    # Abfragen
+    # -----------------------------
+    def assignment(self, plan: str) -> dict:
+        return dict(self._plans.get(plan) or normalize_assignment({}))
+
+    def plans_for(self, target: str, value) -> set:
+        """Direkt zugeordnete Pläne eines Ziels (``target`` aus ``TARGETS``)."""
+        return set(self._by[target].get(value, ()))
+
+    def plans_for_athlete(self, athlete_id: int, roster) -> set:
+        """Pläne der Athlet:in: direkt sowie über ihre Mannschaft und Sportart."""
+        team, sport = roster.groups(athlete_id)
+        return self.plans_for("athletes", athlete_id) | self.plans_for("teams", team) | self.plans_for("sports", sport)
+
+    def athletes_for_plan(self, plan: str, roster) -> set:
+        assignment = self._plans.get(plan)
+        if assignment is None:
+            return set()
+        direct = {athlete_id for athlete_id in assignment["athletes"] if athlete_id in roster}
+        return direct | roster.members(assignment["teams"], assignment["sports"])
+
+    def athletes_without_plan(self, roster, plans=None) -> list:
+        """IDs (aufsteigend) ohne einen der ``plans`` (Standard: alle zugeordneten Pläne)."""
+        covered = set()
+        for plan in self._plans if plans is None else plans:
+            covered |= self.athletes_for_plan(plan, roster)
+        return [athlete_id for athlete_id in roster.search() if athlete_id not in covered]
+
+
+def schedule(backend, start: str, end: str, target: str = None, value=None, active_only: bool = True) -> list:
+    """``(plan_name, unit)`` im Zeitraum für ein Ziel (ohne ``target``: alle Pläne), inkl. Serien-Terminen.
+
+    ``target="athletes"`` berücksichtigt auch Mannschaft und Sportart der Athlet:in.
+    """
+    plans = None
+    if target is not None:
+        index = backend.assignment_index()
+        if target == "athletes":
+            plans = index.plans_for_athlete(value, backend.athlete_index())
+        else:
+            plans = index.plans_for(target, value)
+    if active_only:
+        names = backend.plan_names() if plans is None else plans
+        plans = {name for name in names if backend.plan_status(name)}
+    return backend.units_between(start, end, plans=plans)
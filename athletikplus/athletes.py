@@ -0,0 +1,130 @@
+"""Athlet:innen-Tabelle: stabile IDs (Index ``id``), kompakte Datentypen, Zeilen-Updates."""
+import pandas as pd
+
+ATHLETE_COLUMNS = ["Löschen", "Name", "Alter", "Größe (cm)", "Gewicht (kg)", "Mannschaft", "Sportart"]
+CATEGORY_COLUMNS = ["Mannschaft", "Sportart"]
+INT_COLUMNS = ["Alter", "Größe (cm)", "Gewicht (kg)"]
+DTYPES = {
+    "Löschen": "bool",
+    "Name": "string",
+    "Alter": "Int16",
+    "Größe (cm)": "Int16",
+    "Gewicht (kg)": "Int16",
+    "Mannschaft": "category",
+    "Sportart": "category",
+}
+# Gültige Werte der Zahlenspalten (Formular, Editor, Import); passen sicher in Int16
+LIMITS = {"Alter": (1, 100), "Größe (cm)": (50, 250), "Gewicht (kg)": (10, 250)}
+
+
+def empty_frame() -> pd.DataFrame:
+    return normalize(pd.DataFrame(columns=ATHLETE_COLUMNS, index=pd.Index([], name="id")))
+
+
+def normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """Bringt Spalten, Typen und Index (``id``) in die kanonische Form."""
+    df = df.reindex(columns=ATHLETE_COLUMNS)
+    df["Löschen"] = df["Löschen"].fillna(False).astype(bool)
+    for col in INT_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors="coerce").round().astype("Int16")
+    df["Name"] = df["Name"].astype("string")
+    for col in CATEGORY_COLUMNS:
+        df[col] = df[col].astype("string").astype("category")
+    df.index = df.index.astype("int64")
+    df.index.name = "id"
+    return df
+
+
+def name_ids(df: pd.DataFrame) -> dict:
+    """``{name: id}``; bei gleichen Namen gilt die kleinste ID (Zuordnung von Altdaten und Importen)."""
+    names = df["Name"].dropna().sort_index(ascending=False)
+    return dict(zip(names.tolist(), names.index.tolist()))
+
+
+def invalid_values(cols: dict) -> dict:
+    """``{spalte: grund}`` für Werte in ``cols``, die keine Zahl sind oder außerhalb von ``LIMITS`` liegen."""
+    errors = {}
+    for col, value in cols.items():
+        if col not in LIMITS or clean_value(value) is None:
+            continue
+        low, high = LIMITS[col]
+        try:
+            ok = low <= round(float(value)) <= high
+        except (TypeError, ValueError, OverflowError):
+            errors[col] = f"{col} „{value}“ ist keine Zahl"
+            continue
+        if not ok:
+            errors[col] = f"{col} {value} liegt nicht zwischen {low} und {high}"
+    return errors
+
+
+def drop_invalid(changes: dict, label) -> list:
+    """Entfernt ungültige Zellen (``invalid_values``) aus ``changes`` (``{id: {spalte: wert}}``).
+
+    Gibt die Meldungen zurück; ``label(id)`` benennt die Zeile darin.
+    """
+    messages = []
+    for athlete_id, cols in list(changes.items()):
+        errors = invalid_values(cols)
+        if errors:
+            messages.append(f"{label(athlete_id)}: {'; '.join(errors.values())}. Nicht übernommen.")
+            changes[athlete_id] = {col: v for col, v in cols.items() if col not in errors}
+    return messages
+
+
+def check_rows(rows: list) -> None:
+    """``ValueError`` mit allen Gründen, wenn eine neue Zeile ungültige Zahlenwerte hat."""
+    errors = [f"Neue Zeile {i}: {'; '.join(e.values())}." for i, e in enumerate(map(invalid_values, rows), 1) if e]
+    if errors:
+        raise ValueError(" ".join(errors) + " Nicht angelegt.")
+
+
+def assign_ids(df: pd.DataFrame) -> bool:
+    """Altdaten ohne ``id``-Spalte bekommen fortlaufende IDs ab 1."""
+    if df.index.name == "id":
+        return False
+    df.index = pd.RangeIndex(1, len(df) + 1, name="id")
+    return True
+
+
+def clean_value(value):
+    """JSON-taugliche Zellwerte (``pd.NA``/NaN -> ``None``, numpy -> Python)."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+def _ensure_categories(df: pd.DataFrame, col: str, values) -> None:
+    if col in CATEGORY_COLUMNS:
+        new = {str(v) for v in map(clean_value, values) if v is not None} - set(df[col].cat.categories)
+        if new:
+            df[col] = df[col].cat.add_categories(sorted(new))
+
+
+def add_rows(df: pd.DataFrame, rows: list, ids: list) -> pd.DataFrame:
+    new = pd.DataFrame(rows, index=pd.Index(ids, name="id"))
+    for col in CATEGORY_COLUMNS:
+        if col in new.columns:
+            _ensure_categories(df, col, new[col].tolist())
+    new = normalize(new)
+    for col in CATEGORY_COLUMNS:
+        new[col] = new[col].cat.set_categories(df[col].cat.categories)
+    return pd.concat([df.drop(index=[i for i in ids if i in df.index]), new])
+
+
+def update_rows(df: pd.DataFrame, changes: dict) -> None:
+    """``changes``: ``{id: {spalte: wert}}``; unbekannte IDs werden ignoriert (idempotent)."""
+    for athlete_id, cols in changes.items():
+        if athlete_id not in df.index:
+            continue
+        for col, value in cols.items():
+            if col not in df.columns:
+                continue
+            if col == "Löschen":
+                value = bool(value)
+            _ensure_categories(df, col, [value])
+            df.loc[athlete_id, col] = pd.NA if value is None else value
+
+
+def delete_rows(df: pd.DataFrame, ids: list) -> pd.DataFrame:
+    return df.drop(index=[i for i in ids if i in df.index])
@@ -0,0 +1,274 @@
+"""Binärer Snapshot des geparsten Stands für einen schnellen Kaltstart.
+
+Nach jedem Schreiben eines Snapshots liegt daneben eine ``.bin``-Datei
+(``training_plans.json`` -> ``training_plans.bin``) mit demselben Inhalt in
+fertig geparster, gepackter Form:
+
+* Athlet:innen: die Spalten des normalisierten DataFrames (Werte, Masken,
+  Kategorie-Codes) und die sortierten Schlüssel des Suchindex,
+* Pläne: spaltenweise (Texte mit ``SEP`` verbunden, Zahlen als Arrays),
+  Übungen als Tabelle plus Codes, dazu die Sortierreihenfolgen des
+  Datumsindex (gesamt und je Plan),
+* Leistungsdaten: Texte verbunden, Werte als ``float64``.
+
+Entpacken kostet nur noch einige Millisekunden statt ``read_csv``/``json.load``
+und Aufbau der Datensätze.
+
+Die Datei ist eine Folge von ``.npy``-Blöcken (``np.save``), gelesen mit
+``np.load(allow_pickle=False)``: nur Zahlen- und Byte-Arrays, kein Pickle,
+Lesen führt also keinen Code aus. Texte liegen als UTF-8-Bytes vor, kleine
+Strukturen (Namen, Status, Zuordnungen) als JSON. Der erste Block enthält
+``FORMAT``, einen Schlüssel (Schema- bzw. pandas-Version) und die Signatur
+(mtime/Größe) des Snapshots, aus dem die Datei entstand. Passt etwas davon
+nicht oder ist sie unlesbar, wird die Textdatei gelesen; das Journal wird in
+beiden Fällen nachgespielt.
+"""
+import io
+import json
+import os
+from functools import partial
+from itertools import accumulate, chain, islice, repeat
+
+import numpy as np
+
+from athletikplus import models
+from athletikplus.fileio import atomic_write
+from athletikplus.models import Unit
+
+FORMAT = 2
+SEP = "\0"
+
+_new_unit = partial(tuple.__new__, Unit)  # wie ``Unit._make``, ohne Python-Aufruf je Einheit
+
+
+def binary_path(snapshot_path: str) -> str:
+    root, _ = os.path.splitext(snapshot_path)
+    return root + ".bin"
+
+
+# -----------------------------
+# Datei
+# -----------------------------
+def _save_json(f, value) -> None:
+    np.save(f, np.frombuffer(json.dumps(value).encode("utf-8"), dtype=np.uint8), allow_pickle=False)
+
+
+def _load_json(f):
+    return json.loads(np.load(f, allow_pickle=False).tobytes())
+
+
+def _header(key, signature) -> dict:
+    # Über JSON abgeglichen: Tupel werden dabei zu Listen
+    return json.loads(json.dumps({"format": FORMAT, "key": key, "signature": signature}))
+
+
+def read(snapshot_path: str, signature, key):
+    """Gepackter Inhalt zum Snapshot mit ``signature`` oder ``None`` (fehlt, veraltet, unlesbar)."""
+    if signature is None:
+        return None
+    try:
+        with open(binary_path(snapshot_path), "rb") as f:
+            if _load_json(f) != _header(key, signature):
+                return None
+            packed = _load_json(f)
+            for name in packed.pop("arrays"):
+                packed[name] = np.load(f, allow_pickle=False)
+            return packed
+    except Exception:
+        return None
+
+
+def dumps(packed: dict) -> bytes:
+    """Arrays in ``packed`` als eigene Blöcke, alles andere als JSON."""
+    arrays = {name: value for name, value in packed.items() if isinstance(value, np.ndarray)}
+    f = io.BytesIO()
+    _save_json(f, {**{name: value for name, value in packed.items() if name not in arrays}, "arrays": list(arrays)})
+    for value in arrays.values():
+        np.save(f, value, allow_pickle=False)
+    return f.getvalue()
+
+
+def write(snapshot_path: str, signature, key, payload: bytes) -> int:
+    """Schreibt Kopf und ``payload`` (aus ``dumps``) atomar; gibt die Größe zurück."""
+    head = io.BytesIO()
+    _save_json(head, _header(key, signature))
+    data = head.getvalue() + payload
+    atomic_write(binary_path(snapshot_path), lambda f: f.write(data), binary=True)
+    return len(data)
+
+
+def remove(snapshot_path: str) -> None:
+    try:
+        os.remove(binary_path(snapshot_path))
+    except FileNotFoundError:
+        pass
+
+
+# -----------------------------
+# Packen
+# -----------------------------
+def _join(texts: list):
+    """Texte als UTF-8-Bytes; ``None``, wenn einer kein String ist oder ``SEP`` enthält."""
+    if not all(type(text) is str for text in texts):
+        return None
+    joined = SEP.join(texts)
+    if joined.count(SEP) != max(len(texts) - 1, 0):
+        return None
+    return np.frombuffer(joined.encode("utf-8", "surrogatepass"), dtype=np.uint8)
+
+
+def _split(data: np.ndarray, n: int) -> list:
+    return data.tobytes().decode("utf-8", "surrogatepass").split(SEP) if n else []
+
+
+def _ints(values) -> np.ndarray:
+    return np.fromiter(values, dtype=np.int64)
+
+
+def pack_plans(plans: dict):
+    """``{plan: [Unit, ...]}`` spaltenweise; ``None``, wenn sich die Einheiten nicht packen lassen."""
+    units = [u for plan_units in plans.values() for u in plan_units]
+    codes, ex_codes = {}, []
+    for u in units:
+        for ex in u.uebungen:
+            code = codes.get(ex)
+            if code is None:
+                code = codes[ex] = len(codes)
+            ex_codes.append(code)
+    columns = [_join([u.id for u in units]), _join([u.datum for u in units]), _join([u.schwerpunkt for u in units])]
+    if any(column is None for column in columns) or len({u.id for u in units}) != len(units):
+        return None
+
+    def by_date(i):
+        return units[i].datum, units[i].id
+
+    sizes = list(map(len, plans.values()))
+    ends = list(accumulate(sizes))
+    return {
+        "names": list(plans),
+        "sizes": _ints(sizes),
+        "n": len(units),
+        "ids": columns[0],
+        "datums": columns[1],
+        "focuses": columns[2],
+        "exercises": list(codes),
+        "ex_codes": _ints(ex_codes),
+        "ex_ends": _ints(accumulate(len(u.uebungen) for u in units)),
+        "order": _ints(sorted(range(len(units)), key=by_date)),
+        "plan_order": _ints(chain.from_iterable(
+            sorted(range(end - size, end), key=by_date) for size, end in zip(sizes, ends))),
+    }
+
+
+def unpack_plans(packed: dict, display_date, exercises: models.ExerciseTable):
+    """``(plans, keys, plan_keys)``: Pläne mit ``Unit``-Datensätzen und die sortierten Schlüssel des Datumsindex.
+
+    Übungen kommen aus bzw. landen in ``exercises`` (Tabelle des Backends).
+    """
+    n = packed["n"]
+    ids, datums, focuses = (_split(packed[column], n) for column in ("ids", "datums", "focuses"))
+    table = exercises.intern(packed["exercises"])
+    flat = list(map(table.__getitem__, packed["ex_codes"].tolist()))
+    ends = packed["ex_ends"].tolist()
+    uebungen = list(map(tuple, map(flat.__getitem__, map(slice, chain((0,), ends), ends))))
+    shown = {datum: display_date(datum) for datum in set(datums)}
+    units = list(map(_new_unit, zip(ids, datums, focuses, uebungen, map(shown.__getitem__, datums), repeat(""))))
+    unit_keys = list(zip(datums, ids))
+    plan_order = packed["plan_order"].tolist()
+    plans, plan_keys, start = {}, {}, 0
+    for name, size in zip(packed["names"], packed["sizes"].tolist()):
+        plans[name] = units[start:start + size]
+        if size:
+            plan_keys[name] = list(map(unit_keys.__getitem__, plan_order[start:start + size]))
+        start += size
+    keys = list(map(unit_keys.__getitem__, packed["order"].tolist()))
+    return plans, keys, plan_keys
+
+
+def pack_performance(data: dict):
+    """``{athlet: {metrik: [[datum, wert], ...]}}`` spaltenweise; ``None`` bei Werten, die keine ``float`` sind."""
+    athletes, metric_counts, metrics, sizes, datums, values = [], [], [], [], [], []
+    try:
+        for athlete, series in data.items():
+            athletes.append(athlete)
+            metric_counts.append(len(series))
+            for metric, points in series.items():
+                metrics.append(metric)
+                sizes.append(len(points))
+                for datum, value in points:
+                    datums.append(datum)
+                    values.append(value)
+    except (AttributeError, TypeError, ValueError):  # unerwartete Struktur: nur die Textdatei
+        return None
+    columns = [_join(athletes), _join(metrics), _join(datums)]
+    if any(column is None for column in columns) or not all(type(value) is float for value in values):
+        return None
+    return {
+        "counts": [len(athletes), len(metrics), len(datums)],
+        "athletes": columns[0],
+        "metrics": columns[1],
+        "datums": columns[2],
+        "metric_counts": _ints(metric_counts),
+        "ends": _ints(accumulate(sizes)),
+        "values": np.array(values, dtype=np.float64),
+    }
+
+
+def unpack_performance(packed: dict) -> dict:
+    athletes, metrics, datums = (
+        _split(packed[column], n) for column, n in zip(("athletes", "metrics", "datums"), packed["counts"]))
+    points = list(map(list, zip(datums, packed["values"].tolist())))
+    ends = packed["ends"].tolist()
+    series = zip(metrics, map(points.__getitem__, map(slice, chain((0,), ends), ends)))
+    return {athlete: dict(islice(series, count)) for athlete, count in zip(athletes, packed["metric_counts"].tolist())}
+
+
+def pack_athletes(df, versions: dict, roster):
+    """Normalisierter DataFrame spaltenweise, Versionen und die Schlüssel von ``roster``; ``None``, wenn nicht packbar."""
+    from athletikplus.athletes import CATEGORY_COLUMNS, INT_COLUMNS
+
+    names = df["Name"]
+    packed = {
+        "ids": df.index.to_numpy(dtype=np.int64),
+        "delete": df["Löschen"].to_numpy(dtype=bool),
+        "names": _join(names.fillna("").tolist()),
+        "names_na": names.isna().to_numpy(),
+        "version_ids": _ints(versions),
+        "versions": _ints(versions.values()),
+    }
+    for i, col in enumerate(INT_COLUMNS):
+        packed[f"int{i}"] = df[col].to_numpy(dtype=np.int16, na_value=0)
+        packed[f"int{i}_na"] = df[col].isna().to_numpy()
+    for i, col in enumerate(CATEGORY_COLUMNS):
+        packed[f"cat{i}"] = _join(df[col].cat.categories.tolist())
+        packed[f"cat{i}_n"] = len(df[col].cat.categories)
+        packed[f"cat{i}_codes"] = df[col].cat.codes.to_numpy(dtype=np.int32)
+    name_keys, name_ids, ages, age_ids = roster.to_lists()
+    packed.update(roster_keys=_join(name_keys), roster_n=len(name_keys), roster_ids=_ints(name_ids),
+                  ages=_ints(ages), age_ids=_ints(age_ids))
+    if any(value is None for value in packed.values()):
+        return None
+    return packed
+
+
+def unpack_athletes(packed: dict):
+    """``(df, versions, roster)`` aus ``pack_athletes``; ``df`` mit denselben Spalten und Typen wie ``athletes.normalize``."""
+    import pandas as pd
+
+    from athletikplus.athletes import ATHLETE_COLUMNS, CATEGORY_COLUMNS, INT_COLUMNS
+    from athletikplus.roster_index import RosterIndex
+
+    ids = packed["ids"]
+    names = pd.array(_split(packed["names"], len(ids)), dtype="string")
+    names[packed["names_na"]] = pd.NA
+    columns = {"Löschen": packed["delete"], "Name": names}
+    for i, col in enumerate(INT_COLUMNS):
+        columns[col] = pd.arrays.IntegerArray(packed[f"int{i}"], packed[f"int{i}_na"])
+    for i, col in enumerate(CATEGORY_COLUMNS):
+        categories = pd.Index(_split(packed[f"cat{i}"], packed[f"cat{i}_n"]), dtype="string")
+        columns[col] = pd.Categorical.from_codes(packed[f"cat{i}_codes"], dtype=pd.CategoricalDtype(categories))
+    df = pd.DataFrame(columns, index=pd.Index(ids, name="id"))[ATHLETE_COLUMNS]
+    roster = RosterIndex.from_lists(df, _split(packed["roster_keys"], packed["roster_n"]),
+                                    packed["roster_ids"].tolist(), packed["ages"].tolist(), packed["age_ids"].tolist())
+    versions = dict(zip(packed["version_ids"].tolist(), packed["versions"].tolist()))
+    return df, versions, roster
@@ -0,0 +1,281 @@
+"""Massenimport von Athlet:innen, Einheiten und Messwerten (CSV, Excel, JSON).
+
+CSV und JSON Lines werden blockweise gelesen (``CHUNK_SIZE`` Zeilen), Excel
+und JSON (eine Liste) nur als Ganzes und daher nur bis ``MAX_WHOLE_FILE_BYTES``.
+Jeder Block wird spaltenweise geprüft: Pflichtfelder, Wertebereiche wie in den
+Formularen und Datumsangaben (``storage.parse_date`` wie beim Speichern einer
+Einheit).
+Messwerte nennen die Athlet:in beim Namen; gespeichert wird die ID der
+passenden Person im Bestand (``name_ids``), unbekannte Namen sind Fehler.
+Gültige Zeilen werden gesammelt und anschließend mit ``apply`` in einem
+Rutsch an das Backend übergeben; fehlerhafte Zeilen landen mit Zeilennummer
+und Grund in ``ImportResult.errors``.
+"""
+import io
+import os
+
+import pandas as pd
+
+from athletikplus import storage
+from athletikplus.athletes import LIMITS
+
+CHUNK_SIZE = 5000
+MAX_WHOLE_FILE_BYTES = 20 * 1024 * 1024  # Excel/JSON lassen sich nicht blockweise lesen
+
+ATHLETES = "athletes"
+UNITS = "units"
+MEASUREMENTS = "measurements"
+KINDS = (ATHLETES, UNITS, MEASUREMENTS)
+
+# Spalten je Importart: Spalte -> Pflichtfeld?
+COLUMNS = {
+    ATHLETES: {"Name": True, "Alter": False, "Größe (cm)": False, "Gewicht (kg)": False,
+               "Mannschaft": False, "Sportart": False},
+    UNITS: {"Plan": True, "Datum": True, "Schwerpunkt": True, "Übung": True, "Sätze": False,
+            "Wiederholungen": False, "Intensität": False},
+    MEASUREMENTS: {"Athlet:in": True, "Metrik": True, "Datum": True, "Wert": True},
+}
+
+# Spalten, die ganze Zahlen sein müssen
+WHOLE = {ATHLETES: [], UNITS: ["Sätze"], MEASUREMENTS: []}
+
+# Wertebereiche wie in den Eingabeformularen
+RANGES = {
+    ATHLETES: LIMITS,
+    UNITS: {"Sätze": (1, 20)},
+    MEASUREMENTS: {},
+}
+
+
+class ImportResult:
+    """Gesammelte gültige Datensätze und Fehler eines Imports."""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.rows = 0
+        self.athletes = []      # Zeilen für add_athletes
+        self.units = {}         # plan -> {(datum, schwerpunkt): unit}
+        self.measurements = []  # (athlet_id, metrik, datum, wert)
+        self._errors = []
+
+    @property
+    def valid(self) -> int:
+        if self.kind == ATHLETES:
+            return len(self.athletes)
+        if self.kind == MEASUREMENTS:
+            return len(self.measurements)
+        return sum(len(units) for units in self.units.values())
+
+    @property
+    def errors(self) -> pd.DataFrame:
+        """``Zeile`` (1 = erste Datenzeile) und ``Fehler``, nach Zeile sortiert."""
+        if not self._errors:
+            return pd.DataFrame({"Zeile": pd.Series(dtype="int64"), "Fehler": pd.Series(dtype="string")})
+        return pd.concat(self._errors, ignore_index=True).sort_values("Zeile", kind="stable", ignore_index=True)
+
+    def error_rows(self) -> int:
+        return int(self.errors["Zeile"].nunique())
+
+
+# -----------------------------
+# Lesen
+# -----------------------------
+def _sniff_sep(source) -> str:
+    """``;`` (deutscher Excel-Export) oder ``,`` anhand der Kopfzeile."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            header = f.readline()
+    else:
+        pos = source.tell()
+        header = source.readline()
+        source.seek(pos)
+    if isinstance(header, str):
+        header = header.encode("utf-8")
+    return ";" if header.count(b";") > header.count(b",") else ","
+
+
+def _size(source) -> int:
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    pos = source.tell()
+    size = source.seek(0, os.SEEK_END)
+    source.seek(pos)
+    return size
+
+
+def _check_whole(source, ext: str) -> None:
+    if _size(source) > MAX_WHOLE_FILE_BYTES:
+        raise ValueError(f"{ext}-Dateien werden als Ganzes gelesen und dürfen höchstens "
+                         f"{MAX_WHOLE_FILE_BYTES // 2**20} MB groß sein; größere bitte als CSV oder JSON Lines.")
+
+
+def _slices(df: pd.DataFrame, chunk_size: int):
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+
+def read_chunks(source, filename: str, chunk_size: int = CHUNK_SIZE):
+    """Liest CSV, Excel (``.xlsx``/``.xls``), JSON (Liste von Objekten) oder JSON Lines in Blöcken.
+
+    Nur CSV und JSON Lines werden auch blockweise gelesen; Excel und JSON
+    liegen ganz im Speicher (``ValueError`` über ``MAX_WHOLE_FILE_BYTES``).
+    Alle Zellen kommen als Text an; Typen werden erst bei der Prüfung gesetzt.
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in (".csv", ".txt"):
+        yield from pd.read_csv(
+            source, sep=_sniff_sep(source), dtype=str, keep_default_na=False,
+            chunksize=chunk_size, encoding="utf-8-sig",
+        )
+    elif ext in (".xlsx", ".xls"):
+        _check_whole(source, ext)
+        try:
+            df = pd.read_excel(source, dtype=str, keep_default_na=False)
+        except ImportError as e:
+            raise ValueError("Für Excel-Dateien wird das Paket openpyxl benötigt.") from e
+        yield from _slices(df, chunk_size)
+    elif ext == ".jsonl":
+        for chunk in pd.read_json(source, lines=True, dtype=False, chunksize=chunk_size):
+            yield chunk.astype("string").fillna("")
+    elif ext == ".json":
+        _check_whole(source, ext)
+        df = pd.read_json(source, orient="records", dtype=False)
+        yield from _slices(df.astype("string").fillna(""), chunk_size)
+    else:
+        raise ValueError(f"Nicht unterstütztes Dateiformat: {ext or filename}")
+
+
+# -----------------------------
+# Prüfen (spaltenweise)
+# -----------------------------
+def _iso_date(text: str):
+    try:
+        return storage.parse_date(text).isoformat()
+    except ValueError:
+        return pd.NA
+
+
+def parse_dates(values: pd.Series) -> pd.Series:
+    """``TT.MM.JJJJ`` oder ISO -> ISO-Datum als Text; ungültig -> ``<NA>``.
+
+    Derselbe Parser wie beim Speichern (``storage.parse_date``), je verschiedenem Wert einmal.
+    """
+    text = values.astype("string").str.strip()
+    parsed = {value: _iso_date(value) for value in text.dropna().unique()}
+    return text.map(parsed, na_action="ignore").astype("string")
+
+
+def parse_numbers(values: pd.Series) -> pd.Series:
+    """Zahlen mit Dezimalpunkt oder -komma; leer -> ``NaN``."""
+    text = values.astype("string").str.strip().str.replace(",", ".", regex=False)
+    return pd.to_numeric(text.replace("", pd.NA), errors="coerce")
+
+
+def validate_chunk(kind: str, chunk: pd.DataFrame, first_row: int = 1, name_ids: dict = None):
+    """Prüft einen Block; gibt ``(gültige Zeilen, Fehler-DataFrame)`` zurück.
+
+    ``name_ids``: ``{name: id}`` der Athlet:innen (nur für Messwerte, siehe ``athletes.name_ids``).
+    """
+    chunk = chunk.rename(columns=lambda c: str(c).strip())
+    rows = pd.RangeIndex(first_row, first_row + len(chunk))
+    chunk = chunk.set_axis(rows)
+    bad = pd.Series(False, index=rows)
+    errors = []
+
+    def fail(mask: pd.Series, message: str) -> None:
+        mask = mask.fillna(False).astype(bool)
+        if mask.any():
+            errors.append(pd.DataFrame({"Zeile": rows[mask.to_numpy()], "Fehler": message}))
+            bad[mask] = True
+
+    columns = COLUMNS[kind]
+    missing = [col for col, required in columns.items() if required and col not in chunk.columns]
+    if missing:
+        fail(pd.Series(True, index=rows), "Spalte fehlt: " + ", ".join(missing))
+        return chunk.iloc[0:0], pd.concat(errors, ignore_index=True)
+
+    out = pd.DataFrame(index=rows)
+    for col, required in columns.items():
+        text = chunk[col].astype("string").str.strip() if col in chunk.columns else pd.Series(pd.NA, index=rows, dtype="string")
+        text = text.replace("", pd.NA)
+        if required:
+            fail(text.isna(), f"{col} fehlt")
+        out[col] = text
+
+    if "Datum" in out.columns:
+        parsed = parse_dates(out["Datum"])
+        fail(out["Datum"].notna() & parsed.isna(), "Datum ungültig (TT.MM.JJJJ oder JJJJ-MM-TT)")
+        out["Datum"] = parsed
+
+    if kind == MEASUREMENTS:
+        ids = out["Athlet:in"].map(name_ids or {}, na_action="ignore")
+        fail(out["Athlet:in"].notna() & ids.isna(), "Athlet:in unbekannt")
+        out["Athlet:in"] = ids
+
+    numeric = list(RANGES[kind]) + (["Wert"] if kind == MEASUREMENTS else [])
+    for col in numeric:
+        number = parse_numbers(out[col])
+        fail(out[col].notna() & number.isna(), f"{col} ist keine Zahl")
+        if col in WHOLE[kind]:
+            fail(number.notna() & (number % 1 != 0), f"{col} ist keine ganze Zahl")
+        if col in RANGES[kind]:
+            lo, hi = RANGES[kind][col]
+            fail((number < lo) | (number > hi), f"{col} außerhalb {lo}–{hi}")
+        out[col] = number
+
+    return out[~bad], (pd.concat(errors, ignore_index=True) if errors else None)
+
+
+# -----------------------------
+# Sammeln
+# -----------------------------
+def _collect(result: ImportResult, valid: pd.DataFrame) -> None:
+    if result.kind == ATHLETES:
+        valid = valid.astype(object).where(valid.notna(), None)
+        result.athletes.extend({"Löschen": False, **row} for row in valid.to_dict("records"))
+    elif result.kind == MEASUREMENTS:
+        result.measurements.extend(
+            zip(valid["Athlet:in"].astype(int).tolist(), valid["Metrik"].tolist(), valid["Datum"].tolist(),
+                valid["Wert"].astype(float).tolist())
+        )
+    else:
+        # Eine Zeile je Übung; gleiche (Plan, Datum, Schwerpunkt) ergeben eine Einheit
+        valid = valid.astype(object).where(valid.notna(), None)
+        for row in valid.to_dict("records"):
+            units = result.units.setdefault(row["Plan"], {})
+            unit = units.setdefault(
+                (row["Datum"], row["Schwerpunkt"]),
+                {"datum": row["Datum"], "schwerpunkt": row["Schwerpunkt"], "uebungen": []},
+            )
+            unit["uebungen"].append({
+                "name": row["Übung"],
+                "saetze": int(row["Sätze"]) if row["Sätze"] is not None else None,  # leer bleibt leer
+                "wiederholungen": row["Wiederholungen"] or "",
+                "intensitaet": row["Intensität"] or "",
+            })
+
+
+def validate_file(source, filename: str, kind: str, chunk_size: int = CHUNK_SIZE,
+                  name_ids: dict = None) -> ImportResult:
+    """Liest und prüft eine komplette Datei, ohne etwas zu speichern (``name_ids`` wie bei ``validate_chunk``)."""
+    if kind not in KINDS:
+        raise ValueError(f"Unbekannte Importart: {kind}")
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    result = ImportResult(kind)
+    for chunk in read_chunks(source, filename, chunk_size):
+        valid, errors = validate_chunk(kind, chunk, first_row=result.rows + 1, name_ids=name_ids)
+        result.rows += len(chunk)
+        if errors is not None:
+            result._errors.append(errors)
+        _collect(result, valid)
+    return result
+
+
+def apply(backend, result: ImportResult) -> None:
+    """Übergibt alle gültigen Datensätze in einem Aufruf; danach genügt ein ``flush()``."""
+    backend.import_batch(
+        athlete_rows=result.athletes,
+        units={plan: list(units.values()) for plan, units in result.units.items()},
+        measurements=result.measurements,
+    )
@@ -0,0 +1,275 @@
+"""Kommandozeile für Batch-Arbeiten auf den Datendateien, ohne Streamlit.
+
+    python -m athletikplus --data DIR info
+    python -m athletikplus --data DIR units --woche naechste --format csv
+    python -m athletikplus --data DIR status --inaktiv --muster "Saison 2024*"
+    python -m athletikplus --data DIR units --woche aktuelle --mannschaft U17
+    python -m athletikplus --data DIR athletes --mannschaft U17
+    python -m athletikplus --data DIR athletes --ohne-plan
+    python -m athletikplus --data DIR assign "Kraft U17" --mannschaft U17
+    python -m athletikplus --data DIR backup sicherung.zip
+    python -m athletikplus --data DIR compact
+    python -m athletikplus --data ROOT tenants --neu "TSV U17"
+    python -m athletikplus --data ROOT --mandant tsv-u17 info
+
+Das Backend wird ``lazy`` geöffnet: Es werden nur die Speicher geladen, die
+das Kommando braucht; Plan-Kommandos kommen ohne pandas aus.
+"""
+import argparse
+import csv
+import fnmatch
+import json
+import os
+import sys
+import zipfile
+from datetime import date, timedelta
+
+from athletikplus import assignments, storage, tenants
+from athletikplus.date_index import week_range
+from athletikplus.models import unit_to_dict
+
+# Spalten wie beim Einheiten-Import (bulk_import.UNITS): eine Zeile je Übung
+UNIT_COLUMNS = ["Plan", "Datum", "Schwerpunkt", "Übung", "Sätze", "Wiederholungen", "Intensität"]
+
+
+def _date_arg(text: str) -> str:
+    try:
+        return storage.parse_date(text).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Ungültiges Datum: {text} (TT.MM.JJJJ oder JJJJ-MM-TT)")
+
+
+# -----------------------------
+# Kommandos
+# -----------------------------
+def cmd_info(backend, args, out) -> int:
+    names = backend.plan_names()
+    active = sum(backend.plan_status(name) for name in names)
+    units = sum(backend.unit_count(name) for name in names)
+    rules = sum(len(backend.series(name)) for name in names)
+    out.write(f"Daten:    {os.path.abspath(backend.data_dir)}\n")
+    out.write(f"Pläne:    {len(names)} ({active} aktiv)\n")
+    out.write(f"Einheiten: {units}\n")
+    out.write(f"Serien:   {rules}\n")
+    return 0
+
+
+def cmd_units(backend, args, out) -> int:
+    if args.woche:
+        day = date.today() + timedelta(days=7 if args.woche == "naechste" else 0)
+        start, end = week_range(day)
+    else:
+        start, end = args.von or "0000-01-01", args.bis or "9999-12-31"
+    if args.athlet is not None:
+        found = assignments.schedule(backend, start, end, "athletes", args.athlet)
+    elif args.mannschaft or args.sportart:
+        target = "teams" if args.mannschaft else "sports"
+        found = assignments.schedule(backend, start, end, target, args.mannschaft or args.sportart)
+    else:
+        found = backend.units_between(start, end)
+    if args.plan:
+        found = [(plan_name, u) for plan_name, u in found if plan_name in args.plan]
+    if args.format == "json":
+        json.dump([{"plan": plan_name, **unit_to_dict(u), "serie": u.serie} for plan_name, u in found],
+                  out, ensure_ascii=False, indent=2)
+        out.write("\n")
+        return 0
+    writer = csv.writer(out, delimiter=args.sep, lineterminator="\n")
+    writer.writerow(UNIT_COLUMNS)
+    for plan_name, u in found:
+        for ex in u.uebungen:
+            writer.writerow([plan_name, u.datum, u.schwerpunkt, ex.name,
+                             "" if ex.saetze is None else ex.saetze, ex.wiederholungen, ex.intensitaet])
+    return 0
+
+
+def cmd_status(backend, args, out) -> int:
+    if args.aktiv is not None and not (args.alle or args.muster or args.plaene):
+        sys.stderr.write("Pläne angeben (Namen, --muster oder --alle).\n")
+        return 2
+    names = backend.plan_names()
+    if args.alle:
+        selected = names
+    elif args.muster:
+        selected = [name for name in names if fnmatch.fnmatchcase(name, args.muster)]
+    else:
+        selected = args.plaene or names
+    missing = [name for name in selected if not backend.has_plan(name)]
+    if missing:
+        sys.stderr.write(f"Unbekannte Pläne: {', '.join(missing)}\n")
+        return 1
+    if args.aktiv is None:
+        for name in selected:
+            out.write(f"{'aktiv' if backend.plan_status(name) else 'inaktiv'}\t{name}\n")
+        return 0
+    changed = [name for name in selected if backend.plan_status(name) != args.aktiv]
+    for name in changed:
+        backend.set_plan_status(name, args.aktiv)
+    backend.flush()
+    out.write(f"{len(changed)} von {len(selected)} Plänen auf {'aktiv' if args.aktiv else 'inaktiv'} gesetzt.\n")
+    return 0
+
+
+def cmd_athletes(backend, args, out) -> int:
+    index = backend.athlete_index()
+    ids = index.search(args.name, teams=args.mannschaft, sports=args.sportart)
+    if args.ohne_plan:
+        active = [name for name in backend.plan_names() if backend.plan_status(name)]
+        without = set(backend.assignment_index().athletes_without_plan(index, active))
+        ids = [athlete_id for athlete_id in ids if athlete_id in without]
+    df = backend.athletes().loc[ids].drop(columns=["Löschen"])
+    df.to_csv(out, sep=args.sep, lineterminator="\n")
+    return 0
+
+
+def cmd_assign(backend, args, out) -> int:
+    if not backend.has_plan(args.plan):
+        sys.stderr.write(f"Unbekannter Plan: {args.plan}\n")
+        return 1
+    if args.athlet or args.mannschaft or args.sportart or args.keine:
+        backend.assign_plan(args.plan, args.athlet, args.mannschaft, args.sportart)
+        backend.flush()
+    assignment = backend.plan_assignment(args.plan)
+    for target, label in assignments.TARGET_LABELS.items():
+        out.write(f"{label}:\t{', '.join(map(str, assignment[target])) or '-'}\n")
+    return 0
+
+
+def cmd_backup(backend, args, out) -> int:
+    if isinstance(backend, storage.FileBackend):
+        backend.flush()
+        with backend.lock, backend.commit_lock(), zipfile.ZipFile(args.ziel, "w", zipfile.ZIP_DEFLATED) as zf:
+            for store, filename in storage.STORE_FILES.items():
+                paths = [backend.path(filename)]
+                if store in storage.JOURNALED:
+                    paths.append(backend.journal_path(store))
+                if store == storage.ATHLETES:
+                    paths += [backend.path(storage.ATHLETES_META_FILE), backend.path(storage.ATHLETE_IDS_FILE)]
+                for path in paths:
+                    if os.path.exists(path):
+                        zf.write(path, os.path.basename(path))
+    else:
+        import sqlite3
+
+        target = sqlite3.connect(args.ziel)
+        with backend.lock:
+            backend.conn.backup(target)
+        target.close()
+    out.write(f"Sicherung geschrieben: {args.ziel}\n")
+    return 0
+
+
+def cmd_compact(backend, args, out) -> int:
+    if not isinstance(backend, storage.FileBackend):
+        sys.stderr.write("compact gibt es nur für das Datei-Backend.\n")
+        return 1
+    for store in storage.JOURNALED:
+        backend.compact(store)
+    out.write("Journale in die Snapshots übernommen.\n")
+    return 0
+
+
+def cmd_tenants(catalog, args, out) -> int:
+    if args.neu:
+        try:
+            tenant_id = catalog.add(args.neu)
+        except ValueError as e:
+            sys.stderr.write(f"{e}\n")
+            return 1
+        out.write(f"{tenant_id}\t{catalog.data_dir(tenant_id)}\n")
+        return 0
+    for tenant_id, name in catalog.tenants().items():
+        out.write(f"{tenant_id}\t{name}\t{catalog.data_dir(tenant_id)}\n")
+    return 0
+
+
+# -----------------------------
+# Aufruf
+# -----------------------------
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m athletikplus", description="AthletikPlus-Daten ohne App bearbeiten.")
+    parser.add_argument("--data", default=".", help="Datenverzeichnis bzw. Wurzel mit tenants.json (Standard: .)")
+    parser.add_argument("--mandant", help="Mandant aus tenants.json (sonst das Verzeichnis selbst)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("info", help="Überblick über Pläne, Einheiten und Serien")
+    p.set_defaults(func=cmd_info)
+
+    p = sub.add_parser("units", help="Einheiten eines Zeitraums exportieren (inkl. Serien-Termine)")
+    when = p.add_mutually_exclusive_group()
+    when.add_argument("--woche", choices=["aktuelle", "naechste"], help="aktuelle oder nächste Woche (Mo–So)")
+    when.add_argument("--von", type=_date_arg, help="erstes Datum (TT.MM.JJJJ oder JJJJ-MM-TT)")
+    p.add_argument("--bis", type=_date_arg, help="letztes Datum")
+    p.add_argument("--plan", action="append", help="nur diesen Plan (mehrfach möglich)")
+    who = p.add_mutually_exclusive_group()
+    who.add_argument("--athlet", type=int, metavar="ID", help="Wochenplan einer Athlet:in (nur aktive, zugeordnete Pläne)")
+    who.add_argument("--mannschaft", help="Pläne dieser Mannschaft (nur aktive)")
+    who.add_argument("--sportart", help="Pläne dieser Sportart (nur aktive)")
+    p.add_argument("--format", choices=["csv", "json"], default="csv")
+    p.add_argument("--sep", default=";", help="CSV-Trennzeichen (Standard: ;)")
+    p.set_defaults(func=cmd_units)
+
+    p = sub.add_parser("status", help="Plan-Status anzeigen oder setzen")
+    p.add_argument("plaene", nargs="*", help="Planname(n); ohne Angabe alle")
+    target = p.add_mutually_exclusive_group()
+    target.add_argument("--aktiv", dest="aktiv", action="store_const", const=True, help="auf aktiv setzen")
+    target.add_argument("--inaktiv", dest="aktiv", action="store_const", const=False, help="auf inaktiv setzen")
+    which = p.add_mutually_exclusive_group()
+    which.add_argument("--alle", action="store_true", help="alle Pläne")
+    which.add_argument("--muster", help='Pläne per Muster, z. B. "Saison 2024*"')
+    p.set_defaults(func=cmd_status)
+
+    p = sub.add_parser("athletes", help="Athlet:innen als CSV (gefiltert)")
+    p.add_argument("--name", default="", help="Namensanfang (auch Nachname)")
+    p.add_argument("--mannschaft", action="append", default=[], help="Mannschaft (mehrfach möglich)")
+    p.add_argument("--sportart", action="append", default=[], help="Sportart (mehrfach möglich)")
+    p.add_argument("--ohne-plan", action="store_true", help="nur Athlet:innen ohne aktiven zugeordneten Plan")
+    p.add_argument("--sep", default=";", help="CSV-Trennzeichen (Standard: ;)")
+    p.set_defaults(func=cmd_athletes)
+
+    p = sub.add_parser("assign", help="Zuordnung eines Plans anzeigen oder ersetzen")
+    p.add_argument("plan", help="Planname")
+    p.add_argument("--athlet", type=int, action="append", default=[], metavar="ID", help="Athlet:in (mehrfach möglich)")
+    p.add_argument("--mannschaft", action="append", default=[], help="Mannschaft (mehrfach möglich)")
+    p.add_argument("--sportart", action="append", default=[], help="Sportart (mehrfach möglich)")
+    p.add_argument("--keine", action="store_true", help="Zuordnung entfernen")
+    p.set_defaults(func=cmd_assign)
+
+    p = sub.add_parser("backup", help="Daten sichern (Datei-Backend: ZIP, SQLite: Datenbankkopie)")
+    p.add_argument("ziel", help="Zieldatei")
+    p.set_defaults(func=cmd_backup)
+
+    p = sub.add_parser("compact", help="Journale in die Snapshots übernehmen (Datei-Backend)")
+    p.set_defaults(func=cmd_compact)
+
+    p = sub.add_parser("tenants", help="Mandanten auflisten oder anlegen")
+    p.add_argument("--neu", metavar="NAME", help="neuen Mandanten anlegen")
+    p.set_defaults(func=cmd_tenants)
+    return parser
+
+
+def main(argv=None, out=None) -> int:
+    args = build_parser().parse_args(argv)
+    out = out or sys.stdout
+    catalog = tenants.Catalog(args.data)
+    if args.command == "tenants":
+        return cmd_tenants(catalog, args, out)
+    data_dir = args.data
+    if args.mandant:
+        if args.mandant not in catalog:
+            sys.stderr.write(f"Unbekannter Mandant: {args.mandant}\n")
+            return 1
+        data_dir = catalog.data_dir(args.mandant)
+    try:
+        backend = storage.open_backend(data_dir, lazy=True, tenant=args.mandant)
+    except storage.CorruptFileError as e:
+        sys.stderr.write(f"{e}\n")
+        return 1
+    try:
+        return args.func(backend, args, out)
+    except storage.CorruptFileError as e:
+        sys.stderr.write(f"{e}\n")
+        return 1
+    finally:
+        if hasattr(backend, "close"):
+            backend.close()
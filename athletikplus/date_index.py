@@ -0,0 +1,93 @@
+"""Sortierter Datumsindex über alle Einheiten: datum -> (plan, unit).
+
+Wird einmal beim Laden aufgebaut und bei jedem Hinzufügen/Löschen einer
+Einheit nachgeführt. Abfragen (Tag, Woche, Zeitraum) kosten O(log n + k);
+eingeschränkt auf einzelne Pläne (``plans``) je Plan O(log n_plan + k_plan).
+"""
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, timedelta
+from itertools import chain, repeat
+from operator import attrgetter
+
+from athletikplus.models import Unit
+
+_unit_id = attrgetter("id")
+_unit_datum = attrgetter("datum")
+
+
+def week_range(day: date):
+    """Montag und Sonntag der Woche von ``day`` als ISO-Strings."""
+    monday = day - timedelta(days=day.weekday())
+    return monday.isoformat(), (monday + timedelta(days=6)).isoformat()
+
+
+class DateIndex:
+    def __init__(self, plans: dict = None, keys: list = None, plan_keys: dict = None):
+        """``keys``/``plan_keys``: bereits sortierte Schlüssel (binärer Snapshot), spart das Sortieren."""
+        plans = plans or {}
+        units = list(chain.from_iterable(plans.values()))
+        names = chain.from_iterable(map(repeat, plans, map(len, plans.values())))
+        # unit_id -> (datum, plan_name, unit)
+        self._entries = dict(zip(map(_unit_id, units), zip(map(_unit_datum, units), names, units)))
+        # sortiert: (datum, unit_id)
+        self._keys = keys if keys is not None else sorted((datum, uid) for uid, (datum, _, _) in self._entries.items())
+        if plan_keys is None:
+            plan_keys = {}
+            for key in self._keys:
+                plan_keys.setdefault(self._entries[key[1]][1], []).append(key)
+        self._plan_keys = plan_keys  # plan_name -> sortiert: (datum, unit_id)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, plan_name: str, unit: Unit) -> None:
+        uid = unit.id
+        if uid in self._entries:
+            self.remove(uid)
+        datum = unit.datum
+        self._entries[uid] = (datum, plan_name, unit)
+        insort(self._keys, (datum, uid))
+        insort(self._plan_keys.setdefault(plan_name, []), (datum, uid))
+
+    def remove(self, unit_id: str) -> None:
+        entry = self._entries.pop(unit_id, None)
+        if entry is None:
+            return
+        datum, plan_name, _ = entry
+        _discard(self._keys, (datum, unit_id))
+        keys = self._plan_keys.get(plan_name, [])
+        _discard(keys, (datum, unit_id))
+        if not keys:
+            self._plan_keys.pop(plan_name, None)
+
+    def between(self, start: str, end: str, plans=None) -> list:
+        """``(plan_name, unit)`` mit ``start <= datum <= end``, aufsteigend nach Datum.
+
+        ``plans``: nur diese Pläne (``None``: alle).
+        """
+        if plans is None:
+            keys = _range(self._keys, start, end)
+        else:
+            keys = heapq.merge(*(_range(self._plan_keys.get(name, ()), start, end) for name in plans))
+        result = []
+        for _, uid in keys:
+            _, plan_name, unit = self._entries[uid]
+            result.append((plan_name, unit))
+        return result
+
+    def on(self, day: str) -> list:
+        return self.between(day, day)
+
+    def week(self, day: date) -> list:
+        return self.between(*week_range(day))
+
+
+def _range(keys: list, start: str, end: str) -> list:
+    return keys[bisect_left(keys, (start, "")):bisect_right(keys, (end, "\uffff"))]
+
+
+def _discard(keys: list, item) -> None:
+    i = bisect_left(keys, item)
+    if i < len(keys) and keys[i] == item:
+        keys.pop(i)
@@ -0,0 +1,75 @@
+"""Atomare Datei-Schreibvorgänge (Temp-Datei im selben Verzeichnis + ``os.replace``) und Dateisperren."""
+import contextlib
+import json
+import os
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ``os.umask`` lässt sich nur setzend lesen; einmal beim Import statt je Schreibvorgang (nicht threadsicher)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def atomic_write(path: str, write_fn, binary: bool = False) -> None:
+    """Schreibt über ``write_fn(f)`` in eine Temp-Datei und ersetzt ``path`` atomar (Text: UTF-8).
+
+    ``mkstemp`` legt die Temp-Datei mit 0600 an; vor dem Ersetzen bekommt sie die
+    Rechte der bisherigen Datei bzw. bei neuen Dateien die von ``open`` (0666 ohne umask).
+    """
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=os.path.basename(path), dir=directory)
+    try:
+        with (os.fdopen(fd, "wb") if binary else os.fdopen(fd, "w", encoding="utf-8", newline="")) as f:
+            write_fn(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_json(path: str, data) -> None:
+    atomic_write(path, lambda f: json.dump(data, f))
+
+
+def read_json(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@contextlib.contextmanager
+def file_lock(path: str):
+    """Exklusive Sperre über ``path`` (auch zwischen Prozessen); blockiert, bis sie frei ist.
+
+    ``flock`` gilt je geöffneter Datei, sperrt also auch Threads desselben
+    Prozesses gegeneinander. Ohne ``fcntl`` (Windows) wird ``msvcrt`` benutzt.
+    """
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            import msvcrt
+
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
@@ -0,0 +1,58 @@
+"""Append-only Operations-Journal (JSON Lines) neben einem Snapshot.
+
+Jede Zeile ist eine Operation mit fortlaufender ``seq``. Der Snapshot merkt
+sich die höchste bereits eingearbeitete ``seq`` (``journal_seq``); beim Laden
+werden nur jüngere Operationen nachgespielt. Dadurch ist eine abgebrochene
+Kompaktierung (Snapshot geschrieben, Journal noch nicht gekürzt) harmlos.
+"""
+import json
+import os
+
+from athletikplus.fileio import atomic_write
+
+
+def journal_path(snapshot_path: str) -> str:
+    root, _ = os.path.splitext(snapshot_path)
+    return root + ".journal.jsonl"
+
+
+def append_ops(path: str, ops: list) -> int:
+    """Hängt Operationen an (ein ``write`` + ``fsync``); gibt die geschriebenen Bytes zurück."""
+    if not ops:
+        return 0
+    data = "".join(json.dumps(op, separators=(",", ":")) + "\n" for op in ops).encode("utf-8")
+    with open(path, "ab+") as f:
+        # Nach einem abgebrochenen Schreibvorgang auf einer neuen Zeile beginnen
+        if f.tell():
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                data = b"\n" + data
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    return len(data)
+
+
+def read_ops(path: str, after_seq: int = 0) -> list:
+    """Operationen mit ``seq > after_seq``; eine abgeschnittene letzte Zeile wird ignoriert."""
+    if not os.path.exists(path):
+        return []
+    ops = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                op = json.loads(line)
+            except ValueError:
+                continue
+            if op.get("seq", 0) > after_seq:
+                ops.append(op)
+    return ops
+
+
+def truncate_through(path: str, seq: int) -> int:
+    """Entfernt alle Operationen bis einschließlich ``seq``; gibt die Anzahl verbleibender zurück."""
+    if not os.path.exists(path):
+        return 0
+    remaining = read_ops(path, after_seq=seq)
+    atomic_write(path, lambda f: f.writelines(json.dumps(op, separators=(",", ":")) + "\n" for op in remaining))
+    return len(remaining)
@@ -0,0 +1,210 @@
+"""Leichtgewichtige Laufzeit-Messung der heißen Pfade (opt-in).
+
+Abschnitte (``section``/``timed``) und Zähler (``count``/``add_bytes``) werden
+prozessweit aggregiert; jeder Skriptlauf (``begin_run``/``end_run``) wird
+zusätzlich als Zeile an ein rollierendes JSON-Lines-Log angehängt. Ist die
+Messung aus, kehren alle Funktionen nach einer einzigen Flag-Abfrage zurück.
+
+Einschalten: ``ATHLETIKPLUS_PROFILE=1`` (dann wird auch der Kaltstart in
+``load_data`` erfasst) oder ``CONFIG_FILE`` im Wurzelverzeichnis der
+Installation. Beides gilt prozessweit, also für alle Mandanten; das Log liegt
+deshalb ebenfalls im Wurzelverzeichnis und nie in einem Mandanten-Verzeichnis.
+"""
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from athletikplus.fileio import atomic_write_json, read_json
+
+LOG_FILE = "metrics.jsonl"
+CONFIG_FILE = "profiling.json"  # {"enabled": true}
+MAX_LOG_BYTES = 1_000_000  # danach wird nach ``metrics.jsonl.1`` rotiert
+RECENT_RUNS = 200
+
+_enabled = os.environ.get("ATHLETIKPLUS_PROFILE") == "1"
+_log_path = None
+_lock = threading.Lock()
+_sections = {}  # name -> [anzahl, summe_ms, max_ms]
+_counters = {}
+_runs = deque(maxlen=RECENT_RUNS)
+_current = threading.local()  # laufender Skriptlauf je Sitzungs-Thread
+_NULL = contextlib.nullcontext()
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def configure(enabled: bool = None, log_path: str = None) -> None:
+    global _enabled, _log_path
+    if enabled is not None:
+        _enabled = bool(enabled) or os.environ.get("ATHLETIKPLUS_PROFILE") == "1"
+    if log_path is not None:
+        _log_path = log_path
+
+
+def configure_root(root: str) -> None:
+    """Schalter aus ``root/CONFIG_FILE`` und Log ``root/LOG_FILE`` (Wurzelverzeichnis, nicht je Mandant)."""
+    try:
+        on = bool(read_json(os.path.join(root, CONFIG_FILE))["enabled"])
+    except (OSError, ValueError, KeyError, TypeError):
+        on = False
+    configure(enabled=on, log_path=os.path.join(root, LOG_FILE))
+
+
+def save_enabled(root: str, on: bool) -> None:
+    """Schaltet die Messung für den ganzen Prozess um und merkt es sich in ``root/CONFIG_FILE``."""
+    atomic_write_json(os.path.join(root, CONFIG_FILE), {"enabled": bool(on)})
+    configure(enabled=on)
+
+
+def reset() -> None:
+    with _lock:
+        _sections.clear()
+        _counters.clear()
+        _runs.clear()
+
+
+# -----------------------------
+# Erfassen
+# -----------------------------
+@contextlib.contextmanager
+def _measure(name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, (time.perf_counter() - start) * 1000)
+
+
+def _record(name: str, ms: float) -> None:
+    with _lock:
+        stats = _sections.setdefault(name, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += ms
+        stats[2] = max(stats[2], ms)
+    run = getattr(_current, "run", None)
+    if run is not None:
+        run["sections"][name] = round(run["sections"].get(name, 0.0) + ms, 3)
+
+
+def section(name: str):
+    """``with section("save_data"): ...`` - misst nur, wenn eingeschaltet."""
+    return _measure(name) if _enabled else _NULL
+
+
+def timed(name: str):
+    """Dekorator-Variante von ``section``."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _measure(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name: str, n: int = 1) -> None:
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+    run = getattr(_current, "run", None)
+    if run is not None:
+        run["counters"][name] = run["counters"].get(name, 0) + n
+
+
+def add_bytes(store: str, read: int = 0, written: int = 0) -> None:
+    if not _enabled:
+        return
+    if read:
+        count(f"bytes_read.{store}", read)
+    if written:
+        count(f"bytes_written.{store}", written)
+
+
+# -----------------------------
+# Skriptläufe
+# -----------------------------
+def begin_run(page: str = "") -> None:
+    if not _enabled:
+        _current.run = None
+        return
+    count("reruns")
+    _current.run = {"start": time.perf_counter(), "ts": datetime.now().isoformat(timespec="milliseconds"),
+                    "page": page, "sections": {}, "counters": {}}
+
+
+def set_page(page: str) -> None:
+    run = getattr(_current, "run", None)
+    if run is not None:
+        run["page"] = page
+
+
+def end_run() -> None:
+    """Schließt den Lauf ab und hängt ihn ans Log (Läufe, die mit ``st.rerun()`` enden, fehlen)."""
+    run = getattr(_current, "run", None)
+    _current.run = None
+    if run is None or not _enabled:
+        return
+    record = {
+        "ts": run["ts"],
+        "page": run["page"],
+        "ms": round((time.perf_counter() - run.pop("start")) * 1000, 3),
+        "sections": run["sections"],
+        "counters": run["counters"],
+    }
+    with _lock:
+        _runs.append(record)
+    if _log_path:
+        _append_log(record)
+
+
+def _append_log(record: dict) -> None:
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with _lock:
+        try:
+            if os.path.getsize(_log_path) + len(line) > MAX_LOG_BYTES:
+                os.replace(_log_path, _log_path + ".1")
+        except FileNotFoundError:
+            pass
+        with open(_log_path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+# -----------------------------
+# Auswerten
+# -----------------------------
+def sections() -> list:
+    """Eine Zeile je Abschnitt (Anzahl, Ø/Max/Summe in ms), teuerste zuerst."""
+    with _lock:
+        rows = [
+            {"Abschnitt": name, "Anzahl": n, "Ø ms": round(total / n, 2), "Max ms": round(peak, 2),
+             "Summe ms": round(total, 1)}
+            for name, (n, total, peak) in _sections.items()
+        ]
+    return sorted(rows, key=lambda r: r["Summe ms"], reverse=True)
+
+
+def counters() -> dict:
+    with _lock:
+        return dict(sorted(_counters.items()))
+
+
+def recent_runs() -> list:
+    """Letzte Läufe, flach (ein Feld je Abschnitt/Zähler) - z. B. für CSV."""
+    with _lock:
+        runs = list(_runs)
+    return [
+        {"ts": r["ts"], "page": r["page"], "ms": r["ms"],
+         **{f"s.{k}": v for k, v in r["sections"].items()},
+         **{f"c.{k}": v for k, v in r["counters"].items()}}
+        for r in runs
+    ]
@@ -0,0 +1,97 @@
+"""Kompakte, typisierte Datensätze für Einheiten und Übungen.
+
+Im Speicher liegen Einheiten als ``Unit`` und Übungen als ``Exercise``
+(``NamedTuple``: feste Felder, kein Dict je Datensatz). Auf der Platte, im
+Journal und an der Backend-Schnittstelle bleiben es Dicts im aktuellen
+Schema (``athletikplus.schema``); ``unit_from_dict``/``unit_to_dict``
+übersetzen zwischen beiden.
+
+Gleiche Übungen (gleiches Quadrupel) werden nur einmal angelegt und von
+allen Einheiten geteilt; Vorlagen wiederholen sich in der Praxis stark. Die
+Tabelle dafür (``ExerciseTable``) gehört zum Backend und wird mit jedem
+vollständigen Laden der Pläne neu angelegt: Mandanten teilen sich nichts, und
+verworfene Übungen bleiben nicht bis zum Prozessende im Speicher. (``Exercise``
+ist ein Tupel und lässt sich nicht schwach referenzieren.)
+Die Zahlenfelder (``wdh_min`` ... ``prozent_1rm``) hängen nur vom Text ab
+und werden je gemeinsamer Übung einmal übernommen bzw. gelesen.
+"""
+from typing import NamedTuple, Optional, Tuple
+
+from athletikplus import schema
+
+
+class Exercise(NamedTuple):
+    name: str
+    saetze: Optional[int] = None
+    wiederholungen: str = ""
+    intensitaet: str = ""
+    wdh_min: Optional[int] = None
+    wdh_max: Optional[int] = None
+    last_kg: Optional[float] = None
+    prozent_1rm: Optional[float] = None
+
+    @property
+    def is_text(self) -> bool:
+        """Freitext-Übung (Altdaten): nur ein Name, keine Details."""
+        return self.saetze is None and not self.wiederholungen and not self.intensitaet
+
+
+class Unit(NamedTuple):
+    id: str
+    datum: str
+    schwerpunkt: str
+    uebungen: Tuple[Exercise, ...] = ()
+    datum_anzeige: str = "?"  # nur im Speicher, wird beim Laden vorberechnet
+    serie: str = ""           # Serien-Termin: ID der Regel
+
+
+class ExerciseTable:
+    """Gemeinsame ``Exercise``-Instanzen: ``(name, saetze, wiederholungen, intensitaet) -> Exercise``."""
+
+    def __init__(self):
+        self._exercises = {}
+
+    def __len__(self) -> int:
+        return len(self._exercises)
+
+    def exercise_from_dict(self, ex: dict) -> Exercise:
+        key = (ex["name"], ex.get("saetze"), ex.get("wiederholungen", ""), ex.get("intensitaet", ""))
+        exercise = self._exercises.get(key)
+        if exercise is None:
+            if "wdh_min" in ex:
+                parsed = (ex["wdh_min"], ex["wdh_max"], ex["last_kg"], ex["prozent_1rm"])
+            else:
+                parsed = schema.parse_dosage(key[2], key[3])  # Journal-Einträge von vor Version 3
+            exercise = self._exercises[key] = Exercise._make(key + parsed)
+        return exercise
+
+    def exercises_from_dicts(self, uebungen: list) -> Tuple[Exercise, ...]:
+        return tuple(map(self.exercise_from_dict, uebungen))
+
+    def intern(self, exercises: list) -> list:
+        """Gibt je Übung (Feldwerte als Liste, binärer Snapshot) die gemeinsame Instanz zurück und legt fehlende an."""
+        table = self._exercises
+        return [table.get(tuple(ex[:4])) or table.setdefault(tuple(ex[:4]), Exercise._make(ex)) for ex in exercises]
+
+    def unit_from_dict(self, unit: dict, datum_anzeige: str = "?") -> Unit:
+        """Erwartet eine Einheit im aktuellen Schema (siehe ``schema.normalize_unit``)."""
+        return Unit._make((unit["id"], unit["datum"], unit["schwerpunkt"],
+                           self.exercises_from_dicts(unit["uebungen"]), datum_anzeige, ""))
+
+
+def exercises_from_dicts(uebungen: list) -> Tuple[Exercise, ...]:
+    """Ohne Backend (Serien-Vorschau, Anzeige): nur innerhalb des Aufrufs geteilt."""
+    return ExerciseTable().exercises_from_dicts(uebungen)
+
+
+def unit_from_dict(unit: dict, datum_anzeige: str = "?") -> Unit:
+    return ExerciseTable().unit_from_dict(unit, datum_anzeige)
+
+
+def unit_to_dict(unit: Unit) -> dict:
+    return {
+        "id": unit.id,
+        "datum": unit.datum,
+        "schwerpunkt": unit.schwerpunkt,
+        "uebungen": [ex._asdict() for ex in unit.uebungen],
+    }
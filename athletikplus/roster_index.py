@@ -0,0 +1,194 @@
+"""Suchindex über die Athlet:innen-Tabelle: Namenspräfix, Mannschaft, Sportart, Alter.
+
+Wird einmal aus dem DataFrame aufgebaut und bei jedem Hinzufügen/Ändern/
+Löschen nachgeführt (wie ``DateIndex``). Jede Suche liefert nur IDs; die
+Seite, die angezeigt wird, holt sich die App per ``df.loc[ids]``.
+
+Namen werden ab jedem Wortanfang indiziert ("anna maria müller",
+"maria müller", "müller"), so findet "mül" auch den Nachnamen.
+"""
+from bisect import bisect_left, insort
+
+import pandas as pd
+
+INDEXED_COLUMNS = ["Name", "Alter", "Mannschaft", "Sportart"]
+
+
+def _name_keys(name) -> list:
+    if name is None or pd.isna(name):
+        return []
+    words = str(name).casefold().split()
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+def _category(value):
+    if value is None or pd.isna(value) or str(value) == "":
+        return None
+    return str(value)
+
+
+class RosterIndex:
+    def __init__(self, df: pd.DataFrame = None):
+        self._names = []    # sortiert: (schlüssel, id)
+        self._ages = []     # sortiert: (alter, id)
+        self._teams = {}    # Mannschaft -> {id}
+        self._sports = {}   # Sportart -> {id}
+        self._rows = {}     # id -> (schlüssel, alter, mannschaft, sportart) zum Austragen
+        if df is not None and len(df):
+            self._bulk_load(df)
+
+    def _bulk_load(self, df: pd.DataFrame) -> None:
+        ids = df.index.tolist()
+        ages = df["Alter"].tolist()
+        teams = df["Mannschaft"].tolist()
+        sports = df["Sportart"].tolist()
+        for athlete_id, name, age, team, sport in zip(ids, df["Name"].tolist(), ages, teams, sports):
+            keys, age = self._add_groups(athlete_id, name, age, team, sport)
+            self._names.extend((key, athlete_id) for key in keys)
+            if age is not None:
+                self._ages.append((age, athlete_id))
+        # Einmal sortieren statt je Zeile einfügen
+        self._names.sort()
+        self._ages.sort()
+
+    @classmethod
+    def from_lists(cls, df: pd.DataFrame, name_keys: list, name_ids: list, ages: list, age_ids: list):
+        """Wie ``RosterIndex(df)``, mit den schon sortierten Schlüsseln aus ``to_lists`` (binärer Snapshot)."""
+        index = cls()
+        index._names = list(zip(name_keys, name_ids))
+        index._ages = list(zip(ages, age_ids))
+        keys_by_id = {}
+        for key, athlete_id in index._names:
+            keys_by_id.setdefault(athlete_id, []).append(key)
+        age_by_id = dict(zip(age_ids, ages))
+        for athlete_id, team, sport in zip(df.index.tolist(), df["Mannschaft"].tolist(), df["Sportart"].tolist()):
+            keys = sorted(keys_by_id.get(athlete_id, ()), key=len, reverse=True)  # ab dem ersten Wort, wie _name_keys
+            team, sport = _category(team), _category(sport)
+            index._rows[athlete_id] = (keys, age_by_id.get(athlete_id), team, sport)
+            if team is not None:
+                index._teams.setdefault(team, set()).add(athlete_id)
+            if sport is not None:
+                index._sports.setdefault(sport, set()).add(athlete_id)
+        return index
+
+    def to_lists(self) -> tuple:
+        """``(namensschlüssel, ids, alter, ids)`` der sortierten Schlüssel als einfache Listen."""
+        return ([key for key, _ in self._names], [i for _, i in self._names],
+                [age for age, _ in self._ages], [i for _, i in self._ages])
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # -----------------------------
+    # Nachführen
+    # -----------------------------
+    def _add_groups(self, athlete_id: int, name, age, team, sport):
+        keys = _name_keys(name)
+        age = None if age is None or pd.isna(age) else int(age)
+        team, sport = _category(team), _category(sport)
+        self._rows[athlete_id] = (keys, age, team, sport)
+        if team is not None:
+            self._teams.setdefault(team, set()).add(athlete_id)
+        if sport is not None:
+            self._sports.setdefault(sport, set()).add(athlete_id)
+        return keys, age
+
+    def _add(self, athlete_id: int, name, age, team, sport) -> None:
+        keys, age = self._add_groups(athlete_id, name, age, team, sport)
+        for key in keys:
+            insort(self._names, (key, athlete_id))
+        if age is not None:
+            insort(self._ages, (age, athlete_id))
+
+    def remove(self, ids) -> None:
+        for athlete_id in ids:
+            entry = self._rows.pop(athlete_id, None)
+            if entry is None:
+                continue
+            keys, age, team, sport = entry
+            for key in keys:
+                _discard(self._names, (key, athlete_id))
+            if age is not None:
+                _discard(self._ages, (age, athlete_id))
+            for groups, value in ((self._teams, team), (self._sports, sport)):
+                if value is not None:
+                    members = groups.get(value)
+                    members.discard(athlete_id)
+                    if not members:
+                        del groups[value]
+
+    def update(self, df: pd.DataFrame, ids) -> None:
+        """Trägt ``ids`` mit ihrem aktuellen Stand aus ``df`` (neu) ein; fehlende IDs fallen raus."""
+        ids = list(ids)
+        self.remove(ids)
+        present = [i for i in ids if i in df.index]
+        if not present:
+            return
+        rows = df.loc[present, INDEXED_COLUMNS]
+        for athlete_id, name, age, team, sport in zip(present, *(rows[c].tolist() for c in rows.columns)):
+            self._add(athlete_id, name, age, team, sport)
+
+    # -----------------------------
+    # Abfragen
+    # -----------------------------
+    def teams(self) -> list:
+        return sorted(self._teams)
+
+    def sports(self) -> list:
+        return sorted(self._sports)
+
+    def __contains__(self, athlete_id) -> bool:
+        return athlete_id in self._rows
+
+    def groups(self, athlete_id: int) -> tuple:
+        """``(mannschaft, sportart)`` einer Athlet:in (``None``, wenn nicht erfasst)."""
+        entry = self._rows.get(athlete_id)
+        return (entry[2], entry[3]) if entry else (None, None)
+
+    def members(self, teams=(), sports=()) -> set:
+        """IDs aller Mitglieder der Mannschaften *oder* Sportarten."""
+        found = set()
+        for groups, values in ((self._teams, teams), (self._sports, sports)):
+            for value in values:
+                found |= groups.get(value, set())
+        return found
+
+    def age_bounds(self):
+        """``(min, max)`` der erfassten Alter oder ``None``."""
+        return (self._ages[0][0], self._ages[-1][0]) if self._ages else None
+
+    def _prefix(self, prefix: str) -> set:
+        i = bisect_left(self._names, (prefix, -1))
+        found = set()
+        while i < len(self._names) and self._names[i][0].startswith(prefix):
+            found.add(self._names[i][1])
+            i += 1
+        return found
+
+    def _age_range(self, age_min, age_max) -> set:
+        lo = bisect_left(self._ages, (age_min, -1)) if age_min is not None else 0
+        hi = bisect_left(self._ages, (age_max + 1, -1)) if age_max is not None else len(self._ages)
+        return {athlete_id for _, athlete_id in self._ages[lo:hi]}
+
+    def search(self, name: str = "", teams=(), sports=(), age_min: int = None, age_max: int = None) -> list:
+        """IDs (aufsteigend), die alle gesetzten Filter erfüllen; ohne Filter alle."""
+        candidates = []
+        prefix = " ".join(name.casefold().split())
+        if prefix:
+            candidates.append(self._prefix(prefix))
+        if teams:
+            candidates.append(set().union(*(self._teams.get(t, ()) for t in teams)))
+        if sports:
+            candidates.append(set().union(*(self._sports.get(s, ()) for s in sports)))
+        if age_min is not None or age_max is not None:
+            candidates.append(self._age_range(age_min, age_max))
+        if not candidates:
+            return sorted(self._rows)
+        candidates.sort(key=len)
+        return sorted(candidates[0].intersection(*candidates[1:]))
+
+
+def _discard(keys: list, item) -> None:
+    i = bisect_left(keys, item)
+    if i < len(keys) and keys[i] == item:
+        keys.pop(i)
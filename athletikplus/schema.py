@@ -0,0 +1,193 @@
+"""Versioniertes Dateischema der Trainingspläne und einmalige Migration beim Laden.
+
+Version 0: nacktes ``{plan: [einheit, ...]}`` ohne Status.
+Version 1: ``{"plans", "statuses", "journal_seq"[, "series"]}``; Einheiten
+           evtl. ohne ``id``, Übungen als Text oder mit ``saetze`` als String.
+Version 2: zusätzlich ``schema_version``. Jede Einheit hat ``id``, ``datum``,
+           ``schwerpunkt`` und ``uebungen``; jede Übung ist ein Dict mit
+           ``name``, ``saetze`` (int oder ``None``), ``wiederholungen`` und
+           ``intensitaet`` (Text). Einheiten sind je Plan nach Datum sortiert.
+Version 3: Übungen zusätzlich mit den daraus gelesenen Zahlen ``wdh_min``,
+           ``wdh_max``, ``last_kg`` und ``prozent_1rm`` (``None``, wenn der
+           Text nichts hergibt, z. B. "3x30s" oder "Körpergewicht").
+Version 4: zusätzlich ``assignments``: ``{plan: {"athletes": [id, ...],
+           "teams": [...], "sports": [...]}}`` (siehe ``athletikplus.assignments``).
+
+Ältere Dateien werden beim Laden einmal migriert und im neuen Format
+zurückgeschrieben; danach gibt es zur Laufzeit keine Sonderfälle mehr.
+
+``performance_data.json`` hat eine eigene Version (``PERFORMANCE_VERSION``):
+
+Version 0: ``{name: {metrik: [[datum, wert], ...]}}`` (evtl. in ``"data"``
+           verpackt), Messreihen hängen am Namen der Athlet:in.
+Version 1: ``{"schema_version", "data", "journal_seq"}``; Schlüssel der
+           Messreihen ist die Athlet:innen-ID als Text (``"17"``), damit
+           Umbenennen und gleiche Namen nichts vermischen.
+"""
+import re
+import uuid
+
+PLANS_VERSION = 4
+PERFORMANCE_VERSION = 1
+
+_NUMBER = r"(\d+(?:[.,]\d+)?)"
+_RANGE = re.compile(_NUMBER + r"\s*(?:-|–|bis)\s*" + _NUMBER)
+_SETS_X_REPS = re.compile(r"^\d+\s*[x×]\s*(.+)$")
+_DURATION = re.compile(r"\d\s*(?:s|sek|sec|min|m)\b")
+_KG = re.compile(r"(?:" + _NUMBER + r"\s*(?:-|–)\s*)?" + _NUMBER + r"\s*kg\b")
+_PERCENT = re.compile(r"(?:" + _NUMBER + r"\s*%?\s*(?:-|–)\s*)?" + _NUMBER + r"\s*%")
+
+
+def new_unit_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def _text(value) -> str:
+    return "" if value is None else str(value)
+
+
+def _as_int(value):
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    try:
+        return int(round(float(str(value).strip().replace(",", "."))))
+    except ValueError:
+        return None
+
+
+def _float(text: str) -> float:
+    return float(text.replace(",", "."))
+
+
+def parse_reps(text: str):
+    """``(min, max)`` Wiederholungen aus "8-12", "10", "5x5"; ``(None, None)`` für Zeiten/Strecken."""
+    for part in text.casefold().split("·"):
+        part = part.strip()
+        if not part or "sätze" in part or "saetze" in part:
+            continue  # aus der Migration: "3-4 Sätze · 8"
+        match = _SETS_X_REPS.match(part)
+        if match:
+            part = match.group(1)
+        if _DURATION.search(part):
+            return None, None
+        match = _RANGE.search(part)
+        if match:
+            lo, hi = sorted((int(_float(match.group(1))), int(_float(match.group(2)))))
+            return lo, hi
+        match = re.search(r"\d+", part)
+        if match:
+            return int(match.group()), int(match.group())
+    return None, None
+
+
+def _amount(pattern: re.Pattern, text: str):
+    """Zahl (bei Bereichen die Mitte) vor der Einheit, sonst ``None``."""
+    match = pattern.search(text)
+    if not match:
+        return None
+    hi = _float(match.group(2))
+    lo = _float(match.group(1)) if match.group(1) else hi
+    return (lo + hi) / 2
+
+
+def parse_intensity(text: str):
+    """``(last_kg, prozent_1rm)`` aus "60kg", "80%", "70-75 %"; fehlende Angaben ``None``."""
+    text = text.casefold()
+    return _amount(_KG, text), _amount(_PERCENT, text)
+
+
+def parse_dosage(wiederholungen: str, intensitaet: str) -> tuple:
+    """``(wdh_min, wdh_max, last_kg, prozent_1rm)`` - die Zahlenfelder einer Übung."""
+    return parse_reps(wiederholungen) + parse_intensity(intensitaet)
+
+
+def normalize_exercise(ex) -> dict:
+    if not isinstance(ex, dict):
+        return {"name": _text(ex), "saetze": None, "wiederholungen": "", "intensitaet": "",
+                "wdh_min": None, "wdh_max": None, "last_kg": None, "prozent_1rm": None}
+    saetze = _as_int(ex.get("saetze"))
+    wiederholungen = _text(ex.get("wiederholungen"))
+    raw = _text(ex.get("saetze")).strip()
+    if saetze is None and raw:
+        # z. B. "3-4": nicht als Zahl darstellbar -> als Text bei den Wiederholungen erhalten
+        wiederholungen = f"{raw} Sätze · {wiederholungen}" if wiederholungen else f"{raw} Sätze"
+    intensitaet = _text(ex.get("intensitaet"))
+    wdh_min, wdh_max, last_kg, prozent_1rm = parse_dosage(wiederholungen, intensitaet)
+    return {
+        "name": _text(ex.get("name")),
+        "saetze": saetze,
+        "wiederholungen": wiederholungen,
+        "intensitaet": intensitaet,
+        "wdh_min": wdh_min,
+        "wdh_max": wdh_max,
+        "last_kg": last_kg,
+        "prozent_1rm": prozent_1rm,
+    }
+
+
+def normalize_unit(unit) -> dict:
+    """Einheit im aktuellen Schema (vergibt eine ID, wenn sie fehlt)."""
+    if not isinstance(unit, dict):
+        unit = {"schwerpunkt": _text(unit)}
+    return {
+        "id": unit.get("id") or new_unit_id(),
+        "datum": _text(unit.get("datum")),
+        "schwerpunkt": _text(unit.get("schwerpunkt")),
+        "uebungen": [normalize_exercise(ex) for ex in unit.get("uebungen") or []],
+    }
+
+
+def normalize_rule(rule: dict) -> dict:
+    """Serien-Regel mit normalisierter Übungsvorlage."""
+    return {
+        **rule,
+        "id": rule.get("id") or new_unit_id(),
+        "schwerpunkt": _text(rule.get("schwerpunkt")),
+        "uebungen": [normalize_exercise(ex) for ex in rule.get("uebungen") or []],
+        "ausnahmen": sorted(rule.get("ausnahmen", [])),
+    }
+
+
+def migrate_plans(data) -> tuple:
+    """Bringt den Inhalt von ``training_plans.json`` auf ``PLANS_VERSION``.
+
+    Gibt ``(data, migrated)`` zurück; ``migrated``: Datei sollte neu geschrieben werden.
+    """
+    if not isinstance(data, dict):
+        data = {}
+    version = data.get("schema_version", 1) if "plans" in data else 0
+    if version >= PLANS_VERSION:
+        return data, False
+    if version == 3:
+        # Nur ein neuer Schlüssel: Einheiten nicht erneut normalisieren
+        return {**data, "schema_version": PLANS_VERSION, "assignments": {}}, True
+    if version == 0:
+        data = {"plans": data, "statuses": {name: True for name in data}, "journal_seq": 0}
+    plans = {}
+    for name, units in data["plans"].items():
+        plans[name] = [normalize_unit(u) for u in units or [] if u is not None]
+        plans[name].sort(key=lambda u: u["datum"])
+    series = {name: [normalize_rule(r) for r in rules] for name, rules in data.get("series", {}).items()}
+    return {
+        "schema_version": PLANS_VERSION,
+        "plans": plans,
+        "statuses": {name: bool(data.get("statuses", {}).get(name, True)) for name in plans},
+        "series": series,
+        "assignments": {},
+        "journal_seq": data.get("journal_seq", 0),
+    }, True
+
+
+def migrate_performance(data: dict, name_ids: dict) -> dict:
+    """Messreihen von Version 0 (je Name) auf IDs umschlüsseln (``name_ids``: ``{name: id}``).
+
+    Reihen ohne passende Athlet:in und unstrukturierte Altdaten bleiben unter
+    ihrem bisherigen Schlüssel erhalten, werden aber keiner Person zugeordnet.
+    """
+    migrated = {}
+    for key, value in data.items():
+        athlete_id = name_ids.get(key) if isinstance(value, dict) else None
+        migrated[key if athlete_id is None else str(athlete_id)] = value
+    return migrated
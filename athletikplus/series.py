@@ -0,0 +1,91 @@
+"""Wiederkehrende Einheiten als Regel statt als einzelne Kopien.
+
+Eine Serie ist ein Dict::
+
+    {"id": "...", "start": "2025-09-01", "ende": "2026-06-30", "wochentage": [0, 2, 4],
+     "schwerpunkt": "Kraft", "uebungen": [...], "ausnahmen": ["2025-12-24"]}
+
+(``wochentage``: 0 = Montag). Gespeichert wird nur die Regel mit ihrer
+Übungsvorlage; konkrete Einheiten (``Unit``) entstehen erst beim Abfragen
+eines Zeitraums (``materialize``) und teilen sich ein ``uebungen``-Tupel.
+Ihre IDs ``<serie>@<datum>`` sind stabil, ``split_id`` zerlegt sie wieder.
+"""
+import heapq
+from datetime import date, timedelta
+
+from athletikplus.models import Unit, exercises_from_dicts
+
+WEEKDAYS = ["Mo", "Di", "Mi", "Do", "Fr", "Sa", "So"]
+SEPARATOR = "@"
+
+
+def occurrence_id(series_id: str, datum: str) -> str:
+    return f"{series_id}{SEPARATOR}{datum}"
+
+
+def split_id(unit_id: str):
+    """``(serie, datum)`` für Serien-Termine, sonst ``None``."""
+    if SEPARATOR not in unit_id:
+        return None
+    series_id, datum = unit_id.split(SEPARATOR, 1)
+    return series_id, datum
+
+
+def overlaps(rule: dict, start: str, end: str) -> bool:
+    return rule["start"] <= end and rule["ende"] >= start
+
+
+def occurrences(rule: dict, start: str, end: str) -> list:
+    """Termine (``date``) der Serie mit ``start <= datum <= end``, aufsteigend, ohne Ausnahmen."""
+    lo = date.fromisoformat(max(start, rule["start"]))
+    hi = date.fromisoformat(min(end, rule["ende"]))
+    if lo > hi:
+        return []
+    skipped = set(rule.get("ausnahmen", ()))
+    days = []
+    for weekday in set(rule.get("wochentage", ())):
+        day = lo + timedelta(days=(weekday - lo.weekday()) % 7)
+        while day <= hi:
+            days.append(day)
+            day += timedelta(days=7)
+    return [day for day in sorted(days) if day.isoformat() not in skipped]
+
+
+def materialize(rule: dict, start: str, end: str) -> list:
+    """Konkrete Einheiten der Serie im Zeitraum (wie ``recent_units``)."""
+    days = occurrences(rule, start, end)
+    if not days:
+        return []
+    uebungen = exercises_from_dicts(rule["uebungen"])
+    return [
+        Unit(occurrence_id(rule["id"], day.isoformat()), day.isoformat(), rule["schwerpunkt"], uebungen,
+             day.strftime("%d.%m.%Y"), rule["id"])
+        for day in days
+    ]
+
+
+def between(rules_by_plan, start: str, end: str) -> list:
+    """``(plan_name, unit)`` aller Serien-Termine im Zeitraum, aufsteigend nach Datum.
+
+    ``rules_by_plan``: Iterable von ``(plan_name, rule)``.
+    """
+    found = [
+        (unit.datum, plan_name, unit)
+        for plan_name, rule in rules_by_plan
+        if overlaps(rule, start, end)
+        for unit in materialize(rule, start, end)
+    ]
+    found.sort(key=lambda item: item[0])
+    return [(plan_name, unit) for _, plan_name, unit in found]
+
+
+def merge(units: list, series_units: list) -> list:
+    """Führt zwei nach Datum sortierte ``(plan_name, unit)``-Listen zusammen (Einzeltermine zuerst)."""
+    return list(heapq.merge(units, series_units, key=lambda item: item[1].datum))
+
+
+def describe(rule: dict) -> str:
+    """``Mo, Mi, Fr · 01.09.2025–30.06.2026``"""
+    days = ", ".join(WEEKDAYS[d] for d in sorted(rule.get("wochentage", ())))
+    start, ende = (date.fromisoformat(rule[key]).strftime("%d.%m.%Y") for key in ("start", "ende"))
+    return f"{days} · {start}–{ende}"
@@ -0,0 +1,790 @@
+"""Optionales SQLite-Backend mit echtem Schema.
+
+Aktivierung über ``ATHLETIKPLUS_BACKEND=sqlite`` (Datei: ``storage.sqlite_path``,
+je Mandant ``athletikplus.db`` in seinem Verzeichnis). Die Seiten lesen und
+schreiben darüber nur die Zeilen, die sie brauchen. CSV/JSON bleiben Import-/Exportformat::
+
+    python -m athletikplus.sqlite_store import [data_dir] [db]
+    python -m athletikplus.sqlite_store export [data_dir] [db]
+
+Beim ersten Öffnen einer leeren Datenbank werden vorhandene Dateien
+einmalig übernommen (``import_files``): in einer Transaktion, deren Abschluss
+in ``meta`` vermerkt wird. Schlägt sie fehl, wird eine neu angelegte
+Datenbankdatei wieder gelöscht und beim nächsten Öffnen erneut importiert.
+
+pandas/NumPy werden wie im Datei-Backend erst für Athlet:innen und
+Messreihen importiert.
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+from typing import TYPE_CHECKING
+
+from athletikplus import binary_snapshot, journal, schema, series, storage
+from athletikplus.assignments import AssignmentIndex, normalize_assignment
+from athletikplus.models import Exercise, Unit, unit_to_dict
+from athletikplus.storage import locked
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from athletikplus.roster_index import RosterIndex
+    from athletikplus.timeseries import MeasurementStore
+    from athletikplus.training_load import LoadStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS athletes (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    loeschen   INTEGER NOT NULL DEFAULT 0,
+    name       TEXT NOT NULL,
+    alter_     INTEGER,
+    groesse    INTEGER,
+    gewicht    INTEGER,
+    mannschaft TEXT,
+    sportart   TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_athletes_team_sport ON athletes (mannschaft, sportart);
+CREATE INDEX IF NOT EXISTS idx_athletes_sport ON athletes (sportart);
+CREATE TABLE IF NOT EXISTS plans (
+    id     INTEGER PRIMARY KEY AUTOINCREMENT,
+    name   TEXT NOT NULL,
+    active INTEGER NOT NULL DEFAULT 1
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_plans_name ON plans (name);
+CREATE TABLE IF NOT EXISTS units (
+    uid         TEXT PRIMARY KEY,
+    plan_id     INTEGER NOT NULL REFERENCES plans (id) ON DELETE CASCADE,
+    datum       TEXT NOT NULL DEFAULT '',
+    schwerpunkt TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_units_datum ON units (datum);
+CREATE INDEX IF NOT EXISTS idx_units_plan_datum ON units (plan_id, datum);
+CREATE TABLE IF NOT EXISTS exercises (
+    unit_uid       TEXT NOT NULL REFERENCES units (uid) ON DELETE CASCADE,
+    position       INTEGER NOT NULL,
+    name           TEXT NOT NULL,
+    saetze         INTEGER,
+    wiederholungen TEXT,
+    intensitaet    TEXT,
+    is_text        INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (unit_uid, position)
+);
+CREATE TABLE IF NOT EXISTS series (
+    id      TEXT PRIMARY KEY,
+    plan_id INTEGER NOT NULL REFERENCES plans (id) ON DELETE CASCADE,
+    start   TEXT NOT NULL,
+    ende    TEXT NOT NULL,
+    rule    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_series_range ON series (start, ende);
+CREATE TABLE IF NOT EXISTS performance (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS measurements (
+    id      INTEGER PRIMARY KEY AUTOINCREMENT,
+    athlete TEXT NOT NULL,
+    metric  TEXT NOT NULL,
+    datum   TEXT NOT NULL,
+    value   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_measurements_athlete_metric ON measurements (athlete, metric, datum);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Schrittweise Migrationen; ``PRAGMA user_version`` = Anzahl der ausgeführten Schritte
+MIGRATIONS = [
+    # 1: Sätze als Zahl (nicht darstellbarer Text wandert zu den Wiederholungen), Text-Spalten ohne NULL
+    """
+    UPDATE exercises SET saetze = CAST(saetze AS INTEGER)
+        WHERE typeof(saetze) = 'text' AND trim(saetze) <> '' AND trim(saetze) NOT GLOB '*[^0-9]*';
+    UPDATE exercises SET
+        wiederholungen = trim(saetze) || ' Sätze' ||
+            CASE WHEN COALESCE(wiederholungen, '') = '' THEN '' ELSE ' · ' || wiederholungen END,
+        saetze = NULL
+        WHERE typeof(saetze) = 'text';
+    UPDATE exercises SET wiederholungen = COALESCE(wiederholungen, ''), intensitaet = COALESCE(intensitaet, ''),
+        is_text = 0;
+    """,
+    # 2: Zahlenfelder der Übungen (siehe schema, Version 3); Befüllen in _parse_exercises
+    """
+    ALTER TABLE exercises ADD COLUMN wdh_min INTEGER;
+    ALTER TABLE exercises ADD COLUMN wdh_max INTEGER;
+    ALTER TABLE exercises ADD COLUMN last_kg REAL;
+    ALTER TABLE exercises ADD COLUMN prozent_1rm REAL;
+    """,
+    # 3: Version je Athlet:in für optimistisches Sperren (update_athletes/delete_athletes)
+    """
+    ALTER TABLE athletes ADD COLUMN version INTEGER NOT NULL DEFAULT 0;
+    """,
+    # 4: Zuordnung von Plänen zu Athlet:innen und Gruppen (kind: 'teams' | 'sports'), in beide Richtungen indiziert
+    """
+    CREATE TABLE plan_athletes (
+        plan_id    INTEGER NOT NULL REFERENCES plans (id) ON DELETE CASCADE,
+        athlete_id INTEGER NOT NULL REFERENCES athletes (id) ON DELETE CASCADE,
+        PRIMARY KEY (plan_id, athlete_id)
+    );
+    CREATE INDEX idx_plan_athletes_athlete ON plan_athletes (athlete_id);
+    CREATE TABLE plan_groups (
+        plan_id INTEGER NOT NULL REFERENCES plans (id) ON DELETE CASCADE,
+        kind    TEXT NOT NULL,
+        value   TEXT NOT NULL,
+        PRIMARY KEY (plan_id, kind, value)
+    );
+    CREATE INDEX idx_plan_groups_value ON plan_groups (kind, value);
+    """,
+    # 5: Messwerte je Athlet:innen-ID statt Name (bei gleichen Namen die kleinste ID); ohne passende
+    #    Athlet:in bleibt der Name in ``athlete`` stehen. Der Index behält seinen Namen (siehe SCHEMA).
+    """
+    CREATE TABLE measurements_v5 (
+        id         INTEGER PRIMARY KEY AUTOINCREMENT,
+        athlete_id INTEGER,
+        athlete    TEXT,
+        metric     TEXT NOT NULL,
+        datum      TEXT NOT NULL,
+        value      REAL NOT NULL
+    );
+    INSERT INTO measurements_v5 (id, athlete_id, athlete, metric, datum, value)
+        SELECT m.id, a.id, CASE WHEN a.id IS NULL THEN m.athlete END, m.metric, m.datum, m.value
+        FROM measurements m LEFT JOIN (SELECT name, MIN(id) AS id FROM athletes GROUP BY name) a ON a.name = m.athlete;
+    DROP TABLE measurements;
+    ALTER TABLE measurements_v5 RENAME TO measurements;
+    CREATE INDEX idx_measurements_athlete_metric ON measurements (athlete_id, metric, datum);
+    """,
+]
+
+DISPLAY_DATE = "COALESCE(strftime('%d.%m.%Y', u.datum), '?')"
+
+# DataFrame-Spalte -> Tabellenspalte
+ATHLETE_COLUMN_MAP = {
+    "Löschen": "loeschen",
+    "Name": "name",
+    "Alter": "alter_",
+    "Größe (cm)": "groesse",
+    "Gewicht (kg)": "gewicht",
+    "Mannschaft": "mannschaft",
+    "Sportart": "sportart",
+}
+
+
+def _column_value(col: str, value):
+    from athletikplus import athletes
+
+    value = athletes.clean_value(value)
+    if col == "Löschen":
+        return int(bool(value))
+    if col == "Name" and value is None:
+        return ""  # Spalte ist NOT NULL; leere Editor-Zeilen haben noch keinen Namen
+    return value
+
+
+class SqliteBackend:
+    """Gleiche Schnittstelle wie ``storage.FileBackend``, aber zeilenweise auf SQLite."""
+
+    def __init__(self, db_path: str = "athletikplus.db", data_dir: str = "."):
+        self.db_path = db_path
+        self.data_dir = data_dir
+        fresh = not os.path.exists(db_path)
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        self._athletes_cache = None
+        self._roster_index = None
+        self._measurements_cache = None
+        self._load_cache = None
+        self._assignment_cache = None
+        self.conflicts = storage.ConflictLog()  # Konflikte entstehen hier nur beim Aufruf (Rückgabewerte)
+        try:
+            self._import_once(data_dir)
+        except BaseException:
+            self.conn.close()
+            if fresh:  # keine leere/halbe Datenbank liegen lassen, die den Import beim nächsten Mal verhindert
+                for suffix in ("", "-wal", "-shm"):
+                    if os.path.exists(db_path + suffix):
+                        os.remove(db_path + suffix)
+            raise
+        self._data_version = self._current_data_version()
+
+    def _import_once(self, data_dir: str) -> None:
+        """Übernimmt die Dateien aus ``data_dir``, solange das nicht vermerkt ist (ganz oder gar nicht)."""
+        if self.conn.execute("SELECT 1 FROM meta WHERE key = 'imported'").fetchone():
+            return
+        tables = ("settings", "athletes", "plans", "measurements", "performance")
+        has_data = any(self.conn.execute(f"SELECT EXISTS (SELECT 1 FROM {table})").fetchone()[0] for table in tables)
+        with self.conn:
+            if not has_data:  # Datenbanken von vor ``meta`` mit Inhalt gelten als übernommen
+                import_files(self, data_dir)
+            self.conn.execute("INSERT INTO meta (key, value) VALUES ('imported', ?)", (os.path.abspath(data_dir),))
+
+    def _migrate(self) -> None:
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        for step, script in enumerate(MIGRATIONS[version:], start=version + 1):
+            self.conn.executescript(f"BEGIN; {script} PRAGMA user_version = {step}; COMMIT;")
+            if step == 2:
+                self._parse_exercises()
+
+    def _parse_exercises(self) -> None:
+        """Liest die Zahlenfelder einmal aus dem Text (je verschiedener Kombination)."""
+        rows = self.conn.execute("SELECT DISTINCT wiederholungen, intensitaet FROM exercises").fetchall()
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE exercises SET wdh_min = ?, wdh_max = ?, last_kg = ?, prozent_1rm = ? "
+                "WHERE wiederholungen IS ? AND intensitaet IS ?",
+                [schema.parse_dosage(wdh or "", intensitaet or "") + (wdh, intensitaet) for wdh, intensitaet in rows],
+            )
+
+    def _current_data_version(self) -> int:
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def flush(self) -> None:
+        # Jede Operation committet selbst
+        pass
+
+    @locked
+    def refresh(self) -> list:
+        """Verwirft Caches, wenn eine andere Verbindung (anderer Prozess) committet hat."""
+        version = self._current_data_version()
+        if version == self._data_version:
+            return []
+        self._data_version = version
+        self._athletes_cache = None
+        self._roster_index = None
+        self._measurements_cache = None
+        self._load_cache = None
+        self._assignment_cache = None
+        return [storage.ATHLETES]
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # --- Settings ---
+    @locked
+    def get_settings(self) -> dict:
+        rows = self.conn.execute("SELECT key, value FROM settings").fetchall()
+        settings = dict(storage.DEFAULT_SETTINGS)
+        settings.update({k: json.loads(v) for k, v in rows})
+        return settings
+
+    @locked
+    def set_setting(self, key: str, value) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO settings (key, value) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (key, json.dumps(value)),
+            )
+
+    # --- Athlet:innen ---
+    @locked
+    def athletes(self) -> "pd.DataFrame":
+        if self._athletes_cache is None:
+            import pandas as pd
+
+            from athletikplus import athletes
+
+            cols = ", ".join(ATHLETE_COLUMN_MAP.values())
+            df = pd.read_sql_query(f"SELECT id, {cols} FROM athletes ORDER BY id", self.conn, index_col="id")
+            df.columns = list(ATHLETE_COLUMN_MAP.keys())
+            self._athletes_cache = athletes.normalize(df)
+        return self._athletes_cache
+
+    @locked
+    def athlete_count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM athletes").fetchone()[0]
+
+    @locked
+    def athlete_index(self) -> "RosterIndex":
+        if self._roster_index is None:
+            from athletikplus.roster_index import RosterIndex
+
+            self._roster_index = RosterIndex(self.athletes())
+        return self._roster_index
+
+    def _reindex_athletes(self, ids: list) -> None:
+        if self._roster_index is not None:
+            self._roster_index.update(self._athletes_cache, ids)
+
+    def _athlete_params(self, row: dict) -> tuple:
+        return tuple(_column_value(col, row.get(col)) for col in ATHLETE_COLUMN_MAP)
+
+    def _insert_athletes(self, rows, ids=None) -> list:
+        """Fügt Zeilen ein (mit vorgegebenen ``ids`` oder automatisch vergebenen) und gibt die IDs zurück."""
+        cols = ", ".join(ATHLETE_COLUMN_MAP.values())
+        marks = ", ".join("?" for _ in ATHLETE_COLUMN_MAP)
+        sql = f"INSERT INTO athletes (id, {cols}) VALUES (?, {marks})"
+        new_ids = []
+        for i, row in enumerate(rows):
+            cur = self.conn.execute(sql, (ids[i] if ids else None,) + self._athlete_params(row))
+            new_ids.append(cur.lastrowid)
+        return new_ids
+
+    @locked
+    def add_athletes(self, rows: list) -> list:
+        from athletikplus import athletes
+
+        rows = [{col: athletes.clean_value(v) for col, v in row.items()} for row in rows]
+        athletes.check_rows(rows)
+        with self.conn:
+            ids = self._insert_athletes(rows)
+        if self._athletes_cache is not None and ids:
+            self._athletes_cache = athletes.add_rows(self._athletes_cache, rows, ids)
+            self._reindex_athletes(ids)
+        return ids
+
+    def add_athlete(self, row: dict) -> int:
+        return self.add_athletes([row])[0]
+
+    @locked
+    def athlete_versions(self, ids) -> dict:
+        rows = self.conn.execute(
+            "SELECT id, version FROM athletes WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps([int(i) for i in ids]),),
+        )
+        return dict(rows.fetchall())
+
+    def _athlete_label(self, athlete_id: int) -> str:
+        row = self.conn.execute("SELECT name FROM athletes WHERE id = ?", (athlete_id,)).fetchone()
+        return f"„{row[0]}“" if row and row[0] else f"Athlet:in #{athlete_id}"
+
+    def _conflict_reason(self, athlete_id: int) -> str:
+        row = self.conn.execute("SELECT name FROM athletes WHERE id = ?", (athlete_id,)).fetchone()
+        if row is None:
+            return f"Athlet:in #{athlete_id} wurde inzwischen gelöscht."
+        return f"„{row[0]}“ wurde inzwischen anderweitig geändert."
+
+    @locked
+    def update_athletes(self, changes: dict, versions: dict = None) -> list:
+        """Wie ``FileBackend.update_athletes``; geprüft wird per ``WHERE version = ?``."""
+        from athletikplus import athletes
+        from athletikplus.roster_index import INDEXED_COLUMNS
+
+        versions = None if versions is None else {int(i): v for i, v in versions.items()}
+        changes = {int(athlete_id): cols for athlete_id, cols in changes.items()}
+        applied, messages = {}, athletes.drop_invalid(changes, self._athlete_label)
+        with self.conn:
+            for athlete_id, cols in changes.items():
+                cols = {c: athletes.clean_value(v) for c, v in cols.items() if c in ATHLETE_COLUMN_MAP}
+                if not cols:
+                    continue
+                assignments = ", ".join(f"{ATHLETE_COLUMN_MAP[c]} = ?" for c in cols)
+                params = tuple(_column_value(c, v) for c, v in cols.items()) + (athlete_id,)
+                sql = f"UPDATE athletes SET {assignments}, version = version + 1 WHERE id = ?"
+                if versions is not None:
+                    sql += " AND version = ?"
+                    params += (versions.get(athlete_id, 0),)
+                if self.conn.execute(sql, params).rowcount:
+                    applied[athlete_id] = cols
+                else:
+                    messages.append(f"{self._conflict_reason(athlete_id)} Änderung nicht übernommen ({', '.join(cols)}).")
+        if self._athletes_cache is not None:
+            if messages:
+                self._athletes_cache = self._roster_index = None  # fremden Stand neu lesen
+            else:
+                athletes.update_rows(self._athletes_cache, applied)
+                self._reindex_athletes([i for i, cols in applied.items() if set(INDEXED_COLUMNS) & set(cols)])
+        return messages
+
+    @locked
+    def delete_athletes(self, ids: list, versions: dict = None) -> list:
+        from athletikplus import athletes
+
+        ids = [int(i) for i in ids]
+        deleted, messages = [], []
+        with self.conn:
+            for athlete_id in ids:
+                if versions is None:
+                    cur = self.conn.execute("DELETE FROM athletes WHERE id = ?", (athlete_id,))
+                else:
+                    cur = self.conn.execute("DELETE FROM athletes WHERE id = ? AND version = ?",
+                                            (athlete_id, versions.get(athlete_id, 0)))
+                if cur.rowcount:
+                    deleted.append(athlete_id)
+                elif self.conn.execute("SELECT 1 FROM athletes WHERE id = ?", (athlete_id,)).fetchone():
+                    messages.append(f"{self._conflict_reason(athlete_id)} Nicht gelöscht.")
+        if self._athletes_cache is not None:
+            if messages:
+                self._athletes_cache = self._roster_index = None
+            else:
+                self._athletes_cache = athletes.delete_rows(self._athletes_cache, deleted)
+                self._reindex_athletes(deleted)
+        return messages
+
+    # --- Pläne ---
+    @locked
+    def plan_names(self) -> list:
+        return [r[0] for r in self.conn.execute("SELECT name FROM plans ORDER BY id")]
+
+    @locked
+    def plan_count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM plans").fetchone()[0]
+
+    @locked
+    def has_plan(self, name: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM plans WHERE name = ?", (name,)).fetchone() is not None
+
+    @locked
+    def plan_status(self, name: str) -> bool:
+        row = self.conn.execute("SELECT active FROM plans WHERE name = ?", (name,)).fetchone()
+        return bool(row[0]) if row else True
+
+    @locked
+    def create_plan(self, name: str, active: bool = True) -> None:
+        with self.conn:
+            try:
+                self.conn.execute("INSERT INTO plans (name, active) VALUES (?, ?)", (name, int(active)))
+            except sqlite3.IntegrityError:  # Plan existiert schon (z. B. von einem anderen Prozess): wie FileBackend
+                self.conn.execute("UPDATE plans SET active = ? WHERE name = ?", (int(active), name))
+
+    @locked
+    def set_plan_status(self, name: str, active: bool) -> None:
+        with self.conn:
+            self.conn.execute("UPDATE plans SET active = ? WHERE name = ?", (int(active), name))
+
+    # --- Zuordnungen ---
+    @locked
+    def assignment_index(self) -> AssignmentIndex:
+        if self._assignment_cache is None:
+            assignments = {}
+            rows = self.conn.execute(
+                "SELECT p.name, 'athletes', a.athlete_id FROM plan_athletes a JOIN plans p ON p.id = a.plan_id "
+                "UNION ALL SELECT p.name, g.kind, g.value FROM plan_groups g JOIN plans p ON p.id = g.plan_id"
+            )
+            for name, kind, value in rows:
+                assignments.setdefault(name, {}).setdefault(kind, []).append(value)
+            self._assignment_cache = AssignmentIndex(assignments)
+        return self._assignment_cache
+
+    def plan_assignment(self, name: str) -> dict:
+        return self.assignment_index().assignment(name)
+
+    def _insert_assignment(self, plan_name: str, assignment: dict) -> None:
+        plan_id = "(SELECT id FROM plans WHERE name = ?)"
+        self.conn.execute(f"DELETE FROM plan_athletes WHERE plan_id = {plan_id}", (plan_name,))
+        self.conn.execute(f"DELETE FROM plan_groups WHERE plan_id = {plan_id}", (plan_name,))
+        # Nur vorhandene Athlet:innen (Fremdschlüssel)
+        self.conn.executemany(
+            "INSERT INTO plan_athletes (plan_id, athlete_id) "
+            "SELECT p.id, a.id FROM plans p, athletes a WHERE p.name = ? AND a.id = ?",
+            [(plan_name, athlete_id) for athlete_id in assignment["athletes"]],
+        )
+        self.conn.executemany(
+            "INSERT INTO plan_groups (plan_id, kind, value) SELECT id, ?, ? FROM plans WHERE name = ?",
+            [(kind, value, plan_name) for kind in ("teams", "sports") for value in assignment[kind]],
+        )
+
+    @locked
+    def assign_plan(self, name: str, athletes=(), teams=(), sports=()) -> None:
+        assignment = normalize_assignment({"athletes": athletes, "teams": teams, "sports": sports})
+        with self.conn:
+            self._insert_assignment(name, assignment)
+        if self._assignment_cache is not None:
+            self._assignment_cache.set(name, assignment)
+
+    # --- Einheiten ---
+    def _exercises_for(self, uids: list) -> dict:
+        result = {uid: [] for uid in uids}
+        if not uids:
+            return result
+        marks = ", ".join("?" for _ in uids)
+        rows = self.conn.execute(
+            "SELECT unit_uid, name, saetze, wiederholungen, intensitaet, wdh_min, wdh_max, last_kg, prozent_1rm "
+            f"FROM exercises WHERE unit_uid IN ({marks}) ORDER BY unit_uid, position",
+            uids,
+        )
+        for row in rows:
+            result[row[0]].append(Exercise._make(row[1:]))
+        return result
+
+    def _units_from_rows(self, rows) -> list:
+        # rows: (uid, datum, schwerpunkt, datum_anzeige)
+        exercises = self._exercises_for([r[0] for r in rows])
+        return [
+            Unit(uid, datum, schwerpunkt, tuple(exercises[uid]), anzeige)
+            for uid, datum, schwerpunkt, anzeige in rows
+        ]
+
+    @locked
+    def units(self, plan_name: str) -> list:
+        rows = self.conn.execute(
+            f"SELECT u.uid, u.datum, u.schwerpunkt, {DISPLAY_DATE} FROM units u JOIN plans p ON p.id = u.plan_id "
+            "WHERE p.name = ? ORDER BY u.datum, u.rowid",
+            (plan_name,),
+        ).fetchall()
+        return self._units_from_rows(rows)
+
+    @locked
+    def unit_count(self, plan_name: str) -> int:
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM units u JOIN plans p ON p.id = u.plan_id WHERE p.name = ?",
+            (plan_name,),
+        ).fetchone()[0]
+
+    @locked
+    def recent_units(self, plan_name: str, limit: int, offset: int = 0) -> list:
+        rows = self.conn.execute(
+            f"SELECT u.uid, u.datum, u.schwerpunkt, {DISPLAY_DATE} "
+            "FROM units u JOIN plans p ON p.id = u.plan_id "
+            "WHERE p.name = ? ORDER BY u.datum DESC, u.rowid DESC LIMIT ? OFFSET ?",
+            (plan_name, limit, offset),
+        ).fetchall()
+        return self._units_from_rows(rows)
+
+    def _insert_unit(self, plan_name: str, unit: dict) -> str:
+        """``unit`` im aktuellen Schema (``schema.normalize_unit``)."""
+        uid = unit["id"]
+        self.conn.execute(
+            "INSERT INTO units (uid, plan_id, datum, schwerpunkt) "
+            "SELECT ?, id, ?, ? FROM plans WHERE name = ?",
+            (uid, unit["datum"], unit["schwerpunkt"], plan_name),
+        )
+        self.conn.executemany(
+            "INSERT INTO exercises (unit_uid, position, name, saetze, wiederholungen, intensitaet, "
+            "wdh_min, wdh_max, last_kg, prozent_1rm) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(uid, pos, ex["name"], ex["saetze"], ex["wiederholungen"], ex["intensitaet"],
+              ex["wdh_min"], ex["wdh_max"], ex["last_kg"], ex["prozent_1rm"])
+             for pos, ex in enumerate(unit["uebungen"])],
+        )
+        return uid
+
+    @locked
+    def add_unit(self, plan_name: str, unit: dict) -> str:
+        self._load_cache = None
+        with self.conn:
+            return self._insert_unit(plan_name, schema.normalize_unit(unit))
+
+    @locked
+    def delete_unit(self, plan_name: str, unit_id: str) -> None:
+        self._load_cache = None
+        with self.conn:
+            self.conn.execute("DELETE FROM units WHERE uid = ?", (unit_id,))
+
+    @locked
+    def units_between(self, start: str, end: str, plans=None) -> list:
+        only, params = "", ()
+        if plans is not None:
+            only, params = " AND p.name IN (SELECT value FROM json_each(?))", (json.dumps(sorted(plans)),)
+        rows = self.conn.execute(
+            f"SELECT p.name, u.uid, u.datum, u.schwerpunkt, {DISPLAY_DATE} "
+            f"FROM units u JOIN plans p ON p.id = u.plan_id WHERE u.datum BETWEEN ? AND ?{only} "
+            "ORDER BY u.datum, u.rowid",
+            (start, end) + params,
+        ).fetchall()
+        units = self._units_from_rows([r[1:] for r in rows])
+        rules = self.conn.execute(
+            "SELECT p.name, s.rule FROM series s JOIN plans p ON p.id = s.plan_id "
+            f"WHERE s.start <= ? AND s.ende >= ?{only}",
+            (end, start) + params,
+        ).fetchall()
+        return series.merge(
+            [(r[0], u) for r, u in zip(rows, units)],
+            series.between(((name, json.loads(rule)) for name, rule in rules), start, end),
+        )
+
+    # --- Serien ---
+    @locked
+    def series(self, plan_name: str) -> list:
+        rows = self.conn.execute(
+            "SELECT s.rule FROM series s JOIN plans p ON p.id = s.plan_id WHERE p.name = ? ORDER BY s.rowid",
+            (plan_name,),
+        )
+        return [json.loads(rule) for rule, in rows]
+
+    def _insert_series(self, plan_name: str, rule: dict) -> str:
+        rule = schema.normalize_rule(rule)
+        self.conn.execute(
+            "INSERT INTO series (id, plan_id, start, ende, rule) SELECT ?, id, ?, ?, ? FROM plans WHERE name = ?",
+            (rule["id"], rule["start"], rule["ende"], json.dumps(rule), plan_name),
+        )
+        return rule["id"]
+
+    @locked
+    def add_series(self, plan_name: str, rule: dict) -> str:
+        self._load_cache = None
+        with self.conn:
+            return self._insert_series(plan_name, rule)
+
+    @locked
+    def delete_series(self, plan_name: str, series_id: str) -> None:
+        self._load_cache = None
+        with self.conn:
+            self.conn.execute("DELETE FROM series WHERE id = ?", (series_id,))
+
+    @locked
+    def skip_occurrence(self, plan_name: str, series_id: str, datum: str) -> None:
+        self._load_cache = None
+        with self.conn:
+            row = self.conn.execute("SELECT rule FROM series WHERE id = ?", (series_id,)).fetchone()
+            if row is None:
+                return
+            rule = json.loads(row[0])
+            if datum not in rule.setdefault("ausnahmen", []):
+                rule["ausnahmen"] = sorted(rule["ausnahmen"] + [datum])
+                self.conn.execute("UPDATE series SET rule = ? WHERE id = ?", (json.dumps(rule), series_id))
+
+    @locked
+    def training_load(self) -> "LoadStore":
+        """Trainingslast direkt aus den Zahlenspalten (einmal aufgebaut, bei Änderungen verworfen)."""
+        if self._load_cache is None:
+            from athletikplus.training_load import LoadStore
+
+            plan_names = dict(self.conn.execute("SELECT id, name FROM plans"))
+            rows = self.conn.execute(
+                "SELECT u.plan_id, CAST(julianday(u.datum) - 2440587.5 AS INTEGER), e.saetze, "
+                "(e.wdh_min + e.wdh_max) / 2.0, e.last_kg, e.prozent_1rm "
+                "FROM exercises e JOIN units u ON u.uid = e.unit_uid"
+            )
+            rules = {}
+            for name, rule in self.conn.execute(
+                "SELECT p.name, s.rule FROM series s JOIN plans p ON p.id = s.plan_id ORDER BY s.rowid"
+            ):
+                rules.setdefault(name, []).append(json.loads(rule))
+            self._load_cache = LoadStore.from_rows(plan_names, rows, rules)
+        return self._load_cache
+
+    # --- Massenimport ---
+    @locked
+    def import_batch(self, athlete_rows: list = (), units: dict = None, measurements: list = ()) -> None:
+        """Übernimmt einen kompletten Import in einer Transaktion."""
+        from athletikplus import athletes
+
+        rows = [{col: athletes.clean_value(v) for col, v in row.items()} for row in athlete_rows]
+        with self.conn:
+            ids = self._insert_athletes(rows)
+            for plan_name, plan_units in (units or {}).items():
+                self.conn.execute("INSERT OR IGNORE INTO plans (name) VALUES (?)", (plan_name,))
+                for unit in plan_units:
+                    self._insert_unit(plan_name, schema.normalize_unit(unit))
+            self.conn.executemany(
+                "INSERT INTO measurements (athlete_id, metric, datum, value) VALUES (?, ?, ?, ?)",
+                [tuple(m) for m in measurements],
+            )
+        if self._athletes_cache is not None and ids:
+            self._athletes_cache = athletes.add_rows(self._athletes_cache, rows, ids)
+            self._reindex_athletes(ids)
+        if units:
+            self._load_cache = None
+        if measurements:
+            self._measurements_cache = None
+
+    # --- Leistungsdaten ---
+    @locked
+    def performance(self) -> dict:
+        """``{athlet_id (Text): {metrik: [[datum, wert], ...]}}`` (plus unstrukturierte Altdaten)."""
+        data = {k: json.loads(v) for k, v in self.conn.execute("SELECT key, value FROM performance")}
+        rows = self.conn.execute(
+            "SELECT COALESCE(CAST(athlete_id AS TEXT), athlete), metric, datum, value FROM measurements ORDER BY id"
+        )
+        for key, metric, datum, value in rows:
+            data.setdefault(key, {}).setdefault(metric, []).append([datum, value])
+        return data
+
+    @locked
+    def measurements(self) -> "MeasurementStore":
+        if self._measurements_cache is None:
+            from athletikplus.timeseries import MeasurementStore
+
+            rows = self.conn.execute(
+                "SELECT athlete_id, metric, datum, value FROM measurements WHERE athlete_id IS NOT NULL ORDER BY id"
+            )
+            self._measurements_cache = MeasurementStore.from_rows(rows)
+        return self._measurements_cache
+
+    @locked
+    def record_measurement(self, athlete_id: int, metric: str, datum: str, value: float) -> None:
+        athlete_id = int(athlete_id)
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO measurements (athlete_id, metric, datum, value) VALUES (?, ?, ?, ?)",
+                (athlete_id, metric, datum, value),
+            )
+        if self._measurements_cache is not None:
+            self._measurements_cache.add(athlete_id, metric, datum, value)
+
+
+# -----------------------------
+# Import / Export
+# -----------------------------
+def import_files(backend: SqliteBackend, data_dir: str = ".") -> None:
+    """Übernimmt CSV/JSON-Dateien samt Journalen aus ``data_dir`` in eine (leere) Datenbank.
+
+    Liest über ``storage.read_files``, im Quellverzeichnis entsteht also nichts.
+    Committet nicht selbst; der Aufrufer hält die Transaktion (``_import_once``).
+    """
+    from athletikplus.timeseries import is_measurement_series
+
+    files = storage.read_files(data_dir)
+    conn = backend.conn
+    for key, value in files["settings"].items():
+        conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+    df = files["athletes"]
+    backend._insert_athletes(df.to_dict("records"), ids=[int(i) for i in df.index])
+    for name, units in files["plans"].items():
+        conn.execute("INSERT INTO plans (name, active) VALUES (?, ?)", (name, int(files["statuses"].get(name, True))))
+        for unit in units:
+            backend._insert_unit(name, unit)
+        for rule in files["series"].get(name, []):
+            backend._insert_series(name, rule)
+    for name, assignment in files["assignments"].items():
+        backend._insert_assignment(name, assignment)
+    for key, value in files["performance"].items():
+        if is_measurement_series(value):
+            # Schlüssel ist die ID; Reihen ohne passende Athlet:in behalten ihren Namen
+            athlete_id, athlete = (int(key), None) if key.isdigit() else (None, key)
+            conn.executemany(
+                "INSERT INTO measurements (athlete_id, athlete, metric, datum, value) VALUES (?, ?, ?, ?, ?)",
+                [(athlete_id, athlete, metric, datum, v) for metric, points in value.items() for datum, v in points],
+            )
+        else:
+            conn.execute("INSERT OR REPLACE INTO performance (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+    backend._athletes_cache = None
+    backend._roster_index = None
+    backend._measurements_cache = None
+    backend._load_cache = None
+    backend._assignment_cache = None
+
+
+def export_files(backend: SqliteBackend, data_dir: str = ".") -> None:
+    """Schreibt den Datenbankinhalt als CSV/JSON-Dateien nach ``data_dir``."""
+    plans = {name: [unit_to_dict(u) for u in backend.units(name)] for name in backend.plan_names()}
+    statuses = {name: backend.plan_status(name) for name in plans}
+    rules = {name: backend.series(name) for name in plans}
+    join = os.path.join
+    storage.save_settings(backend.get_settings(), join(data_dir, storage.SETTINGS_FILE))
+    storage.save_athletes(backend.athletes(), join(data_dir, storage.ATHLETES_FILE))
+    storage.save_plans(plans, statuses, join(data_dir, storage.PLANS_FILE), series=rules,
+                       assignments=backend.assignment_index().to_dict())
+    storage.save_performance(backend.performance(), join(data_dir, storage.PERFORMANCE_FILE))
+    # Frische Snapshots: alte Journale im Zielverzeichnis dürfen nicht nachgespielt werden
+    snapshots = [join(data_dir, filename) for filename in (storage.ATHLETES_FILE, storage.PLANS_FILE,
+                                                           storage.PERFORMANCE_FILE)]
+    stale_files = [journal.journal_path(path) for path in snapshots]
+    stale_files += [binary_snapshot.binary_path(path) for path in snapshots]
+    for stale in stale_files + [join(data_dir, storage.ATHLETES_META_FILE)]:
+        if os.path.exists(stale):
+            os.remove(stale)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in ("import", "export"):
+        sys.exit("Aufruf: python -m athletikplus.sqlite_store import|export [data_dir] [db]")
+    command = sys.argv[1]
+    data_dir = sys.argv[2] if len(sys.argv) > 2 else "."
+    db_path = sys.argv[3] if len(sys.argv) > 3 else os.path.join(data_dir, "athletikplus.db")
+    if command == "import":
+        if os.path.exists(db_path):
+            sys.exit(f"{db_path} existiert bereits.")
+        SqliteBackend(db_path, data_dir=data_dir).close()
+    else:
+        export_files(SqliteBackend(db_path, data_dir=data_dir), data_dir)
@@ -0,0 +1,1172 @@
+"""Persistenz der Datenspeicher (Settings, Athlet:innen, Pläne, Leistungsdaten).
+
+Jeder Speicher liegt in einer eigenen Datei und wird einzeln und atomar
+geschrieben (Temp-Datei + ``os.replace``). Pläne und Leistungsdaten werden
+nicht bei jeder Änderung neu geschrieben: Operationen landen in einem
+Append-only-Journal (``athletikplus.journal``) und werden im Hintergrund in
+den Snapshot kompaktiert. ``FileBackend`` ist das Standard-Backend; mit
+``ATHLETIKPLUS_BACKEND=sqlite`` wird stattdessen
+``athletikplus.sqlite_store.SqliteBackend`` verwendet. Neben jedem Snapshot
+liegt ein binärer Snapshot des geparsten Stands (``athletikplus.binary_snapshot``);
+ein Neustart lädt ihn statt der Textdatei, solange er zu ihr passt.
+
+Mehrere Prozesse (App-Instanzen, Kommandozeile) dürfen dasselbe Verzeichnis
+schreiben: Jeder Commit läuft unter einer Dateisperre (``LOCK_FILE``) und
+setzt die eigenen Operationen auf den aktuellen Stand der Platte auf, statt
+ihn zu überschreiben. Athlet:innen tragen dafür eine Version je Datensatz;
+wer eine zwischenzeitlich geänderte Zeile bearbeitet, bekommt einen Konflikt
+gemeldet (``ConflictLog``), alles andere wird zusammengeführt. Neue
+Athleten-IDs werden unter der Sperre vergeben, bleiben also auch beim
+Zusammenführen gültig.
+
+pandas/NumPy werden erst importiert, wenn Athlet:innen oder Messreihen
+gebraucht werden; Pläne und Einstellungen kommen ohne aus (schneller Start
+für ``python -m athletikplus``).
+"""
+import contextlib
+import functools
+import gc
+import json
+import os
+import threading
+import time
+from bisect import insort
+from collections import deque
+from datetime import date, datetime
+from typing import TYPE_CHECKING
+
+from athletikplus import binary_snapshot, journal, metrics, schema, series
+from athletikplus.assignments import AssignmentIndex, normalize_assignment
+from athletikplus.models import Exercise, ExerciseTable, Unit, unit_to_dict
+from athletikplus.date_index import DateIndex
+from athletikplus.fileio import atomic_write, atomic_write_json, file_lock, read_json
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from athletikplus.roster_index import RosterIndex
+    from athletikplus.timeseries import MeasurementStore
+    from athletikplus.training_load import LoadStore
+
+# -----------------------------
+# Storage files
+# -----------------------------
+ATHLETES_FILE = "athletes.csv"
+PLANS_FILE = "training_plans.json"
+PERFORMANCE_FILE = "performance_data.json"
+SETTINGS_FILE = "settings.json"
+ATHLETES_META_FILE = "athletes.meta.json"  # journal_seq und Versionen zur CSV
+ATHLETE_IDS_FILE = "athletes.ids.json"     # nächste freie ID über alle Prozesse (_reserve_athlete_ids)
+LOCK_FILE = ".athletikplus.lock"
+DB_FILE = "athletikplus.db"  # SQLite-Backend (sqlite_path)
+
+SETTINGS = "settings"
+ATHLETES = "athletes"
+PLANS = "plans"
+PERFORMANCE = "performance"
+STORES = (SETTINGS, ATHLETES, PLANS, PERFORMANCE)
+STORE_FILES = {
+    SETTINGS: SETTINGS_FILE,
+    ATHLETES: ATHLETES_FILE,
+    PLANS: PLANS_FILE,
+    PERFORMANCE: PERFORMANCE_FILE,
+}
+
+# Speicher mit Operations-Journal statt Komplett-Schreiben
+JOURNALED = (ATHLETES, PLANS, PERFORMANCE)
+COMPACT_AFTER_OPS = 500
+
+# Operationen, nach denen die Trainingslast neu berechnet werden muss
+LOAD_OPS = {"add_unit", "add_units", "delete_unit", "add_series", "delete_series", "skip_occurrence"}
+
+DEFAULT_SETTINGS = {"trainer_name": "Trainer"}
+
+MAX_CONFLICTS = 50  # so viele Konfliktmeldungen bleiben abrufbar
+
+# Binären Snapshot beim Laden nur zu Snapshots schreiben, die so alt sind (s); jüngere könnten
+# mit gleicher mtime/Größe gerade ersetzt worden sein (grobe Zeitstempel im Dateisystem)
+BINARY_MIN_AGE = 2.0
+
+
+# -----------------------------
+# Laden
+# -----------------------------
+class CorruptFileError(ValueError):
+    """Eine vorhandene Datei lässt sich nicht lesen. Sie wird nie durch einen leeren Stand ersetzt."""
+
+    def __init__(self, path: str, error: Exception):
+        super().__init__(f"{path} ist beschädigt und wurde nicht geladen ({type(error).__name__}: {error}). "
+                         "Bitte aus einer Sicherung wiederherstellen; bis dahin wird diese Datei nicht geschrieben.")
+        self.path = path
+
+
+@contextlib.contextmanager
+def _reading(path: str):
+    """Unlesbarer Inhalt (kein JSON/CSV, falsche Struktur) wird zu ``CorruptFileError``."""
+    try:
+        yield
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        raise CorruptFileError(path, e) from e
+
+
+def _read_object(path: str) -> dict:
+    data = read_json(path)
+    if not isinstance(data, dict):
+        raise TypeError("kein JSON-Objekt")
+    return data
+
+
+def load_settings(path: str = SETTINGS_FILE) -> dict:
+    if os.path.exists(path):
+        with _reading(path):
+            return _read_object(path)
+    return dict(DEFAULT_SETTINGS)
+
+
+def load_athletes(path: str = ATHLETES_FILE):
+    """Gibt ``(athletes, legacy)`` zurück; ``legacy``: Datei hatte noch keine ``id``-Spalte."""
+    import pandas as pd
+
+    from athletikplus import athletes
+
+    if os.path.exists(path):
+        with _reading(path):
+            df = pd.read_csv(path)
+            if "id" in df.columns:
+                df = df.set_index("id")
+            legacy = athletes.assign_ids(df)
+            return athletes.normalize(df), legacy
+    return athletes.empty_frame(), False
+
+
+def load_athletes_meta(path: str = ATHLETES_META_FILE):
+    """Gibt ``(journal_seq, versions)`` zur Athleten-CSV zurück; ohne Datei ``(0, {})``.
+
+    Unlesbar ebenfalls ``(0, {})``: das Journal wird dann ganz nachgespielt (Athleten-Operationen
+    sind idempotent), verloren gehen nur die Versionen.
+    """
+    if os.path.exists(path):
+        try:
+            meta = read_json(path)
+            return meta["journal_seq"], {int(k): v for k, v in meta["versions"].items()}
+        except Exception:
+            pass
+    return 0, {}
+
+
+def load_plans(path: str = PLANS_FILE):
+    """Gibt ``(data, migrated)`` zurück: Inhalt im aktuellen Schema (ältere Versionen werden migriert).
+
+    Eine vorhandene, aber unlesbare Datei ergibt ``CorruptFileError``, nie einen leeren Stand.
+    """
+    if os.path.exists(path):
+        with _reading(path):
+            return schema.migrate_plans(_read_object(path))
+    return schema.migrate_plans({"plans": {}})[0], False
+
+
+def load_performance(path: str = PERFORMANCE_FILE):
+    """Gibt ``(performance, journal_seq, schema_version)`` zurück; akzeptiert auch das alte, unverpackte Format.
+
+    Bei Version 0 hängen die Messreihen noch am Namen (``schema.migrate_performance``).
+    Eine vorhandene, aber unlesbare Datei ergibt ``CorruptFileError``.
+    """
+    if os.path.exists(path):
+        with _reading(path):
+            data = _read_object(path)
+            if "journal_seq" in data and "data" in data:
+                return data["data"], data["journal_seq"], data.get("schema_version", 0)
+            return data, 0, 0
+    return {}, 0, schema.PERFORMANCE_VERSION
+
+
+def read_files(data_dir: str = ".") -> dict:
+    """Stand eines Datenverzeichnisses ohne Backend: Snapshots plus nachgespielte Journale.
+
+    Nur lesend (für Importe in andere Speicher): keine ``.bin``-Dateien, keine
+    Migration auf der Platte, keine reservierten IDs. Die Journale werden auf
+    den einfachen Daten nachgespielt wie in ``FileBackend._apply``. Ergebnis::
+
+        {"settings": {...}, "athletes": DataFrame, "plans": {plan: [einheit, ...]}, "statuses": {...},
+         "series": {...}, "assignments": {...}, "performance": {athlet_id: {metrik: [[datum, wert], ...]}}}
+    """
+    from athletikplus import athletes
+
+    def path(filename: str) -> str:
+        return os.path.join(data_dir, filename)
+
+    def ops(filename: str, snapshot_seq: int) -> list:
+        return [op for op in journal.read_ops(journal.journal_path(path(filename))) if op.get("seq", 0) > snapshot_seq]
+
+    df, _ = load_athletes(path(ATHLETES_FILE))
+    snapshot_seq, _ = load_athletes_meta(path(ATHLETES_META_FILE))
+    for op in ops(ATHLETES_FILE, snapshot_seq):
+        if op["op"] == "add_athletes":
+            df = athletes.add_rows(df, op["rows"], op["ids"])
+        elif op["op"] == "update_athletes":
+            athletes.update_rows(df, dict((athlete_id, cols) for athlete_id, cols in op["changes"]))
+        elif op["op"] == "delete_athletes":
+            df = athletes.delete_rows(df, op["ids"])
+
+    data, _ = load_plans(path(PLANS_FILE))
+    plans, statuses, rules = data["plans"], data["statuses"], data["series"]
+    for op in ops(PLANS_FILE, data["journal_seq"]):
+        kind, plan = op["op"], op.get("plan")
+        if kind == "create_plan":
+            plans.setdefault(plan, [])
+            statuses[plan] = op.get("active", True)
+        elif kind == "set_plan_status":
+            statuses[plan] = op["active"]
+        elif kind == "assign_plan":
+            data["assignments"][plan] = op["assignment"]
+        elif kind in ("add_unit", "add_units"):
+            units = [op["unit"]] if kind == "add_unit" else op["units"]
+            plans.setdefault(plan, []).extend(map(schema.normalize_unit, units))  # Journal von vor Version 3
+        elif kind == "delete_unit" and plan in plans:
+            plans[plan] = [u for u in plans[plan] if u["id"] != op["unit_id"]]
+        elif kind == "add_series":
+            rules.setdefault(plan, []).append(op["rule"])
+        elif kind == "delete_series" and plan in rules:
+            rules[plan] = [r for r in rules[plan] if r["id"] != op["series_id"]]
+        elif kind == "skip_occurrence":
+            for rule in rules.get(plan, []):
+                if rule["id"] == op["series_id"] and op["datum"] not in rule.setdefault("ausnahmen", []):
+                    insort(rule["ausnahmen"], op["datum"])
+
+    performance, snapshot_seq, version = load_performance(path(PERFORMANCE_FILE))
+    ids = athletes.name_ids(df)
+    if version < schema.PERFORMANCE_VERSION:
+        performance = schema.migrate_performance(performance, ids)
+    for op in ops(PERFORMANCE_FILE, snapshot_seq):
+        rows = op["rows"] if op["op"] == "record_measurements" else [(op["athlete"], op["metric"], op["datum"],
+                                                                      op["value"])]
+        for athlete, metric, datum, value in rows:
+            key = str(ids.get(athlete, athlete))  # Journal von vor Version 1: Name statt ID
+            performance.setdefault(key, {}).setdefault(metric, []).append([datum, value])
+
+    return {"settings": load_settings(path(SETTINGS_FILE)), "athletes": df, "plans": plans, "statuses": statuses,
+            "series": rules, "assignments": data["assignments"], "performance": performance}
+
+
+# -----------------------------
+# Speichern (je Speicher)
+# -----------------------------
+def save_settings(settings: dict, path: str = SETTINGS_FILE) -> None:
+    atomic_write_json(path, settings)
+
+
+def save_athletes(df: "pd.DataFrame", path: str = ATHLETES_FILE) -> None:
+    atomic_write(path, lambda f: df.to_csv(f))
+
+
+def save_plans(plans: dict, statuses: dict, path: str = PLANS_FILE, journal_seq: int = 0, series: dict = None,
+               assignments: dict = None) -> None:
+    """``plans``: ``{plan: [einheit, ...]}`` mit Einheiten als Dicts im aktuellen Schema."""
+    atomic_write_json(path, {"schema_version": schema.PLANS_VERSION, "plans": plans, "statuses": statuses,
+                             "series": series or {}, "assignments": assignments or {}, "journal_seq": journal_seq})
+
+
+def save_performance(performance: dict, path: str = PERFORMANCE_FILE, journal_seq: int = 0) -> None:
+    """``performance``: ``{athlet_id (Text): {metrik: [[datum, wert], ...]}}``"""
+    atomic_write_json(path, {"schema_version": schema.PERFORMANCE_VERSION, "data": performance,
+                             "journal_seq": journal_seq})
+
+
+def unit_sort_key(unit: Unit) -> str:
+    return unit.datum
+
+
+def display_date(iso: str) -> str:
+    """``2026-02-01`` -> ``01.02.2026`` (``?`` bei ungültigem Datum)."""
+    try:
+        return datetime.strptime(iso, "%Y-%m-%d").strftime("%d.%m.%Y")
+    except (TypeError, ValueError):
+        return "?"
+
+
+def display_dates(plans: dict) -> dict:
+    """Anzeige-Datum je Einheits-ID (Einheiten als Dicts); jedes Datum wird nur einmal formatiert."""
+    formatted = {}
+    result = {}
+    for units in plans.values():
+        for u in units:
+            datum = u["datum"]
+            text = formatted.get(datum)
+            if text is None:
+                text = formatted[datum] = display_date(datum)
+            result[u["id"]] = text
+    return result
+
+
+def parse_date(text: str) -> date:
+    """``TT.MM.JJJJ`` oder ISO; ``ValueError`` bei ungültiger Eingabe."""
+    text = text.strip()
+    if "." in text:
+        return datetime.strptime(text, "%d.%m.%Y").date()
+    return date.fromisoformat(text)
+
+
+def file_signature(path: str):
+    """``(mtime_ns, size)`` einer Datei oder ``None``, wenn sie fehlt."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class ConflictLog:
+    """Die letzten ``MAX_CONFLICTS`` Konflikte als ``(zeitpunkt, meldung)``; ``count`` zählt alle."""
+
+    def __init__(self):
+        self.entries = deque(maxlen=MAX_CONFLICTS)
+        self.count = 0
+
+    def add(self, message: str) -> None:
+        self.entries.append((datetime.now(), message))
+        self.count += 1
+
+    def since(self, seen: int) -> list:
+        """Meldungen nach den ersten ``seen`` (``seen``: ``count`` beim letzten Abruf)."""
+        new = min(self.count - seen, len(self.entries))
+        return list(self.entries)[-new:] if new > 0 else []
+
+
+def coalesce_athlete_adds(ops: list) -> list:
+    """Fasst aufeinanderfolgende ``add_athletes`` zusammen (ein ``concat`` statt einem je Operation)."""
+    merged, run = [], None
+    for op in ops:
+        if op["op"] != "add_athletes":
+            merged.append(op)
+            run = None
+            continue
+        if run is None:
+            run = {"op": "add_athletes", "rows": {}}
+            merged.append(run)
+        run["rows"].update(zip(op["ids"], op["rows"]))  # gleiche ID erneut: letzte Zeile gilt (idempotent)
+        run["seq"] = op["seq"]
+    for op in merged:
+        if isinstance(op.get("rows"), dict):
+            op["ids"], op["rows"] = list(op["rows"]), list(op["rows"].values())
+    return merged
+
+
+@contextlib.contextmanager
+def gc_paused():
+    """Keine zyklische Speicherbereinigung beim Aufbau vieler kleiner Objekte (Laden, Entpacken).
+
+    Jedes Tupel/jede Liste zählt sonst für die nächste Sammlung; bei 100 000
+    Einheiten liefe sie hunderte Male über denselben, noch wachsenden Bestand.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def locked(method):
+    """Serialisiert Methodenaufrufe über ``self.lock`` (Backend wird von allen Sitzungen geteilt)."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+# -----------------------------
+# Backends
+# -----------------------------
+class FileBackend:
+    """CSV/JSON-Dateien, komplett im Speicher gehalten; schreibt nur geänderte Speicher.
+
+    Eine Instanz kann von mehreren Sitzungen gleichzeitig genutzt werden.
+    ``refresh()`` lädt Speicher nach, deren Datei sich seit dem letzten
+    Lesen/Schreiben geändert hat (mtime/Größe), z. B. durch andere Prozesse.
+
+    Änderungen an Athlet:innen, Plänen und Leistungsdaten werden als Operationen
+    ins Journal angehängt (O(1) I/O pro Operation) und beim Laden auf den Snapshot
+    nachgespielt. Ab ``COMPACT_AFTER_OPS`` Operationen schreibt ein
+    Hintergrund-Thread den Snapshot neu und kürzt das Journal.
+
+    Hat ein anderer Prozess seit dem letzten Lesen geschrieben, lädt ``flush()``
+    unter der Dateisperre dessen Stand und spielt die eigenen Operationen darauf
+    nach (``_rebase``). Einstellungen werden je Schlüssel zusammengeführt.
+    """
+
+    # Attribut -> Speicher, der es setzt (für das Nachladen in ``__getattr__``)
+    STORE_ATTRS = {
+        "settings": SETTINGS, "_settings_base": SETTINGS, "_settings_changed": SETTINGS,
+        "_athletes": ATHLETES, "_next_athlete_id": ATHLETES, "roster_index": ATHLETES, "_versions": ATHLETES,
+        "plans": PLANS, "exercise_table": PLANS, "statuses": PLANS, "series_rules": PLANS, "date_index": PLANS, "_training_load": PLANS,
+        "_assignments": PLANS,
+        "performance_data": PERFORMANCE, "_measurements": PERFORMANCE,
+    }
+
+    def __init__(self, data_dir: str = ".", stores=STORES):
+        """``stores``: sofort zu ladende Speicher; alle anderen werden beim ersten Zugriff geladen."""
+        self.data_dir = data_dir
+        self.lock = threading.RLock()
+        self.dirty = set()
+        self.signatures = {}
+        self.seq = {store: 0 for store in JOURNALED}          # zuletzt vergebene seq
+        self.pending = {store: [] for store in JOURNALED}     # noch nicht angehängte Operationen
+        self.journal_len = {store: 0 for store in JOURNALED}  # Operationen im Journal
+        self._compacting = set()
+        self._held = threading.local()  # hält dieser Thread die Dateisperre?
+        self.conflicts = ConflictLog()
+        for store in stores:
+            self._load_store(store)
+
+    def __getattr__(self, name: str):
+        # Nur für noch nicht geladene Speicher (normale Attribute werden vorher gefunden)
+        store = self.STORE_ATTRS.get(name)
+        signatures = self.__dict__.get("signatures")
+        if store is None or signatures is None or store in signatures:
+            raise AttributeError(name)
+        self.ensure_loaded(store)
+        return self.__dict__[name]
+
+    @locked
+    def ensure_loaded(self, store: str) -> None:
+        if store not in self.signatures:
+            self._load_store(store)
+
+    def path(self, filename: str) -> str:
+        return os.path.join(self.data_dir, filename)
+
+    def journal_path(self, store: str) -> str:
+        return journal.journal_path(self.path(STORE_FILES[store]))
+
+    @contextlib.contextmanager
+    def commit_lock(self):
+        """Dateisperre des Verzeichnisses; im selben Thread verschachtelt nutzbar."""
+        if getattr(self._held, "lock", False):
+            yield
+            return
+        with file_lock(self.path(LOCK_FILE)):
+            self._held.lock = True
+            try:
+                yield
+            finally:
+                self._held.lock = False
+
+    def _signature(self, store: str):
+        sig = file_signature(self.path(STORE_FILES[store]))
+        if store in JOURNALED:
+            return sig, file_signature(self.journal_path(store))
+        return sig
+
+    def _signature_bytes(self, store: str) -> int:
+        """Dateigröße laut Signatur (Snapshot plus Journal)."""
+        sig = self.signatures.get(store)
+        parts = sig if store in JOURNALED else (sig,)
+        return sum(part[1] for part in parts if part)
+
+    @metrics.timed("load_store")
+    def _load_store(self, store: str) -> None:
+        previous = self.signatures.get(store)
+        with gc_paused():
+            try:
+                self._read_store(store)
+            except CorruptFileError:
+                # Alte Signatur behalten: refresh/flush/compact lesen erneut (und scheitern), statt zu schreiben
+                if previous is None:
+                    self.signatures.pop(store, None)
+                else:
+                    self.signatures[store] = previous
+                raise
+
+    def _read_store(self, store: str) -> None:
+        path = self.path(STORE_FILES[store])
+        self.signatures[store] = self._signature(store)
+        metrics.add_bytes(store, read=self._signature_bytes(store))
+        if store == SETTINGS:
+            self.settings = load_settings(path)
+            self._settings_base = dict(self.settings)  # Stand beim Lesen, für das Zusammenführen
+            self._settings_changed = set()
+            return
+        packed = binary_snapshot.read(path, self.signatures[store][0], self._binary_key(store))
+        if store == ATHLETES:
+            from athletikplus.roster_index import RosterIndex
+
+            legacy = False
+            if packed is not None:
+                self._athletes, self._versions, roster = binary_snapshot.unpack_athletes(packed)
+                self._next_athlete_id, snapshot_seq = packed["next_id"], packed["journal_seq"]
+            else:
+                self._athletes, legacy = load_athletes(path)
+                self._next_athlete_id = int(self._athletes.index.max()) + 1 if len(self._athletes) else 1
+                # Ohne Meta-Datei (ältere Daten) ganzes Journal nachspielen; Athleten-Operationen sind idempotent
+                snapshot_seq, self._versions = load_athletes_meta(self.path(ATHLETES_META_FILE))
+            self.roster_index = None
+            replayed = self._replay(ATHLETES, snapshot_seq)
+            if packed is not None and not replayed:
+                self.roster_index = roster  # gilt nur ohne nachgespielte Operationen
+            else:
+                self.roster_index = RosterIndex(self._athletes)
+            if legacy:
+                self._save_store(ATHLETES)
+                return
+        elif store == PLANS:
+            migrated = False
+            self.exercise_table = ExerciseTable()  # neu je Laden: verworfene Übungen werden frei
+            if packed is not None:
+                self.plans, keys, plan_keys = binary_snapshot.unpack_plans(packed, display_date, self.exercise_table)
+                self.statuses, self.series_rules = packed["statuses"], packed["series"]
+                self.date_index = DateIndex(self.plans, keys, plan_keys)
+                self._assignments = AssignmentIndex(packed["assignments"])
+                snapshot_seq = packed["journal_seq"]
+            else:
+                data, migrated = load_plans(path)
+                self.statuses, self.series_rules = data["statuses"], data["series"]
+                anzeige = display_dates(data["plans"])
+                self.plans = {
+                    name: [self.exercise_table.unit_from_dict(u, anzeige[u["id"]]) for u in units]
+                    for name, units in data["plans"].items()
+                }
+                self.date_index = DateIndex(self.plans)
+                self._assignments = AssignmentIndex(data["assignments"])
+                snapshot_seq = data["journal_seq"]
+            self._training_load = None  # wird bei Bedarf aus plans/series_rules aufgebaut
+            self._replay(PLANS, snapshot_seq)
+            if migrated:
+                self._save_store(PLANS)
+                return
+        elif store == PERFORMANCE:
+            migrated = False
+            if packed is not None:
+                self.performance_data = binary_snapshot.unpack_performance(packed)
+                snapshot_seq = packed["journal_seq"]
+            else:
+                self.performance_data, snapshot_seq, version = load_performance(path)
+                if version < schema.PERFORMANCE_VERSION:
+                    from athletikplus import athletes
+
+                    self.performance_data = schema.migrate_performance(self.performance_data,
+                                                                       athletes.name_ids(self._athletes))
+                    migrated = True
+            self._measurements = None  # wird bei Bedarf aus performance_data aufgebaut
+            self._replay(PERFORMANCE, snapshot_seq)
+            if migrated:
+                self._save_store(PERFORMANCE)
+                return
+        if packed is None:
+            self._write_binary_after_load(store)
+
+    def _replay(self, store: str, snapshot_seq: int) -> int:
+        """Spielt die Operationen nach ``snapshot_seq`` nach; gibt ihre Anzahl zurück."""
+        ops = journal.read_ops(self.journal_path(store))
+        # Alle Zeilen zählen für die Kompaktierung (ein binärer Snapshot kann schon weiter sein als die Textdatei)
+        self.journal_len[store] = len(ops)
+        ops = [op for op in ops if op.get("seq", 0) > snapshot_seq]
+        for op in coalesce_athlete_adds(ops) if store == ATHLETES else ops:
+            self._apply(op)
+        self.seq[store] = ops[-1]["seq"] if ops else snapshot_seq
+        self.pending[store] = []
+        return len(ops)
+
+    def _snapshot_text(self, store: str) -> str:
+        if store == ATHLETES:
+            return self._athletes.to_csv()
+        if store == PLANS:
+            plans = {name: [unit_to_dict(u) for u in units] for name, units in self.plans.items()}
+            return json.dumps({"schema_version": schema.PLANS_VERSION, "plans": plans, "statuses": self.statuses,
+                               "series": self.series_rules, "assignments": self._assignments.to_dict(),
+                               "journal_seq": self.seq[PLANS]})
+        return json.dumps({"schema_version": schema.PERFORMANCE_VERSION, "data": self.performance_data,
+                           "journal_seq": self.seq[PERFORMANCE]})
+
+    def _snapshot_meta(self, store: str):
+        """Begleitdaten zum Snapshot (nur Athlet:innen: die CSV hat keinen Platz dafür)."""
+        if store == ATHLETES:
+            return {"journal_seq": self.seq[ATHLETES], "versions": dict(self._versions)}
+        return None
+
+    def _binary_key(self, store: str):
+        """Was außer der Signatur zum binären Snapshot passen muss (Aufbau der gepackten Objekte)."""
+        if store == ATHLETES:
+            import pandas as pd
+
+            return pd.__version__
+        if store == PLANS:
+            return schema.PLANS_VERSION, Unit._fields, Exercise._fields
+        return schema.PERFORMANCE_VERSION
+
+    def _binary_payload(self, store: str):
+        """Aktueller Stand für ``binary_snapshot`` (unter ``self.lock``); ``None``, wenn er sich nicht packen lässt."""
+        if store == ATHLETES:
+            from athletikplus import athletes
+
+            packed = binary_snapshot.pack_athletes(athletes.normalize(self._athletes), self._versions,
+                                                   self.roster_index)
+            if packed is not None:
+                packed["next_id"] = self._next_athlete_id
+        elif store == PLANS:
+            packed = binary_snapshot.pack_plans(self.plans)
+            if packed is not None:
+                packed.update(statuses=self.statuses, series=self.series_rules,
+                              assignments=self._assignments.to_dict())
+        else:
+            packed = binary_snapshot.pack_performance(self.performance_data)
+        if packed is None:
+            return None
+        packed["journal_seq"] = self.seq[store]
+        return binary_snapshot.dumps(packed)
+
+    def _write_binary(self, store: str, signature, payload: bytes) -> None:
+        """Binärer Snapshot zum Snapshot mit ``signature``; Fehler lassen nur die Textdatei übrig."""
+        with contextlib.suppress(OSError):
+            written = binary_snapshot.write(self.path(STORE_FILES[store]), signature, self._binary_key(store), payload)
+            metrics.add_bytes(store, written=written)
+
+    def _write_binary_after_load(self, store: str) -> None:
+        """Nach dem Lesen der Textdatei: binären Snapshot für den nächsten Start anlegen.
+
+        Der Stand enthält das nachgespielte Journal bis ``seq``; ältere Operationen
+        werden beim nächsten Laden übersprungen.
+        """
+        signature = self.signatures[store][0]
+        if signature is None or time.time_ns() - signature[0] < BINARY_MIN_AGE * 1e9:
+            return
+        payload = self._binary_payload(store)
+        if payload is None:
+            return
+        with contextlib.suppress(OSError), self.commit_lock():
+            if file_signature(self.path(STORE_FILES[store])) == signature:
+                self._write_binary(store, signature, payload)
+
+    def _write_snapshot(self, store: str, text: str, meta, payload) -> None:
+        """``payload``: binärer Snapshot zum selben Stand (``_binary_payload``) oder ``None``."""
+        path = self.path(STORE_FILES[store])
+        binary_snapshot.remove(path)  # passt ab hier nicht mehr, auch wenn das Schreiben abbricht
+        atomic_write(path, lambda f: f.write(text))
+        metrics.add_bytes(store, written=len(text))
+        if meta is not None:
+            # Nach dem Snapshot: bricht es dazwischen ab, wird ab der alten seq nachgespielt
+            atomic_write_json(self.path(ATHLETES_META_FILE), meta)
+        if payload is not None:
+            self._write_binary(store, file_signature(path), payload)
+
+    def _save_store(self, store: str) -> None:
+        path = self.path(STORE_FILES[store])
+        with self.commit_lock():
+            if store == SETTINGS:
+                if self._signature(SETTINGS) != self.signatures[SETTINGS]:
+                    self._merge_settings(load_settings(path))
+                save_settings(self.settings, path)
+                self._settings_base = dict(self.settings)
+                self._settings_changed.clear()
+            elif store in JOURNALED:
+                # Snapshot enthält alle Operationen bis seq -> Journal entsprechend kürzen
+                self._write_snapshot(store, self._snapshot_text(store), self._snapshot_meta(store),
+                                     self._binary_payload(store))
+                self.pending[store] = []
+                self.journal_len[store] = journal.truncate_through(self.journal_path(store), self.seq[store])
+            self.signatures[store] = self._signature(store)
+        if store == SETTINGS:
+            metrics.add_bytes(store, written=self._signature_bytes(store))
+
+    def _merge_settings(self, disk: dict) -> None:
+        """Übernimmt die eigenen geänderten Schlüssel in den Stand der Platte (``disk``).
+
+        Hat ein anderer Prozess denselben Schlüssel seit dem Lesen anders gesetzt,
+        bleibt dessen Wert und es wird ein Konflikt gemeldet.
+        """
+        for key in self._settings_changed:
+            theirs, ours = disk.get(key), self.settings.get(key)
+            if theirs != self._settings_base.get(key) and theirs != ours:
+                self.conflicts.add(f"Einstellung „{key}“ wurde gleichzeitig anderweitig geändert; "
+                                   f"gespeichert bleibt {theirs!r} statt {ours!r}.")
+            else:
+                disk[key] = ours
+        self.settings = disk
+
+    def mark_dirty(self, *stores: str) -> None:
+        self.dirty.update(stores)
+
+    @locked
+    def flush(self) -> None:
+        if not self.dirty and not any(self.pending.values()):
+            return
+        with self.commit_lock():
+            for store in JOURNALED:
+                if self.pending[store] and self._signature(store) != self.signatures[store]:
+                    self._rebase(store)  # ein anderer Prozess hat seit unserem Lesen geschrieben
+                ops = self.pending[store]
+                if ops:
+                    entries = [{k: v for k, v in op.items() if k != "_base"} for op in ops]
+                    metrics.add_bytes(store, written=journal.append_ops(self.journal_path(store), entries))
+                    self.journal_len[store] += len(ops)
+                    self.pending[store] = []
+                    self.signatures[store] = self._signature(store)
+                    if self.journal_len[store] >= COMPACT_AFTER_OPS:
+                        self._start_compaction(store)
+            for store in STORES:
+                if store in self.dirty:
+                    self._save_store(store)
+            self.dirty.clear()
+
+    @locked
+    def refresh(self) -> list:
+        """Lädt extern geänderte Speicher neu; gibt deren Namen zurück."""
+        reloaded = []
+        for store in STORES:
+            if store in self.dirty or store in self._compacting or self.pending.get(store):
+                continue
+            if store in self.signatures and self._signature(store) != self.signatures[store]:
+                self._load_store(store)
+                reloaded.append(store)
+        return reloaded
+
+    # --- Journal ---
+    def _record(self, store: str, op: dict) -> None:
+        self.ensure_loaded(store)  # erst laden, sonst würde das Nachspielen die seq überschreiben
+        op["seq"] = self.seq[store] + 1
+        self._apply(op)
+        self.seq[store] = op["seq"]  # erst danach: eine fehlgeschlagene Operation verbraucht keine seq
+        self.pending[store].append(op)
+
+    def _rebase(self, store: str) -> None:
+        """Lädt den Stand der Platte und spielt die eigenen, noch nicht geschriebenen Operationen darauf nach.
+
+        Unabhängige Änderungen werden so zusammengeführt (neue ``seq``; neue
+        Athleten-IDs nur, falls sie doch belegt sind, etwa nach Löschen von
+        ``ATHLETE_IDS_FILE``). Änderungen an Athlet:innen, die ein anderer
+        Prozess seit ``_base`` geändert oder gelöscht hat, werden verworfen und in
+        ``conflicts`` gemeldet.
+        """
+        ops = self.pending[store]
+        self._load_store(store)
+        new_ids = {}  # eigene neue Athleten-ID -> ID nach dem Zusammenführen
+        for op in ops:
+            op = self._merge_op(op, new_ids)
+            if op is not None:
+                self._record(store, op)
+
+    def _merge_op(self, op: dict, new_ids: dict):
+        """``op`` passend zum neu geladenen Stand, oder ``None``, wenn sie entfällt."""
+        kind = op["op"]
+        if kind == "add_athletes":
+            ids = op["ids"]
+            if any(athlete_id in self._athletes.index for athlete_id in ids):
+                fresh = range(self._next_athlete_id, self._next_athlete_id + len(ids))
+                new_ids.update(zip(ids, fresh))
+                op["ids"] = list(fresh)
+        elif kind in ("update_athletes", "delete_athletes"):
+            base = {new_ids.get(i, i): version for i, version in op["_base"].items()}
+            op["_base"] = base
+            if kind == "update_athletes":
+                changes = {new_ids.get(i, i): cols for i, cols in op["changes"]}
+                ok, conflicts = self._check_athletes(list(changes), base)
+                for athlete_id, reason in conflicts.items():
+                    self.conflicts.add(f"{reason} Änderung nicht übernommen ({', '.join(changes[athlete_id])}).")
+                op["changes"] = [[athlete_id, changes[athlete_id]] for athlete_id in ok]
+            else:
+                ids = [new_ids.get(i, i) for i in op["ids"]]
+                ok, conflicts = self._check_athletes([i for i in ids if i in self._athletes.index], base)
+                for reason in conflicts.values():
+                    self.conflicts.add(f"{reason} Nicht gelöscht.")
+                op["ids"] = ok
+            if not ok:
+                return None
+        elif kind == "create_plan" and op["plan"] in self.plans:
+            return None  # gleichzeitig angelegt
+        return op
+
+    def _apply(self, op: dict) -> None:
+        kind = op["op"]
+        if kind.endswith("_athletes"):
+            from athletikplus import athletes
+            from athletikplus.roster_index import INDEXED_COLUMNS
+        elif kind in LOAD_OPS:
+            self._training_load = None  # Einheiten/Serien geändert -> bei Bedarf neu aufbauen
+        if kind == "add_athletes":
+            self._athletes = athletes.add_rows(self._athletes, op["rows"], op["ids"])
+            self._next_athlete_id = max(self._next_athlete_id, max(op["ids"]) + 1)
+            self._reindex_athletes(op["ids"])
+            self._versions.update((athlete_id, 1) for athlete_id in op["ids"])
+        elif kind == "update_athletes":
+            athletes.update_rows(self._athletes, dict((athlete_id, cols) for athlete_id, cols in op["changes"]))
+            self._reindex_athletes([athlete_id for athlete_id, cols in op["changes"]
+                                    if set(INDEXED_COLUMNS) & set(cols)])
+            for athlete_id, cols in op["changes"]:
+                self._versions[athlete_id] = self._versions.get(athlete_id, 0) + 1
+        elif kind == "delete_athletes":
+            self._athletes = athletes.delete_rows(self._athletes, op["ids"])
+            self._reindex_athletes(op["ids"])
+            for athlete_id in op["ids"]:
+                self._versions.pop(athlete_id, None)
+        elif kind == "create_plan":
+            self.plans.setdefault(op["plan"], [])
+            self.statuses[op["plan"]] = op.get("active", True)
+        elif kind == "set_plan_status":
+            self.statuses[op["plan"]] = op["active"]
+        elif kind == "assign_plan":
+            self._assignments.set(op["plan"], op["assignment"])
+        elif kind == "add_unit":
+            unit = self.exercise_table.unit_from_dict(op["unit"], display_date(op["unit"]["datum"]))
+            insort(self.plans.setdefault(op["plan"], []), unit, key=unit_sort_key)
+            self.date_index.add(op["plan"], unit)
+        elif kind == "add_units":
+            anzeige = display_dates({op["plan"]: op["units"]})
+            new_units = [self.exercise_table.unit_from_dict(u, anzeige[u["id"]]) for u in op["units"]]
+            units = self.plans.setdefault(op["plan"], [])
+            units.extend(new_units)
+            units.sort(key=unit_sort_key)
+            for unit in new_units:
+                self.date_index.add(op["plan"], unit)
+        elif kind == "delete_unit":
+            units = self.plans.get(op["plan"], [])
+            for i, u in enumerate(units):
+                if u.id == op["unit_id"]:
+                    units.pop(i)
+                    self.date_index.remove(op["unit_id"])
+                    break
+        elif kind == "add_series":
+            self.series_rules.setdefault(op["plan"], []).append(op["rule"])
+        elif kind == "delete_series":
+            rules = self.series_rules.get(op["plan"], [])
+            rules[:] = [r for r in rules if r["id"] != op["series_id"]]
+        elif kind == "skip_occurrence":
+            for rule in self.series_rules.get(op["plan"], []):
+                if rule["id"] == op["series_id"] and op["datum"] not in rule.setdefault("ausnahmen", []):
+                    insort(rule["ausnahmen"], op["datum"])
+        elif kind in ("record_measurement", "record_measurements"):
+            rows = op["rows"] if kind == "record_measurements" else [(op["athlete"], op["metric"], op["datum"],
+                                                                      op["value"])]
+            names = {}
+            if any(isinstance(row[0], str) for row in rows):
+                from athletikplus import athletes
+
+                names = athletes.name_ids(self._athletes)  # Journal von vor Version 1: Name statt ID
+            for athlete, metric, datum, value in rows:
+                key = str(names.get(athlete, athlete))
+                self.performance_data.setdefault(key, {}).setdefault(metric, []).append([datum, value])
+            if kind == "record_measurements":
+                self._measurements = None  # bei Bedarf neu aufbauen statt Punkt für Punkt nachführen
+            elif self._measurements is not None and key.isdigit():
+                self._measurements.add(int(key), op["metric"], op["datum"], op["value"])
+
+    def _start_compaction(self, store: str) -> None:
+        if store in self._compacting:
+            return
+        self._compacting.add(store)
+        threading.Thread(target=self.compact, args=(store,), name=f"compact-{store}", daemon=True).start()
+
+    def compact(self, store: str) -> None:
+        """Faltet das Journal in einen neuen Snapshot (Serialisieren unter Lock, Schreiben ohne).
+
+        Geschrieben wird unter der Dateisperre, aber ohne ``self.lock`` (``flush``
+        nimmt beide in umgekehrter Reihenfolge). Hat ein anderer Prozess
+        inzwischen geschrieben, wird dessen Stand übernommen und unter beiden
+        Sperren kompaktiert.
+        """
+        try:
+            with self.lock:
+                self.ensure_loaded(store)
+                self.flush()
+                seq = self.seq[store]
+                text = self._snapshot_text(store)
+                meta = self._snapshot_meta(store)
+                payload = self._binary_payload(store)
+            with self.commit_lock():
+                # Eigene Commits seit dem Serialisieren sind erlaubt (seq > seq bleibt im Journal)
+                if self._signature(store) == self.signatures[store]:
+                    self._write_snapshot(store, text, meta, payload)
+                    self.journal_len[store] = journal.truncate_through(self.journal_path(store), seq)
+                    self.signatures[store] = self._signature(store)
+                    return
+            with self.lock, self.commit_lock():
+                self.flush()
+                if self._signature(store) != self.signatures[store]:
+                    self._load_store(store)
+                self._save_store(store)
+        finally:
+            self._compacting.discard(store)
+
+    # --- Settings ---
+    def get_settings(self) -> dict:
+        return self.settings
+
+    @locked
+    def set_setting(self, key: str, value) -> None:
+        self.settings[key] = value
+        self._settings_changed.add(key)
+        self.mark_dirty(SETTINGS)
+
+    # --- Athlet:innen ---
+    def athletes(self) -> "pd.DataFrame":
+        return self._athletes
+
+    def athlete_count(self) -> int:
+        return len(self._athletes)
+
+    def athlete_index(self) -> "RosterIndex":
+        return self.roster_index
+
+    def _reindex_athletes(self, ids: list) -> None:
+        if self.roster_index is not None:  # beim Nachspielen wird erst danach aufgebaut
+            self.roster_index.update(self._athletes, ids)
+
+    def _reserve_athlete_ids(self, n: int) -> list:
+        """``n`` neue IDs, eindeutig über alle Prozesse auf diesem Verzeichnis.
+
+        Ohne Reservierung vergäben zwei Prozesse dieselbe nächste ID; beim
+        Zusammenführen bekäme eine Seite neue IDs, und die schon
+        zurückgegebenen (und evtl. in Zuordnungen oder Messwerten benutzten)
+        wären veraltet.
+        """
+        path = self.path(ATHLETE_IDS_FILE)
+        with self.commit_lock():
+            try:
+                start = int(read_json(path)["next_id"])
+            except (OSError, ValueError, KeyError, TypeError):
+                start = 0
+            start = max(start, self._next_athlete_id)
+            atomic_write_json(path, {"next_id": start + n})
+        return list(range(start, start + n))
+
+    @locked
+    def add_athletes(self, rows: list) -> list:
+        """Legt Athlet:innen an; die zurückgegebenen IDs bleiben auch nach dem Zusammenführen gültig."""
+        from athletikplus import athletes
+
+        if not rows:
+            return []
+        athletes.check_rows(rows)  # vor dem Journal: ungültige Werte verbrauchen keine Sequenznummer
+        ids = self._reserve_athlete_ids(len(rows))
+        rows = [{col: athletes.clean_value(v) for col, v in row.items()} for row in rows]
+        self._record(ATHLETES, {"op": "add_athletes", "ids": ids, "rows": rows})
+        return ids
+
+    def add_athlete(self, row: dict) -> int:
+        return self.add_athletes([row])[0]
+
+    def athlete_versions(self, ids) -> dict:
+        """``{id: version}`` zum angezeigten Stand; an ``update_athletes``/``delete_athletes`` übergeben."""
+        return {int(i): self._versions.get(int(i), 0) for i in ids}
+
+    def _check_athletes(self, ids: list, base: dict):
+        """``(ok, konflikte)``: seit ``base`` unveränderte IDs und ``{id: grund}`` für die übrigen."""
+        ok, conflicts = [], {}
+        for athlete_id in ids:
+            if athlete_id not in self._athletes.index:
+                conflicts[athlete_id] = f"Athlet:in #{athlete_id} wurde inzwischen gelöscht."
+            elif self._versions.get(athlete_id, 0) != base.get(athlete_id, 0):
+                conflicts[athlete_id] = f"„{self._athletes.at[athlete_id, 'Name']}“ wurde inzwischen anderweitig geändert."
+            else:
+                ok.append(athlete_id)
+        return ok, conflicts
+
+    @locked
+    def update_athletes(self, changes: dict, versions: dict = None) -> list:
+        """``changes``: ``{id: {spalte: wert}}`` - nur diese Zellen werden geändert.
+
+        ``versions``: Stand der Zeilen beim Anzeigen (``athlete_versions``). Zeilen,
+        die seitdem geändert oder gelöscht wurden, bleiben unverändert; zurück
+        kommen die Konfliktmeldungen. Ungültige Zahlenwerte (``athletes.LIMITS``)
+        werden nicht übernommen und ebenfalls gemeldet.
+        """
+        from athletikplus import athletes
+
+        self.ensure_loaded(ATHLETES)
+        changes = {int(athlete_id): cols for athlete_id, cols in changes.items()}
+        invalid = athletes.drop_invalid(changes, self._athlete_label)
+        changes = {athlete_id: cols for athlete_id, cols in changes.items() if cols}
+        base = self.athlete_versions(changes) if versions is None else {int(i): v for i, v in versions.items()}
+        ok, conflicts = self._check_athletes(list(changes), base)
+        if ok:
+            self._record(ATHLETES, {"op": "update_athletes", "changes": [
+                [athlete_id, {col: athletes.clean_value(v) for col, v in changes[athlete_id].items()}]
+                for athlete_id in ok
+            ], "_base": self.athlete_versions(ok)})
+        return invalid + [f"{reason} Änderung nicht übernommen ({', '.join(changes[athlete_id])})."
+                          for athlete_id, reason in conflicts.items()]
+
+    def _athlete_label(self, athlete_id: int) -> str:
+        from athletikplus import athletes
+
+        name = athletes.clean_value(self._athletes.at[athlete_id, "Name"]) if athlete_id in self._athletes.index else None
+        return f"Athlet:in #{athlete_id}" if name is None else f"„{name}“"
+
+    @locked
+    def delete_athletes(self, ids: list, versions: dict = None) -> list:
+        """Wie ``update_athletes``: seit ``versions`` geänderte Zeilen werden nicht gelöscht."""
+        self.ensure_loaded(ATHLETES)
+        ids = [int(i) for i in ids if int(i) in self._athletes.index]  # schon gelöscht: nichts zu tun
+        base = self.athlete_versions(ids) if versions is None else {int(i): v for i, v in versions.items()}
+        ok, conflicts = self._check_athletes(ids, base)
+        if ok:
+            self._record(ATHLETES, {"op": "delete_athletes", "ids": ok, "_base": self.athlete_versions(ok)})
+        return [f"{reason} Nicht gelöscht." for reason in conflicts.values()]
+
+    # --- Pläne ---
+    def plan_names(self) -> list:
+        return list(self.plans.keys())
+
+    def plan_count(self) -> int:
+        return len(self.plans)
+
+    def has_plan(self, name: str) -> bool:
+        return name in self.plans
+
+    def plan_status(self, name: str) -> bool:
+        return self.statuses.get(name, True)
+
+    @locked
+    def create_plan(self, name: str) -> None:
+        self._record(PLANS, {"op": "create_plan", "plan": name})
+
+    @locked
+    def set_plan_status(self, name: str, active: bool) -> None:
+        self._record(PLANS, {"op": "set_plan_status", "plan": name, "active": active})
+
+    # --- Zuordnungen ---
+    def assignment_index(self) -> AssignmentIndex:
+        return self._assignments
+
+    def plan_assignment(self, name: str) -> dict:
+        return self._assignments.assignment(name)
+
+    @locked
+    def assign_plan(self, name: str, athletes=(), teams=(), sports=()) -> None:
+        """Ersetzt die Zuordnung des Plans (alles leer: keine)."""
+        assignment = normalize_assignment({"athletes": athletes, "teams": teams, "sports": sports})
+        self._record(PLANS, {"op": "assign_plan", "plan": name, "assignment": assignment})
+
+    # --- Einheiten ---
+    def units(self, plan_name: str) -> list:
+        return self.plans.get(plan_name, [])
+
+    @locked
+    def add_unit(self, plan_name: str, unit: dict) -> str:
+        unit = schema.normalize_unit(unit)
+        self._record(PLANS, {"op": "add_unit", "plan": plan_name, "unit": unit})
+        return unit["id"]
+
+    @locked
+    def delete_unit(self, plan_name: str, unit_id: str) -> None:
+        self._record(PLANS, {"op": "delete_unit", "plan": plan_name, "unit_id": unit_id})
+
+    def unit_count(self, plan_name: str) -> int:
+        return len(self.plans.get(plan_name, []))
+
+    def recent_units(self, plan_name: str, limit: int, offset: int = 0) -> list:
+        """Einheiten eines Plans, neueste zuerst, Ausschnitt ``[offset, offset + limit)``.
+
+        Die Einheiten liegen bereits nach Datum sortiert und mit vorberechnetem
+        ``datum_anzeige`` vor; es wird nur der Ausschnitt umgedreht.
+        """
+        units = self.plans.get(plan_name, [])
+        end = len(units) - offset
+        return units[max(end - limit, 0):max(end, 0)][::-1]
+
+    def units_between(self, start: str, end: str, plans=None) -> list:
+        """Alle ``(plan_name, unit)`` mit ``start <= datum <= end`` (ISO-Strings), inkl. Serien-Terminen.
+
+        ``plans``: nur diese Pläne (``None``: alle).
+        """
+        names = self.series_rules if plans is None else plans
+        rules = ((plan_name, rule) for plan_name in names for rule in self.series_rules.get(plan_name, ()))
+        return series.merge(self.date_index.between(start, end, plans), series.between(rules, start, end))
+
+    # --- Serien ---
+    def series(self, plan_name: str) -> list:
+        return self.series_rules.get(plan_name, [])
+
+    @locked
+    def add_series(self, plan_name: str, rule: dict) -> str:
+        rule = schema.normalize_rule(rule)
+        self._record(PLANS, {"op": "add_series", "plan": plan_name, "rule": rule})
+        return rule["id"]
+
+    @locked
+    def delete_series(self, plan_name: str, series_id: str) -> None:
+        self._record(PLANS, {"op": "delete_series", "plan": plan_name, "series_id": series_id})
+
+    @locked
+    def skip_occurrence(self, plan_name: str, series_id: str, datum: str) -> None:
+        """Ein Termin der Serie entfällt (Ausnahme), die Regel bleibt."""
+        self._record(PLANS, {"op": "skip_occurrence", "plan": plan_name, "series_id": series_id, "datum": datum})
+
+    @locked
+    def training_load(self) -> "LoadStore":
+        """Trainingslast aller Einheiten und Serien (einmal aufgebaut, bei Änderungen verworfen)."""
+        from athletikplus.training_load import LoadStore
+
+        if self._training_load is None:
+            self._training_load = LoadStore.from_units(self.plans, self.series_rules)
+        return self._training_load
+
+    # --- Massenimport ---
+    @locked
+    def import_batch(self, athlete_rows: list = (), units: dict = None, measurements: list = ()) -> None:
+        """Übernimmt einen kompletten Import als je eine Operation pro Speicher.
+
+        ``units``: ``{plan: [unit, ...]}`` (fehlende Pläne werden angelegt),
+        ``measurements``: ``[(athlet_id, metrik, datum, wert), ...]``.
+        """
+        self.add_athletes(list(athlete_rows))
+        for plan_name, plan_units in (units or {}).items():
+            if plan_name not in self.plans:
+                self.create_plan(plan_name)
+            plan_units = [schema.normalize_unit(u) for u in plan_units]
+            self._record(PLANS, {"op": "add_units", "plan": plan_name, "units": plan_units})
+        if measurements:
+            self._record(PERFORMANCE, {"op": "record_measurements", "rows": [list(m) for m in measurements]})
+
+    # --- Leistungsdaten ---
+    def performance(self) -> dict:
+        """``{athlet_id (Text): {metrik: [[datum, wert], ...]}}`` (plus unstrukturierte Altdaten)."""
+        return self.performance_data
+
+    @locked
+    def measurements(self) -> "MeasurementStore":
+        """Spaltenbasierter Index der Messreihen (einmal aufgebaut, danach nachgeführt)."""
+        from athletikplus.timeseries import MeasurementStore
+
+        if self._measurements is None:
+            self._measurements = MeasurementStore.from_performance(self.performance_data)
+        return self._measurements
+
+    @locked
+    def record_measurement(self, athlete_id: int, metric: str, datum: str, value: float) -> None:
+        self._record(PERFORMANCE, {
+            "op": "record_measurement", "athlete": int(athlete_id), "metric": metric, "datum": datum, "value": value,
+        })
+
+
+def sqlite_path(data_dir: str = ".", tenant: str = None) -> str:
+    """Datenbankdatei des SQLite-Backends für ``data_dir`` (Mandant ``tenant``).
+
+    Standard ist ``athletikplus.db`` im Datenverzeichnis. ``ATHLETIKPLUS_DB``
+    ersetzt das; ``{mandant}`` darin wird durch die Mandanten-ID ersetzt. Ohne
+    Platzhalter gilt die Angabe nur für den Standard-Mandanten, alle anderen
+    behalten ihre eigene Datei, sonst teilten sich alle eine Datenbank.
+    """
+    from athletikplus.tenants import DEFAULT_TENANT
+
+    tenant = tenant or DEFAULT_TENANT
+    override = os.environ.get("ATHLETIKPLUS_DB")
+    if override and "{mandant}" in override:
+        return override.replace("{mandant}", tenant)
+    if override and tenant == DEFAULT_TENANT:
+        return override
+    return os.path.join(data_dir, DB_FILE)
+
+
+def open_backend(data_dir: str = ".", lazy: bool = False, tenant: str = None):
+    """Öffnet das per ``ATHLETIKPLUS_BACKEND`` gewählte Backend (``files`` oder ``sqlite``).
+
+    ``lazy``: Dateien erst beim ersten Zugriff laden (Kommandozeile, Batch-Jobs).
+    ``tenant``: Mandanten-ID zu ``data_dir`` (für ``sqlite_path``).
+    """
+    kind = os.environ.get("ATHLETIKPLUS_BACKEND", "files").lower()
+    if kind == "sqlite":
+        from athletikplus.sqlite_store import SqliteBackend
+
+        return SqliteBackend(sqlite_path(data_dir, tenant), data_dir=data_dir)
+    return FileBackend(data_dir, stores=() if lazy else STORES)
@@ -0,0 +1,91 @@
+"""Mandanten (Trainer:innen, Vereine) mit je eigenem Datenverzeichnis.
+
+Ein kleiner Katalog im Wurzelverzeichnis ordnet jedem Mandanten seinen
+Speicher zu::
+
+    tenants.json: {"tenants": {"tsv-u17": {"name": "TSV U17", "dir": "tenants/tsv-u17"}}}
+
+Jeder Mandant hat die üblichen Dateien (bzw. seine ``athletikplus.db``) in
+seinem Verzeichnis; eine Sitzung öffnet nur dieses (``storage.open_backend``).
+Laden, Speicher und Schreiben hängen damit nur von der Größe des eigenen
+Mandanten ab.
+
+Ohne Katalog ist das Wurzelverzeichnis selbst der einzige Mandant
+(``DEFAULT_TENANT``, bisherige Installationen). Wird der erste weitere
+Mandant angelegt, übernimmt der Katalog es als ``DEFAULT_TENANT`` mit
+``"dir": "."``; es werden keine Dateien verschoben.
+"""
+import os
+import re
+import threading
+import unicodedata
+
+from athletikplus.fileio import atomic_write_json, file_lock, read_json
+from athletikplus.storage import file_signature
+
+CATALOG_FILE = "tenants.json"
+LOCK_FILE = ".tenants.lock"
+TENANTS_DIR = "tenants"
+DEFAULT_TENANT = "standard"
+DEFAULT_NAME = "Standard"
+
+
+def slugify(name: str) -> str:
+    """``"TSV Süd U17"`` -> ``"tsv-sud-u17"`` (nur ``a-z0-9-``)."""
+    text = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+class Catalog:
+    def __init__(self, root: str = "."):
+        self.root = os.path.abspath(root)
+        self.path = os.path.join(self.root, CATALOG_FILE)
+        self.lock = threading.RLock()
+        self._signature = None
+        self._tenants = {}
+
+    def _entries(self) -> dict:
+        """``{id: {"name", "dir"}}``; liest die Datei nur neu, wenn sie sich geändert hat."""
+        with self.lock:
+            signature = file_signature(self.path)
+            if signature is None:
+                return {DEFAULT_TENANT: {"name": DEFAULT_NAME, "dir": "."}}
+            if signature != self._signature:
+                self._tenants = read_json(self.path)["tenants"]
+                self._signature = signature
+            return self._tenants
+
+    def tenants(self) -> dict:
+        """``{id: anzeigename}``, sortiert nach Namen."""
+        entries = self._entries()
+        return {tid: entries[tid]["name"] for tid in sorted(entries, key=lambda t: entries[t]["name"].casefold())}
+
+    def __contains__(self, tenant_id: str) -> bool:
+        return tenant_id in self._entries()
+
+    def data_dir(self, tenant_id: str) -> str:
+        """Absolutes Datenverzeichnis; ``KeyError`` für unbekannte Mandanten."""
+        return os.path.normpath(os.path.join(self.root, self._entries()[tenant_id]["dir"]))
+
+    def add(self, name: str) -> str:
+        """Legt einen Mandanten mit leerem Verzeichnis an und gibt seine ID zurück.
+
+        Lesen und Schreiben des Katalogs laufen unter einer Dateisperre, damit
+        gleichzeitige Anlagen aus mehreren Prozessen (App, Kommandozeile) keine
+        Einträge verlieren.
+        """
+        name = name.strip()
+        base = slugify(name)
+        if not base:
+            raise ValueError("Bitte einen Namen mit Buchstaben oder Ziffern angeben.")
+        with self.lock, file_lock(os.path.join(self.root, LOCK_FILE)):
+            entries = dict(self._entries())
+            tenant_id, n = base, 2
+            while tenant_id in entries:
+                tenant_id, n = f"{base}-{n}", n + 1
+            directory = os.path.join(TENANTS_DIR, tenant_id)
+            os.makedirs(os.path.join(self.root, directory), exist_ok=True)
+            entries[tenant_id] = {"name": name, "dir": directory}
+            atomic_write_json(self.path, {"tenants": entries})
+            self._tenants, self._signature = entries, file_signature(self.path)
+        return tenant_id
@@ -0,0 +1,228 @@
+"""Spaltenbasierter Messwert-Speicher für die Entwicklung-Seite.
+
+Je ``(athlet_id, metrik)`` liegen zwei sortierte NumPy-Arrays: Tage seit
+1970-01-01 (``int64``) und Werte (``float64``). Alle Auswertungen (gleitende
+Mittel, Bestwerte, Wochenvergleich, Team-Aggregate, Downsampling) arbeiten
+vektorisiert auf diesen Arrays. Persistiert wird weiterhin über das Backend
+(Journal bzw. Tabelle ``measurements``); der Speicher ist ein Index darüber.
+"""
+import numpy as np
+
+EPOCH = np.datetime64("1970-01-01", "D")
+MAX_CHART_POINTS = 1000
+
+
+def is_measurement_series(value) -> bool:
+    """``{metrik: [[datum, wert], ...]}`` (gegenüber unstrukturierten Altdaten)."""
+    return isinstance(value, dict) and all(
+        isinstance(points, list) and all(isinstance(p, list) and len(p) == 2 for p in points)
+        for points in value.values()
+    )
+
+
+def to_days(datums) -> np.ndarray:
+    """ISO-Daten -> Tage seit 1970-01-01; ungültige Angaben werden zu ``-1``."""
+    try:
+        return (np.array(datums, dtype="datetime64[D]") - EPOCH).astype(np.int64)
+    except ValueError:
+        days = np.full(len(datums), -1, dtype=np.int64)
+        for i, d in enumerate(datums):
+            try:
+                days[i] = (np.datetime64(str(d)[:10], "D") - EPOCH).astype(np.int64)
+            except ValueError:
+                pass
+        return days
+
+
+def to_dates(days: np.ndarray) -> np.ndarray:
+    return EPOCH + np.asarray(days).astype("timedelta64[D]")
+
+
+def week_of(days: np.ndarray) -> np.ndarray:
+    """Wochennummer (Montag als Wochenbeginn; der 1.1.1970 war ein Donnerstag)."""
+    return (np.asarray(days) + 3) // 7
+
+
+class Series:
+    """Messreihe einer Metrik: aufsteigend nach Tag sortiert (stabil)."""
+
+    __slots__ = ("days", "values")
+
+    def __init__(self, days: np.ndarray, values: np.ndarray):
+        order = np.argsort(days, kind="stable")
+        self.days = days[order]
+        self.values = values[order]
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def append(self, day: int, value: float) -> None:
+        # Neue Messwerte kommen fast immer am Ende; sonst einsortieren
+        if not len(self.days) or day >= self.days[-1]:
+            self.days = np.append(self.days, day)
+            self.values = np.append(self.values, value)
+        else:
+            i = np.searchsorted(self.days, day, side="right")
+            self.days = np.insert(self.days, i, day)
+            self.values = np.insert(self.values, i, value)
+
+
+class MeasurementStore:
+    """Index ``(athlet_id, metrik) -> Series`` mit vektorisierten Auswertungen."""
+
+    def __init__(self):
+        self._series = {}
+
+    @classmethod
+    def from_performance(cls, performance: dict) -> "MeasurementStore":
+        store = cls()
+        for key, metrics in performance.items():
+            if not key.isdigit() or not is_measurement_series(metrics):
+                continue  # ohne Athlet:in-ID (siehe schema.migrate_performance) oder unstrukturiert
+            for metric, points in metrics.items():
+                store._set(int(key), metric, [p[0] for p in points], [p[1] for p in points])
+        return store
+
+    @classmethod
+    def from_rows(cls, rows) -> "MeasurementStore":
+        """Aus ``(athlet_id, metrik, datum, wert)``-Zeilen, z. B. aus SQLite."""
+        grouped = {}
+        for athlete, metric, datum, value in rows:
+            datums, values = grouped.setdefault((athlete, metric), ([], []))
+            datums.append(datum)
+            values.append(value)
+        store = cls()
+        for (athlete, metric), (datums, values) in grouped.items():
+            store._set(athlete, metric, datums, values)
+        return store
+
+    def _set(self, athlete: int, metric: str, datums: list, values: list) -> None:
+        days = to_days(datums)
+        vals = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        keep = (days >= 0) & ~np.isnan(vals)
+        if keep.any():
+            self._series[(athlete, metric)] = Series(days[keep], vals[keep])
+
+    def add(self, athlete: int, metric: str, datum: str, value: float) -> None:
+        day = int(to_days([datum])[0])
+        if day < 0 or value is None:
+            return
+        series = self._series.get((athlete, metric))
+        if series is None:
+            self._series[(athlete, metric)] = Series(np.array([day]), np.array([float(value)]))
+        else:
+            series.append(day, float(value))
+
+    # --- Index ---
+    def athletes(self) -> list:
+        return sorted({athlete for athlete, _ in self._series})
+
+    def metrics(self, athlete: int = None) -> list:
+        return sorted({m for a, m in self._series if athlete is None or a == athlete})
+
+    def series(self, athlete: int, metric: str) -> Series:
+        s = self._series.get((athlete, metric))
+        return s if s is not None else Series(np.array([], dtype=np.int64), np.array([]))
+
+    def __len__(self) -> int:
+        return sum(len(s) for s in self._series.values())
+
+    # --- Auswertungen ---
+    def rolling_mean(self, athlete: int, metric: str, window_days: int = 7) -> np.ndarray:
+        """Mittel über die letzten ``window_days`` Kalendertage je Messpunkt (inkl. Tag selbst)."""
+        s = self.series(athlete, metric)
+        csum = np.concatenate(([0.0], np.cumsum(s.values)))
+        end = np.arange(1, len(s) + 1)
+        start = np.searchsorted(s.days, s.days - window_days + 1, side="left")
+        return (csum[end] - csum[start]) / (end - start)
+
+    def personal_best(self, athlete: int, metric: str, lower_is_better: bool = False):
+        """``(tag, wert)`` des Bestwerts oder ``None``; bei Gleichstand zählt der erste."""
+        s = self.series(athlete, metric)
+        if not len(s):
+            return None
+        i = int(np.argmin(s.values) if lower_is_better else np.argmax(s.values))
+        return int(s.days[i]), float(s.values[i])
+
+    def running_best(self, athlete: int, metric: str, lower_is_better: bool = False) -> np.ndarray:
+        s = self.series(athlete, metric)
+        return (np.minimum if lower_is_better else np.maximum).accumulate(s.values)
+
+    def weekly(self, athlete: int, metric: str):
+        """Wochenmittel: ``(wochen, mittel)``, nur Wochen mit Messwerten."""
+        s = self.series(athlete, metric)
+        return _group_mean(week_of(s.days), s.values)
+
+    def week_over_week(self, athlete: int, metric: str):
+        """``(wochen, mittel, delta)``; ``delta`` zur vorherigen Kalenderwoche, sonst NaN."""
+        weeks, means = self.weekly(athlete, metric)
+        delta = np.full(len(weeks), np.nan)
+        if len(weeks) > 1:
+            consecutive = np.diff(weeks) == 1
+            delta[1:] = np.where(consecutive, np.diff(means), np.nan)
+        return weeks, means, delta
+
+    def team_aggregate(self, athletes: list, metric: str, how: str = "mean", by: str = "week"):
+        """Aggregat einer Metrik über mehrere Athlet:innen je Woche bzw. Tag.
+
+        Jede Person geht mit ihrem Mittel pro Zeitraum ein, damit häufig
+        Messende nicht überwiegen. ``how``: ``mean``, ``max``, ``min`` oder ``count``.
+        """
+        keys, values = [], []
+        for athlete in athletes:
+            s = self._series.get((athlete, metric))
+            if s is None:
+                continue
+            k = week_of(s.days) if by == "week" else s.days
+            k, v = _group_mean(k, s.values)
+            keys.append(k)
+            values.append(v)
+        if not keys:
+            return np.array([], dtype=np.int64), np.array([])
+        keys, values = np.concatenate(keys), np.concatenate(values)
+        if how == "mean":
+            return _group_mean(keys, values)
+        uniq, inverse = np.unique(keys, return_inverse=True)
+        if how == "count":
+            return uniq, np.bincount(inverse).astype(np.float64)
+        order = np.argsort(inverse, kind="stable")
+        starts = np.searchsorted(inverse[order], np.arange(len(uniq)))
+        reduce = {"max": np.maximum, "min": np.minimum}[how]
+        return uniq, reduce.reduceat(values[order], starts)
+
+
+def _group_mean(keys: np.ndarray, values: np.ndarray):
+    uniq, inverse = np.unique(keys, return_inverse=True)
+    return uniq, np.bincount(inverse, weights=values) / np.bincount(inverse)
+
+
+def week_start(weeks: np.ndarray) -> np.ndarray:
+    """Montag der Wochennummer aus ``week_of`` als ``datetime64[D]``."""
+    return to_dates(np.asarray(weeks) * 7 - 3)
+
+
+def downsample_index(values: np.ndarray, max_points: int = MAX_CHART_POINTS) -> np.ndarray:
+    """Min/Max-Decimation: Indizes von Minimum und Maximum je Bucket plus erster/letzter Punkt.
+
+    Spitzen bleiben sichtbar, das Ergebnis hat höchstens ``max_points`` Punkte.
+    """
+    n = len(values)
+    if n <= max_points:
+        return np.arange(n)
+    buckets = max(1, (max_points - 2) // 2)
+    bounds = np.linspace(1, n - 1, buckets + 1).astype(np.int64)
+    starts = bounds[:-1][np.diff(bounds) > 0]
+    bucket = np.searchsorted(starts, np.arange(1, n - 1), side="right") - 1
+    inner = values[1:n - 1]
+    picks = [np.array([0, n - 1])]
+    for reduce in (np.minimum, np.maximum):
+        extreme = reduce.reduceat(inner, starts - 1)
+        hits = np.flatnonzero(inner == extreme[bucket])
+        _, first = np.unique(bucket[hits], return_index=True)
+        picks.append(hits[first] + 1)
+    return np.unique(np.concatenate(picks))
+
+
+def downsample(x: np.ndarray, y: np.ndarray, max_points: int = MAX_CHART_POINTS):
+    idx = downsample_index(y, max_points)
+    return x[idx], y[idx]
@@ -0,0 +1,217 @@
+"""Trainingslast aus den Zahlenfeldern der Übungen, vektorisiert über alle Einheiten.
+
+Je Übung einer Einheit (auch Serien-Termine) liegt eine Zeile in flachen
+NumPy-Spalten: Plan, Tag seit 1970-01-01, Sätze, Wiederholungen (Mitte aus
+``wdh_min``/``wdh_max``), Last in kg und %1RM. Fehlende Angaben sind ``NaN``
+und zählen in Summen als 0. Auswertungen:
+
+* ``weekly``: Wochensumme einer Größe (Sätze, Wiederholungen, Volumen =
+  Sätze × Wiederholungen × kg),
+* ``intensity_distribution``: Sätze je %1RM-Zone,
+* ``acwr``/``acwr_by_plan``: Verhältnis akuter (7 Tage) zu chronischer Last
+  (28 Tage, auf eine Woche gerechnet),
+* ``acwr_by_athlete``: dasselbe je Athlet:in über ihre zugeordneten Pläne
+  (``athletikplus.assignments``).
+
+Das Backend baut den Speicher einmal auf und verwirft ihn bei Änderungen an
+Einheiten oder Serien (``training_load()``).
+"""
+import numpy as np
+
+from athletikplus import series
+from athletikplus.timeseries import to_days, week_of
+
+MEASURES = {"volumen": "Volumen (kg)", "wiederholungen": "Wiederholungen", "saetze": "Sätze"}
+INTENSITY_ZONES = [60, 70, 80, 90]  # Grenzen in %1RM
+INTENSITY_LABELS = ["< 60 %", "60–70 %", "70–80 %", "80–90 %", "≥ 90 %"]
+ACUTE_DAYS = 7
+CHRONIC_DAYS = 28
+
+
+def _float_column(values) -> np.ndarray:
+    return np.array(list(values), dtype=np.float64)  # None -> NaN
+
+
+def _reps(wdh_min, wdh_max):
+    if wdh_min is None:
+        return None
+    return (wdh_min + wdh_max) / 2
+
+
+class LoadStore:
+    def __init__(self, plan_names: list, plan: np.ndarray, days: np.ndarray, saetze: np.ndarray,
+                 wdh: np.ndarray, kg: np.ndarray, pct: np.ndarray):
+        keep = days >= 0  # Einheiten ohne gültiges Datum fallen raus
+        self.plan_names = plan_names
+        self.plan = plan[keep]
+        self.days = days[keep]
+        self.saetze = saetze[keep]
+        self.wdh = wdh[keep]
+        self.kg = kg[keep]
+        self.pct = pct[keep]
+
+    @classmethod
+    def from_units(cls, plans: dict, rules: dict = None) -> "LoadStore":
+        """``plans``: ``{plan: [Unit, ...]}``, ``rules``: ``{plan: [serie, ...]}`` (über ihre ganze Laufzeit)."""
+        rules = rules or {}
+        names = sorted(set(plans) | set(rules))
+        codes = {}  # Exercise -> Zeile in ``table`` (Übungen sind geteilt, s. models)
+        plan_rows, unit_datums, unit_sizes, ex_codes = [], [], [], []
+        for name in names:
+            units = list(plans.get(name, ()))
+            for rule in rules.get(name, ()):
+                units.extend(series.materialize(rule, rule["start"], rule["ende"]))
+            rows = 0
+            for u in units:
+                for ex in u.uebungen:
+                    code = codes.get(ex)
+                    if code is None:
+                        code = codes[ex] = len(codes)
+                    ex_codes.append(code)
+                unit_datums.append(u.datum)
+                unit_sizes.append(len(u.uebungen))
+                rows += len(u.uebungen)
+            plan_rows.append(rows)
+        table = list(codes)
+        ex_codes = np.array(ex_codes, dtype=np.int64)
+        unique_datums, inverse = np.unique(np.array(unit_datums, dtype=object).astype(str), return_inverse=True)
+        days = np.repeat(to_days(unique_datums)[inverse], unit_sizes) if unit_datums else np.array([], np.int64)
+        return cls(
+            names,
+            np.repeat(np.arange(len(names)), plan_rows),
+            days,
+            _float_column(ex.saetze for ex in table)[ex_codes],
+            _float_column(_reps(ex.wdh_min, ex.wdh_max) for ex in table)[ex_codes],
+            _float_column(ex.last_kg for ex in table)[ex_codes],
+            _float_column(ex.prozent_1rm for ex in table)[ex_codes],
+        )
+
+    @classmethod
+    def from_rows(cls, plan_names: dict, rows, rules: dict = None) -> "LoadStore":
+        """Aus Zahlenspalten (SQLite).
+
+        ``plan_names``: ``{plan_id: name}``, ``rows``: ``(plan_id, tag, saetze, wdh, last_kg, prozent_1rm)``
+        je Übung (``tag`` wie ``to_days``, ``wdh`` bereits die Mitte aus min/max).
+        """
+        data = np.array(list(rows), dtype=np.float64).reshape(-1, 6)
+        extra = cls.from_units({}, rules)
+        names = sorted(set(plan_names.values()) | set(extra.plan_names))
+        index = {name: i for i, name in enumerate(names)}
+        ids = sorted(plan_names)
+        codes = np.array([index[plan_names[i]] for i in ids], dtype=np.int64)
+        plan = codes[np.searchsorted(ids, data[:, 0])] if ids else np.array([], np.int64)
+        remap = np.array([index[name] for name in extra.plan_names], dtype=np.int64)
+        days = np.nan_to_num(data[:, 1], nan=-1).astype(np.int64)
+        return cls(
+            names,
+            np.concatenate([plan, remap[extra.plan]]),
+            np.concatenate([days, extra.days]),
+            *(np.concatenate([data[:, col], getattr(extra, attr)])
+              for col, attr in ((2, "saetze"), (3, "wdh"), (4, "kg"), (5, "pct"))),
+        )
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    # -----------------------------
+    # Größen
+    # -----------------------------
+    def values(self, measure: str) -> np.ndarray:
+        """Last je Zeile; ``NaN``-Angaben zählen als 0."""
+        sets = np.nan_to_num(self.saetze)
+        if measure == "saetze":
+            return sets
+        reps = np.nan_to_num(sets * self.wdh)
+        if measure == "wiederholungen":
+            return reps
+        if measure == "volumen":
+            return np.nan_to_num(reps * self.kg)
+        raise ValueError(f"Unbekannte Größe: {measure}")
+
+    def _mask(self, plans) -> np.ndarray:
+        if not plans:
+            return np.ones(len(self.days), dtype=bool)
+        codes = [i for i, name in enumerate(self.plan_names) if name in set(plans)]
+        return np.isin(self.plan, codes)
+
+    # -----------------------------
+    # Auswertungen
+    # -----------------------------
+    def weekly(self, measure: str = "volumen", plans=None):
+        """``(wochen, summen)`` lückenlos von der ersten bis zur letzten Woche (``week_of``)."""
+        mask = self._mask(plans)
+        if not mask.any():
+            return np.array([], dtype=np.int64), np.array([])
+        weeks = week_of(self.days[mask])
+        first = weeks.min()
+        sums = np.bincount(weeks - first, weights=self.values(measure)[mask])
+        return np.arange(first, first + len(sums)), sums
+
+    def intensity_distribution(self, plans=None) -> np.ndarray:
+        """Sätze je Zone (``INTENSITY_LABELS``); nur Übungen mit %1RM-Angabe."""
+        mask = self._mask(plans) & ~np.isnan(self.pct)
+        zones = np.searchsorted(INTENSITY_ZONES, self.pct[mask], side="right")
+        return np.bincount(zones, weights=np.nan_to_num(self.saetze[mask]), minlength=len(INTENSITY_LABELS))
+
+    def _daily(self, measure: str, mask: np.ndarray, groups: np.ndarray, n_groups: int, until: int = None):
+        """``(erster_tag, matrix)``: Tagessummen je Gruppe, Tage lückenlos bis mindestens ``until``."""
+        days = self.days[mask]
+        first = days.min()
+        n_days = int(max(days.max(), first if until is None else until) - first + 1)
+        flat = np.bincount(groups * n_days + (days - first), weights=self.values(measure)[mask],
+                           minlength=n_groups * n_days)
+        return first, flat.reshape(n_groups, n_days)
+
+    @staticmethod
+    def _ratio(daily: np.ndarray):
+        """Akute Last (7 Tage), chronische Last (28 Tage je Woche) und deren Verhältnis je Tag."""
+        csum = np.concatenate([np.zeros((len(daily), 1)), np.cumsum(daily, axis=1)], axis=1)
+        end = np.arange(1, daily.shape[1] + 1)
+        acute = csum[:, end] - csum[:, np.maximum(end - ACUTE_DAYS, 0)]
+        chronic = (csum[:, end] - csum[:, np.maximum(end - CHRONIC_DAYS, 0)]) / (CHRONIC_DAYS / ACUTE_DAYS)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(chronic > 0, acute / chronic, np.nan)
+        return acute, chronic, ratio
+
+    def acwr(self, measure: str = "volumen", plans=None):
+        """``(tage, akut, chronisch, verhältnis)`` für die gewählten Pläne zusammen."""
+        mask = self._mask(plans)
+        if not mask.any():
+            empty = np.array([])
+            return np.array([], dtype=np.int64), empty, empty, empty
+        first, daily = self._daily(measure, mask, np.zeros(int(mask.sum()), dtype=np.int64), 1)
+        acute, chronic, ratio = self._ratio(daily)
+        return np.arange(first, first + daily.shape[1]), acute[0], chronic[0], ratio[0]
+
+    def acwr_by_plan(self, measure: str = "volumen", day: int = None) -> dict:
+        """``{plan: (akut, chronisch, verhältnis)}`` am Tag ``day`` (Standard: letzter Tag mit Daten)."""
+        if not len(self):
+            return {}
+        mask = np.ones(len(self.days), dtype=bool)
+        first, daily = self._daily(measure, mask, self.plan, len(self.plan_names), day)
+        acute, chronic, ratio = self._ratio(daily)
+        col = daily.shape[1] - 1 if day is None else max(int(day - first), 0)
+        return {
+            name: (float(acute[i, col]), float(chronic[i, col]), float(ratio[i, col]))
+            for i, name in enumerate(self.plan_names)
+        }
+
+    def acwr_by_athlete(self, assignments, roster, measure: str = "volumen", day: int = None, plans=None) -> dict:
+        """``{athlet_id: (akut, chronisch, verhältnis)}`` am Tag ``day`` über die Pläne jeder Athlet:in.
+
+        Ihre Tageslast ist die Summe der Tageslasten ihrer Pläne (direkt, über
+        Mannschaft oder Sportart zugeordnet); akute und chronische Last sind
+        Summen über Tage und addieren sich daher je Plan. ``plans`` beschränkt
+        auf diese Pläne. Athlet:innen ohne (passenden) Plan fehlen.
+        """
+        by_plan = self.acwr_by_plan(measure, day)
+        if plans:
+            by_plan = {name: values for name, values in by_plan.items() if name in set(plans)}
+        result = {}
+        for athlete_id in roster.search():
+            own = [by_plan[name] for name in assignments.plans_for_athlete(athlete_id, roster) if name in by_plan]
+            if not own:
+                continue
+            acute, chronic = sum(v[0] for v in own), sum(v[1] for v in own)
+            result[athlete_id] = (acute, chronic, acute / chronic if chronic > 0 else float("nan"))
+        return result
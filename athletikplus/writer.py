@@ -0,0 +1,100 @@
+"""Write-behind: Änderungen werden im Hintergrund-Thread geschrieben.
+
+Die Backends übernehmen jede Änderung sofort in den Speicher (Lesen sieht
+also immer den eigenen Stand); ``request()`` merkt nur vor, dass geschrieben
+werden muss. Anfragen innerhalb von ``delay`` Sekunden werden zu einem
+``flush()`` zusammengefasst, spätestens nach ``max_delay`` wird geschrieben.
+Schlägt das Schreiben fehl, bleibt der Fehler in ``last_error`` sichtbar und
+es wird nach ``retry_delay`` erneut versucht. Beim Beenden (``close()``, auch
+am Prozessende) wird synchron geschrieben; Anfragen danach schreiben sofort.
+"""
+import atexit
+import threading
+import time
+from datetime import datetime
+
+from athletikplus import metrics
+
+
+class WriteBehind:
+    def __init__(self, backend, delay: float = 0.2, max_delay: float = 2.0, retry_delay: float = 2.0):
+        self.backend = backend
+        self.delay = delay
+        self.max_delay = max_delay
+        self.retry_delay = retry_delay
+        self.last_error = None  # (zeitpunkt, meldung) bis zum nächsten erfolgreichen Schreiben
+        self.requests = 0
+        self.writes = 0
+        self._cond = threading.Condition()
+        self._due = None       # nächster Schreibzeitpunkt (verschiebt sich bei jeder Anfrage)
+        self._deadline = None  # spätestens dann, auch bei Dauerfeuer
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def pending(self) -> bool:
+        return self._due is not None
+
+    def request(self) -> None:
+        """Merkt einen Schreibvorgang vor (kehrt sofort zurück; nach ``close()`` synchron)."""
+        now = time.monotonic()
+        with self._cond:
+            closed = self._closed
+        if closed:
+            self.requests += 1
+            self._flush()
+            return
+        with self._cond:
+            self.requests += 1
+            self._due = now + self.delay
+            if self._deadline is None:
+                self._deadline = now + self.max_delay
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed and self._due is None:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                wait = min(self._due, self._deadline) - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                self._due = self._deadline = None
+            self._flush()
+
+    def _flush(self) -> bool:
+        try:
+            with metrics.section("background_flush"):
+                self.backend.flush()
+        except Exception as e:
+            # Nicht verlieren: Operationen bleiben im Backend vorgemerkt, später erneut versuchen
+            self.last_error = (datetime.now(), f"{type(e).__name__}: {e}")
+            with self._cond:
+                if self._due is None and not self._closed:
+                    self._due = self._deadline = time.monotonic() + self.retry_delay
+                    self._cond.notify()
+            return False
+        self.last_error = None
+        self.writes += 1
+        return True
+
+    def flush_now(self) -> bool:
+        """Schreibt sofort (synchron); ``True`` bei Erfolg."""
+        with self._cond:
+            self._due = self._deadline = None
+        return self._flush()
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout=5)
+        self.flush_now()
+        atexit.unregister(self.close)  # hält sonst Writer und Backend bis zum Prozessende
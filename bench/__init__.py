@@ -0,0 +1 @@
+"""Benchmarks für AthletikPlus: synthetische Daten (``bench.generate``) und Messlauf (``bench.run``)."""
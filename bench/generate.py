@@ -0,0 +1,144 @@
+"""Reproduzierbarer Generator für realistische Testdaten.
+
+Schreibt ``athletes.csv``, ``training_plans.json``, ``performance_data.json``
+und ``settings.json`` im normalen Speicherformat in ein Verzeichnis::
+
+    python -m bench.generate DATA_DIR --size large
+    python -m bench.generate DATA_DIR --athletes 10000 --plans 500 --units 100000 --seed 7
+"""
+import argparse
+import os
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from athletikplus import athletes, schema, storage
+
+SIZES = {
+    "small": {"athletes": 200, "plans": 20, "units": 2_000, "measurements": 10_000},
+    "medium": {"athletes": 2_000, "plans": 100, "units": 20_000, "measurements": 100_000},
+    "large": {"athletes": 10_000, "plans": 500, "units": 100_000, "measurements": 500_000},
+}
+
+FIRST_NAMES = ["Anna", "Ben", "Clara", "David", "Emma", "Felix", "Greta", "Hannah", "Jonas", "Lea",
+               "Lukas", "Mia", "Noah", "Paul", "Sophie", "Tim", "Lina", "Elias", "Marie", "Leon"]
+LAST_NAMES = ["Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner", "Becker",
+              "Schulz", "Hoffmann", "Koch", "Richter", "Klein", "Wolf", "Neumann", "Braun"]
+TEAMS = ["U15", "U17", "U19", "U23", "Erste", "Zweite", "Damen", "Herren"]
+SPORTS = ["Fußball", "Handball", "Leichtathletik", "Basketball", "Volleyball", "Schwimmen", "Hockey"]
+FOCUSES = ["Kraft", "Ausdauer", "Schnelligkeit", "Beweglichkeit", "Koordination", "Regeneration", "Technik"]
+EXERCISES = ["Kniebeugen", "Kreuzheben", "Bankdrücken", "Klimmzüge", "Ausfallschritte", "Sprints 30 m",
+             "Box Jumps", "Planks", "Hip Thrusts", "Rudern", "Schulterdrücken", "Seilspringen"]
+REPS = ["5", "8", "10", "12", "8-12", "3x30s", "6-8"]
+INTENSITIES = ["60%", "70%", "80%", "85%", "Körpergewicht", "20kg", "40kg", "60kg", "RPE 7", "RPE 8"]
+# Metrik -> (Mittelwert, Streuung, Trend pro Jahr)
+METRICS = {
+    "Sprint 30 m (s)": (4.6, 0.25, -0.08),
+    "Countermovement Jump (cm)": (38.0, 5.0, 1.5),
+    "Kniebeuge 1RM (kg)": (95.0, 20.0, 6.0),
+    "Ruhepuls (bpm)": (58.0, 6.0, -1.0),
+}
+SEASON_START = date(2025, 7, 1)
+SEASON_DAYS = 365
+
+
+def generate_athletes(rng: np.random.Generator, n: int) -> pd.DataFrame:
+    df = pd.DataFrame({
+        "Löschen": False,
+        "Name": [f"{f} {l}" for f, l in zip(rng.choice(FIRST_NAMES, n), rng.choice(LAST_NAMES, n))],
+        "Alter": rng.integers(14, 36, n),
+        "Größe (cm)": rng.normal(178, 9, n).round().clip(150, 210),
+        "Gewicht (kg)": rng.normal(74, 10, n).round().clip(45, 120),
+        "Mannschaft": rng.choice(TEAMS, n),
+        "Sportart": rng.choice(SPORTS, n),
+    }, index=pd.RangeIndex(1, n + 1, name="id"))
+    return athletes.normalize(df)
+
+
+def generate_plans(rng: np.random.Generator, n_plans: int, n_units: int):
+    names = [f"Plan {i + 1:03d} – {FOCUSES[i % len(FOCUSES)]}" for i in range(n_plans)]
+    plan_of_unit = rng.integers(0, n_plans, n_units)
+    datums = [(SEASON_START + timedelta(days=int(d))).isoformat() for d in rng.integers(0, SEASON_DAYS, n_units)]
+    focus = rng.choice(FOCUSES, n_units)
+    n_exercises = rng.integers(3, 9, n_units)
+    # Übungen ohne Wiederholung je Einheit: erste k Spalten einer zufälligen Permutation
+    picks = rng.random((n_units, len(EXERCISES))).argsort(axis=1)
+    total = int(n_exercises.sum())
+    sets = rng.integers(2, 6, total).tolist()
+    reps = rng.choice(REPS, total).tolist()
+    intensities = rng.choice(INTENSITIES, total).tolist()
+    unit_ids = [rng.bytes(6).hex() for _ in range(n_units)]  # wie schema.new_unit_id, aber reproduzierbar
+    dosage = {
+        (r, i): dict(zip(("wdh_min", "wdh_max", "last_kg", "prozent_1rm"), schema.parse_dosage(r, i)))
+        for r in REPS for i in INTENSITIES
+    }
+
+    plans = {name: [] for name in names}
+    j = 0
+    for i in range(n_units):
+        k = int(n_exercises[i])
+        plans[names[plan_of_unit[i]]].append({
+            "id": unit_ids[i],
+            "datum": datums[i],
+            "schwerpunkt": str(focus[i]),
+            "uebungen": [
+                {"name": EXERCISES[e], "saetze": sets[j + n], "wiederholungen": reps[j + n], "intensitaet": intensities[j + n],
+                 **dosage[reps[j + n], intensities[j + n]]}
+                for n, e in enumerate(picks[i, :k])
+            ],
+        })
+        j += k
+    for units in plans.values():
+        units.sort(key=lambda u: u["datum"])
+    statuses = {name: bool(active) for name, active in zip(names, rng.random(n_plans) > 0.2)}
+    return plans, statuses
+
+
+def generate_performance(rng: np.random.Generator, ids: list, n: int) -> dict:
+    """Zufällige Testtage je Athlet:in und Metrik mit leichtem Trend über die Saison."""
+    metrics = list(METRICS)
+    who = rng.integers(0, len(ids), n)
+    metric = rng.integers(0, len(metrics), n)
+    day = rng.integers(0, SEASON_DAYS, n)
+    mean, spread, trend = (np.array([METRICS[m][i] for m in metrics])[metric] for i in range(3))
+    values = (mean + trend * day / 365 + rng.normal(0, 1, n) * spread).round(2)
+    data = {}
+    for i in np.lexsort((day, metric, who)):
+        data.setdefault(str(ids[who[i]]), {}).setdefault(metrics[metric[i]], []).append(
+            [(SEASON_START + timedelta(days=int(day[i]))).isoformat(), float(values[i])]
+        )
+    return data
+
+
+def generate(data_dir: str, athletes: int, plans: int, units: int, measurements: int, seed: int = 42) -> dict:
+    """Erzeugt alle Dateien in ``data_dir``; gibt die verwendeten Parameter zurück."""
+    os.makedirs(data_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    roster = generate_athletes(rng, athletes)
+    plan_data, statuses = generate_plans(rng, plans, units)
+    performance = generate_performance(rng, roster.index.tolist(), measurements) if athletes else {}
+    join = os.path.join
+    storage.save_settings({"trainer_name": "Benchmark"}, join(data_dir, storage.SETTINGS_FILE))
+    storage.save_athletes(roster, join(data_dir, storage.ATHLETES_FILE))
+    storage.save_plans(plan_data, statuses, join(data_dir, storage.PLANS_FILE))
+    storage.save_performance(performance, join(data_dir, storage.PERFORMANCE_FILE))
+    return {"athletes": athletes, "plans": plans, "units": units, "measurements": measurements, "seed": seed}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Synthetische AthletikPlus-Daten erzeugen")
+    parser.add_argument("data_dir")
+    parser.add_argument("--size", choices=list(SIZES), default="small")
+    parser.add_argument("--athletes", type=int)
+    parser.add_argument("--plans", type=int)
+    parser.add_argument("--units", type=int)
+    parser.add_argument("--measurements", type=int)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    params = {key: value if getattr(args, key) is None else getattr(args, key) for key, value in SIZES[args.size].items()}
+    print(generate(args.data_dir, seed=args.seed, **params))
+
+
+if __name__ == "__main__":
+    main()
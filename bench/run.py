@@ -0,0 +1,283 @@
+"""Messlauf: Kaltstart, Rerun-Latenz je Seite und Kosten der Änderungspfade.
+
+Die App läuft headless über Streamlits ``AppTest``; Daten kommen aus
+``bench.generate`` (oder einem vorhandenen Verzeichnis). Ergebnisse werden
+als JSON geschrieben und können mit ``--baseline`` verglichen werden::
+
+    python -m bench.run --size medium --out bench-results.json
+    python -m bench.run --size medium --baseline bench-results.json
+    ATHLETIKPLUS_BACKEND=sqlite python -m bench.run --size small
+
+Alle Zeiten in Millisekunden.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+from athletikplus import storage  # noqa: E402
+from bench import generate  # noqa: E402
+
+APP = os.path.join(REPO, "app.py")
+PAGES = {
+    "Dashboard": "📊 Dashboard",
+    "Athletenverwaltung": "🧍 Athlet:innen",
+    "Trainingspläne": "📁 Trainingspläne",
+    "Entwicklung": "📈 Entwicklung",
+    "Settings": "⚙️ Einstellungen",
+}
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def summary(samples: list) -> dict:
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "min": round(ordered[0], 3),
+        "median": round(statistics.median(ordered), 3),
+        "p95": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unbekannt"
+
+
+# -----------------------------
+# Messungen
+# -----------------------------
+def bench_cold_start(data_dir: str, repeat: int) -> dict:
+    """``open_backend`` (das, was ``load_data`` beim ersten Aufruf tut) auf frisch kopierten Daten.
+
+    ``binary``: mit binären Snapshots, wie nach dem ersten Speichern bzw. Start;
+    ``text``: nur die Textdateien (erster Start, schreibt die binären Snapshots).
+    """
+    primed = tempfile.mkdtemp(prefix="ap-bench-primed-")
+    shutil.copytree(data_dir, primed, dirs_exist_ok=True)
+    db = storage.open_backend(primed)
+    if isinstance(db, storage.FileBackend):
+        for store in storage.JOURNALED:
+            db.compact(store)  # schreibt Snapshot samt binärem Snapshot
+    results = {}
+    for name, source in (("binary", primed), ("text", data_dir)):
+        samples = []
+        for _ in range(repeat):
+            copy = tempfile.mkdtemp(prefix="ap-bench-cold-")
+            shutil.copytree(source, copy, dirs_exist_ok=True,
+                            ignore=shutil.ignore_patterns("*.bin") if name == "text" else None)
+            samples.append(timed(lambda: storage.open_backend(copy)))
+            shutil.rmtree(copy, ignore_errors=True)
+        results[name] = summary(samples)
+    shutil.rmtree(primed, ignore_errors=True)
+    return results
+
+
+def bench_pages(data_dir: str, repeat: int) -> dict:
+    """Erster Lauf (inkl. ``load_data``) und Reruns jeder Seite über ``AppTest``."""
+    import streamlit as st
+    from streamlit import logger
+    from streamlit.testing.v1 import AppTest
+
+    logger.set_log_level("error")  # Hinweise/Deprecation-Warnungen würden die Ausgabe fluten
+
+    cwd = os.getcwd()
+    os.chdir(data_dir)  # app.py lädt aus dem Arbeitsverzeichnis
+    try:
+        st.cache_resource.clear()
+        at = AppTest.from_file(APP, default_timeout=600)
+        results = {"first_run": round(timed(at.run), 3)}
+        for page, label in PAGES.items():
+            at.radio(key="ap_nav_radio").set_value(label)
+            switch = timed(at.run)
+            if at.exception:
+                raise RuntimeError(f"{page}: {at.exception[0].value}")
+            reruns = [timed(at.run) for _ in range(repeat)]
+            results[page] = {"switch": round(switch, 3), "rerun": summary(reruns)}
+        return results
+    finally:
+        os.chdir(cwd)
+
+
+def mutation_paths(db, rng_seed: int):
+    """Die Änderungen, die die Seiten auslösen - jeweils inklusive ``flush()`` wie ``save_data``."""
+    plan = db.plan_names()[0] if db.plan_count() else "Benchmark-Plan"
+    athlete = int(db.athletes().index[0]) if db.athlete_count() else 1
+    state = {"n": 0}
+
+    def next_n() -> int:
+        state["n"] += 1
+        return rng_seed * 1_000_000 + state["n"]
+
+    unit = {
+        "datum": "2026-02-01",
+        "schwerpunkt": "Kraft",
+        "uebungen": [{"name": "Kniebeugen", "saetze": 3, "wiederholungen": "10", "intensitaet": "80%"}],
+    }
+
+    def add_athlete():
+        db.add_athlete({"Löschen": False, "Name": f"Neu {next_n()}", "Alter": 20, "Größe (cm)": 180,
+                        "Gewicht (kg)": 80, "Mannschaft": "U23", "Sportart": "Fußball"})
+
+    def update_athlete():
+        db.update_athletes({int(db.athletes().index[0]): {"Alter": 20 + state["n"] % 10}})
+        next_n()
+
+    def delete_athlete():
+        db.delete_athletes([int(db.athletes().index[-1])])
+
+    def add_unit():
+        state["unit"] = db.add_unit(plan, unit)
+
+    def delete_unit():
+        db.delete_unit(plan, state.pop("unit", ""))
+
+    paths = {
+        "set_setting": lambda: db.set_setting("trainer_name", f"Coach {next_n()}"),
+        "add_athlete": add_athlete,
+        "update_athlete": update_athlete,
+        "delete_athlete": delete_athlete,
+        "create_plan": lambda: db.create_plan(f"Plan {next_n()}"),
+        "set_plan_status": lambda: db.set_plan_status(plan, bool(next_n() % 2)),
+        "add_unit": add_unit,
+        "delete_unit": delete_unit,
+        "record_measurement": lambda: db.record_measurement(athlete, "Sprint 30 m (s)", "2026-02-01", 4.5),
+    }
+    return paths
+
+
+def bench_mutations(data_dir: str, repeat: int, seed: int) -> dict:
+    copy = tempfile.mkdtemp(prefix="ap-bench-mut-")
+    shutil.copytree(data_dir, copy, dirs_exist_ok=True)
+    try:
+        db = storage.open_backend(copy)
+        results = {}
+        for name, fn in mutation_paths(db, seed).items():
+            samples = []
+            for _ in range(repeat):
+                samples.append(timed(lambda: (fn(), db.flush())))
+            results[name] = summary(samples)
+        close = getattr(db, "close", None)
+        if close:
+            close()
+        return results
+    finally:
+        shutil.rmtree(copy, ignore_errors=True)
+
+
+# -----------------------------
+# Vergleich
+# -----------------------------
+def flatten(results: dict, prefix: str = "") -> dict:
+    """``{"pages.Dashboard.rerun": median, ...}`` - eine Kennzahl je Messung."""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict) and "median" in value:
+            flat[name] = value["median"]
+        elif isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+
+def compare(current: dict, baseline: dict, threshold: float, min_delta: float = 1.0) -> list:
+    """Zeilen ``(messung, alt, neu, faktor, regression)``.
+
+    Regression: Faktor über ``threshold`` und mindestens ``min_delta`` ms langsamer
+    (Messungen im Sub-Millisekunden-Bereich rauschen zu stark).
+    """
+    old, new = flatten(baseline["results"]), flatten(current["results"])
+    rows = []
+    for name in sorted(set(old) & set(new)):
+        factor = new[name] / old[name] if old[name] else float("inf")
+        rows.append((name, old[name], new[name], factor, factor > threshold and new[name] - old[name] >= min_delta))
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="AthletikPlus-Benchmarks")
+    parser.add_argument("--size", choices=list(generate.SIZES), default="small")
+    parser.add_argument("--data", help="vorhandenes Datenverzeichnis statt generierter Daten")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-pages", action="store_true", help="ohne AppTest (nur Backend-Messungen)")
+    parser.add_argument("--out", default="bench-results.json")
+    parser.add_argument("--baseline", help="früheres Ergebnis zum Vergleich")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Faktor, ab dem eine Regression gemeldet wird")
+    args = parser.parse_args(argv)
+
+    workdir = None
+    if args.data:
+        data_dir, params = args.data, {"data": os.path.abspath(args.data)}
+    else:
+        workdir = data_dir = tempfile.mkdtemp(prefix="ap-bench-data-")
+        params = generate.generate(data_dir, seed=args.seed, **generate.SIZES[args.size])
+        params["size"] = args.size
+
+    try:
+        results = {"cold_start": bench_cold_start(data_dir, args.repeat)}
+        if not args.skip_pages:
+            results["pages"] = bench_pages(data_dir, args.repeat)
+        results["mutations"] = bench_mutations(data_dir, args.repeat, args.seed)
+    finally:
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    import pandas
+    import streamlit
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "backend": os.environ.get("ATHLETIKPLUS_BACKEND", "files"),
+            "python": platform.python_version(),
+            "streamlit": streamlit.__version__,
+            "pandas": pandas.__version__,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "data": params,
+        },
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Ergebnisse: {args.out}")
+
+    regressions = 0
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        for key in ("backend", "data", "repeat"):
+            if baseline["meta"].get(key) != report["meta"][key]:
+                print(f"Hinweis: {key} unterscheidet sich von der Baseline ({baseline['meta'].get(key)})")
+        for name, old, new, factor, regressed in compare(report, baseline, args.threshold):
+            regressions += regressed
+            print(f"{'!!' if regressed else '  '} {name:45s} {old:10.2f} -> {new:10.2f} ms  x{factor:.2f}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Planzuordnungen: Index in beiden Richtungen und Wochenpläne je Ziel, auf beiden Backends."""
+import pandas as pd
+import pytest
+
+from athletikplus import sqlite_store, storage
+from athletikplus.assignments import AssignmentIndex, normalize_assignment, schedule
+from athletikplus.roster_index import RosterIndex
+
+
+@pytest.fixture(params=["files", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "sqlite":
+        db = sqlite_store.SqliteBackend(str(tmp_path / storage.DB_FILE), data_dir=str(tmp_path))
+        yield db
+        db.close()
+    else:
+        yield storage.FileBackend(str(tmp_path))
+
+
+def roster() -> RosterIndex:
+    return RosterIndex(pd.DataFrame({
+        "Name": ["Anna", "Ben", "Cem", "Dora"],
+        "Alter": [16, 19, 17, 30],
+        "Mannschaft": ["Erste", "Zweite", "Erste", ""],
+        "Sportart": ["Volleyball", "Leichtathletik", "Leichtathletik", ""],
+    }, index=[1, 2, 3, 4]))
+
+
+def test_normalize_assignment():
+    assert normalize_assignment({"athletes": ["3", 1, 3], "teams": ["Erste", ""], "sports": []}) == {
+        "athletes": [1, 3], "teams": ["Erste"], "sports": []}
+
+
+def test_index_resolves_teams_and_sports():
+    people = roster()  # 1, 3: Erste; 2, 3: Leichtathletik; 4: ohne Gruppe
+    index = AssignmentIndex({"Kraft": {"teams": ["Erste"]}, "Sprint": {"sports": ["Leichtathletik"], "athletes": [4]}})
+    assert index.plans_for_athlete(3, people) == {"Kraft", "Sprint"}
+    assert index.plans_for_athlete(4, people) == {"Sprint"}
+    assert index.athletes_for_plan("Sprint", people) == {2, 3, 4}
+    assert index.athletes_without_plan(people, plans=["Kraft"]) == [2, 4]
+
+    index.set("Kraft", {"athletes": [2]})
+    index.set("Sprint", {})  # leer: Zuordnung entfällt
+    assert index.plans_for("teams", "Erste") == set() and len(index) == 1
+    assert index.athletes_without_plan(people) == [1, 3, 4]
+    assert index.to_dict() == {"Kraft": {"athletes": [2], "teams": [], "sports": []}}
+    assert index.assignment("Sprint") == normalize_assignment({})
+
+
+def test_schedule_per_target(backend):
+    anna, ben = backend.add_athletes([{"Name": "Anna", "Mannschaft": "Erste", "Sportart": "Volleyball"},
+                                      {"Name": "Ben", "Mannschaft": "Zweite", "Sportart": "Volleyball"}])
+    for name, datum in (("Kraft", "2026-03-02"), ("Ball", "2026-03-03"), ("Pause", "2026-03-04")):
+        backend.create_plan(name)
+        backend.add_unit(name, {"datum": datum, "schwerpunkt": name})
+    backend.add_series("Ball", {"start": "2026-03-01", "ende": "2026-03-31", "wochentage": [4],
+                                "schwerpunkt": "Spiel", "uebungen": []})
+    backend.assign_plan("Kraft", teams=["Erste"])
+    backend.assign_plan("Ball", sports=["Volleyball"])
+    backend.assign_plan("Pause", athletes=[ben])
+    backend.set_plan_status("Pause", False)
+
+    def week(*args, **kwargs) -> list:
+        return [u.schwerpunkt for _, u in schedule(backend, "2026-03-02", "2026-03-08", *args, **kwargs)]
+
+    assert week("athletes", anna) == ["Kraft", "Ball", "Spiel"]
+    assert week("athletes", ben) == ["Ball", "Spiel"]  # inaktiver Plan fehlt
+    assert week("athletes", ben, active_only=False) == ["Ball", "Pause", "Spiel"]
+    assert week("teams", "Zweite") == []
+    assert week() == ["Kraft", "Ball", "Spiel"]
+    assert backend.plan_assignment("Ball") == {"athletes": [], "teams": [], "sports": ["Volleyball"]}
+
+
+def test_assignments_survive_reload(tmp_path):
+    backend = storage.FileBackend(str(tmp_path))
+    backend.create_plan("Kraft")
+    backend.assign_plan("Kraft", athletes=[5], teams=["Erste"])
+    backend.flush()
+    reloaded = storage.FileBackend(str(tmp_path))
+    assert reloaded.plan_assignment("Kraft") == {"athletes": [5], "teams": ["Erste"], "sports": []}
+    assert reloaded.assignment_index().plans_for("teams", "Erste") == {"Kraft"}
@@ -0,0 +1,40 @@
+"""Athlet:innen: Zeilen-Updates, Wertebereiche und beide Backends."""
+import pytest
+
+from athletikplus import athletes, sqlite_store, storage
+
+
+@pytest.fixture(params=["files", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "sqlite":
+        db = sqlite_store.SqliteBackend(str(tmp_path / storage.DB_FILE), data_dir=str(tmp_path))
+        yield db
+        db.close()
+    else:
+        yield storage.FileBackend(str(tmp_path))
+
+
+def test_invalid_values():
+    assert athletes.invalid_values({"Alter": 16, "Größe (cm)": None, "Name": "x"}) == {}
+    errors = athletes.invalid_values({"Alter": 40000, "Gewicht (kg)": "viel"})
+    assert set(errors) == {"Alter", "Gewicht (kg)"}
+
+
+def test_out_of_range_update_is_reported_not_raised(backend):
+    athlete_id = backend.add_athlete({"Name": "Anna", "Alter": 16})
+    seq = getattr(backend, "seq", {}).get(storage.ATHLETES)
+
+    messages = backend.update_athletes({athlete_id: {"Alter": 40000, "Größe (cm)": 170}},
+                                       backend.athlete_versions([athlete_id]))
+
+    assert len(messages) == 1 and "Anna" in messages[0] and "Alter" in messages[0]
+    row = backend.athletes().loc[athlete_id]
+    assert row["Alter"] == 16 and row["Größe (cm)"] == 170  # gültige Zellen werden übernommen
+    if seq is not None:
+        assert backend.seq[storage.ATHLETES] == seq + 1
+
+
+def test_out_of_range_rows_are_not_added(backend):
+    with pytest.raises(ValueError, match="Alter"):
+        backend.add_athletes([{"Name": "Ben", "Alter": 20}, {"Name": "Cem", "Alter": 40000}])
+    assert len(backend.athletes()) == 0
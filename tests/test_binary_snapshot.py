@@ -0,0 +1,94 @@
+"""Binärer Snapshot: Laden aus ``.bin`` ergibt denselben Stand wie aus den Textdateien."""
+import os
+
+import pandas as pd
+import pytest
+
+from athletikplus import binary_snapshot, storage
+
+STORES = (storage.ATHLETES, storage.PLANS, storage.PERFORMANCE)
+
+
+def fill(data_dir: str) -> storage.FileBackend:
+    backend = storage.FileBackend(data_dir)
+    anna, ben, _ = backend.add_athletes([
+        {"Name": "Anna Berg", "Alter": 16, "Größe (cm)": 170, "Gewicht (kg)": 60, "Mannschaft": "Erste",
+         "Sportart": "Volleyball"},
+        {"Name": "Ben Öztürk", "Alter": None, "Mannschaft": "Zweite", "Sportart": "Leichtathletik"},
+        {"Name": "Cem", "Alter": 30},
+    ])
+    backend.update_athletes({ben: {"Gewicht (kg)": 72}})
+    for name in ("Kraft", "Sprint"):
+        backend.create_plan(name)
+    backend.set_plan_status("Sprint", False)
+    backend.add_unit("Kraft", {"datum": "2026-03-04", "schwerpunkt": "Beine", "uebungen": [
+        {"name": "Kniebeuge", "saetze": 3, "wiederholungen": "5", "intensitaet": "80%"},
+        {"name": "Ausfallschritt", "saetze": "3-4", "wiederholungen": "8-10", "intensitaet": "20 kg"},
+    ]})
+    backend.add_unit("Kraft", {"datum": "2026-03-02", "schwerpunkt": "Oberkörper", "uebungen": ["Liegestütz"]})
+    backend.add_unit("Sprint", {"datum": "2026-03-03", "schwerpunkt": "Start", "uebungen": []})
+    backend.add_series("Sprint", {"start": "2026-03-01", "ende": "2026-03-31", "wochentage": [1, 3],
+                                  "schwerpunkt": "Tempo", "uebungen": [{"name": "30 m", "wiederholungen": "6"}]})
+    backend.assign_plan("Kraft", athletes=[anna], teams=["Zweite"])
+    backend.record_measurement(anna, "Sprint 30m", "2026-03-02", 4.31)
+    backend.record_measurement(anna, "Sprint 30m", "2026-03-09", 4.25)
+    backend.record_measurement(ben, "CMJ", "2026-03-02", 41.0)
+    return backend
+
+
+def state(backend: storage.FileBackend) -> dict:
+    return {
+        "athletes": backend.athletes(),
+        "versions": backend.athlete_versions(backend.athletes().index),
+        "search": backend.athlete_index().search(name="be"),
+        "teams": backend.athlete_index().teams(),
+        "plans": backend.plans,
+        "statuses": backend.statuses,
+        "series": backend.series_rules,
+        "assignments": {name: backend.plan_assignment(name) for name in backend.plan_names()},
+        "between": backend.units_between("2026-03-01", "2026-03-31"),
+        "performance": backend.performance(),
+    }
+
+
+def assert_same(a: dict, b: dict) -> None:
+    pd.testing.assert_frame_equal(a.pop("athletes"), b.pop("athletes"))
+    assert a == b
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    backend = fill(str(tmp_path))
+    for store in STORES:
+        backend.compact(store)  # Snapshot samt .bin
+    backend.record_measurement(1, "CMJ", "2026-03-09", 43.5)  # liegt nur im Journal
+    backend.flush()
+    return str(tmp_path)
+
+
+def test_binary_load_equals_text_load(data_dir, monkeypatch):
+    for store in STORES:
+        assert os.path.exists(binary_snapshot.binary_path(os.path.join(data_dir, storage.STORE_FILES[store])))
+    used = []
+    read = binary_snapshot.read
+    monkeypatch.setattr(binary_snapshot, "read", lambda *args: used.append(read(*args)) or used[-1])
+    from_binary = state(storage.FileBackend(data_dir))
+    assert all(packed is not None for packed in used) and len(used) == len(STORES)
+
+    for store in STORES:
+        binary_snapshot.remove(os.path.join(data_dir, storage.STORE_FILES[store]))
+    used.clear()
+    from_text = state(storage.FileBackend(data_dir))
+    assert used == [None] * len(STORES)
+
+    assert from_binary["performance"]["1"]["CMJ"] == [["2026-03-09", 43.5]]
+    assert_same(from_binary, from_text)
+
+
+def test_corrupt_binary_falls_back_to_text(data_dir):
+    expected = state(storage.FileBackend(data_dir))
+    path = os.path.join(data_dir, storage.STORE_FILES[storage.PLANS])
+    with open(binary_snapshot.binary_path(path), "r+b") as f:
+        f.seek(200)
+        f.write(b"\xff" * 64)  # beschädigt: wird verworfen, Textdatei gilt
+    assert_same(state(storage.FileBackend(data_dir)), expected)
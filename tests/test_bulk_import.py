@@ -0,0 +1,93 @@
+"""Massenimport: Fehlerzeilen mit Nummer und Grund, Gruppierung der Einheiten, Übernahme ins Backend."""
+import json
+
+import pytest
+
+from athletikplus import bulk_import, storage
+from athletikplus.bulk_import import ATHLETES, MEASUREMENTS, UNITS
+
+
+def errors(result) -> list:
+    return list(result.errors.itertuples(index=False, name=None))
+
+
+def test_athlete_error_rows_are_numbered_across_chunks():
+    csv = ("Name;Alter;Größe (cm);Gewicht (kg);Mannschaft\n"
+           "Anna;16;170,5;60;Erste\n"
+           ";17;;;\n"
+           "Ben;abc;180;;\n"
+           "Cem;40000;;;Zweite\n"
+           "Dora;;;300;\n"
+           "Emil;;;;\n").encode("utf-8")
+    result = bulk_import.validate_file(csv, "athleten.csv", ATHLETES, chunk_size=2)
+    assert result.rows == 6 and result.valid == 2 and result.error_rows() == 4
+    assert errors(result) == [
+        (2, "Name fehlt"),
+        (3, "Alter ist keine Zahl"),
+        (4, "Alter außerhalb 1–100"),
+        (5, "Gewicht (kg) außerhalb 10–250"),
+    ]
+    anna, emil = result.athletes
+    assert anna["Name"] == "Anna" and anna["Größe (cm)"] == 170.5 and anna["Löschen"] is False
+    assert emil["Alter"] is None and emil["Mannschaft"] is None
+
+
+def test_unit_rows_are_grouped_and_checked():
+    csv = ("Plan,Datum,Schwerpunkt,Übung,Sätze,Wiederholungen,Intensität\n"
+           "Kraft,02.03.2026,Beine,Kniebeuge,3,5,80%\n"
+           "Kraft,2026-03-02,Beine,Ausfallschritt,,8-10,\n"
+           "Kraft,31.02.2026,Beine,Kniebeuge,3,5,\n"
+           "Kraft,03.03.2026,Arme,Bizeps,2.5,10,\n"
+           "Kraft,03.03.2026,Arme,Trizeps,25,10,\n"
+           "Sprint,03.03.2026,,30 m,,6,\n").encode("utf-8")
+    result = bulk_import.validate_file(csv, "einheiten.csv", UNITS)
+    assert errors(result) == [
+        (3, "Datum ungültig (TT.MM.JJJJ oder JJJJ-MM-TT)"),
+        (4, "Sätze ist keine ganze Zahl"),
+        (5, "Sätze außerhalb 1–20"),
+        (6, "Schwerpunkt fehlt"),
+    ]
+    (unit,) = result.units["Kraft"].values()
+    assert unit["datum"] == "2026-03-02" and [ex["name"] for ex in unit["uebungen"]] == ["Kniebeuge", "Ausfallschritt"]
+    assert unit["uebungen"][1]["saetze"] is None and result.valid == 1
+
+
+def test_measurements_need_known_athletes():
+    rows = [
+        {"Athlet:in": "Anna", "Metrik": "Sprint", "Datum": "02.03.2026", "Wert": "4,31"},
+        {"Athlet:in": "Zoe", "Metrik": "Sprint", "Datum": "02.03.2026", "Wert": "4,5"},
+        {"Athlet:in": "Anna", "Metrik": "Sprint", "Datum": "03.03.2026", "Wert": "schnell"},
+    ]
+    data = "\n".join(json.dumps(row) for row in rows).encode("utf-8")
+    result = bulk_import.validate_file(data, "messwerte.jsonl", MEASUREMENTS, name_ids={"Anna": 7})
+    assert result.measurements == [(7, "Sprint", "2026-03-02", 4.31)]
+    assert errors(result) == [(2, "Athlet:in unbekannt"), (3, "Wert ist keine Zahl")]
+
+
+def test_missing_column_and_unknown_format():
+    result = bulk_import.validate_file(b"Plan,Datum\nKraft,02.03.2026\n", "x.csv", UNITS)
+    assert result.valid == 0 and errors(result) == [(1, "Spalte fehlt: Schwerpunkt, Übung")]
+    with pytest.raises(ValueError, match="Dateiformat"):
+        bulk_import.validate_file(b"", "x.pdf", UNITS)
+    with pytest.raises(ValueError, match="Importart"):
+        bulk_import.validate_file(b"", "x.csv", "plaene")
+
+
+def test_whole_file_formats_are_capped(monkeypatch):
+    monkeypatch.setattr(bulk_import, "MAX_WHOLE_FILE_BYTES", 10)
+    with pytest.raises(ValueError, match="JSON Lines"):
+        bulk_import.validate_file(json.dumps([{"Name": "Anna Berg"}]).encode("utf-8"), "x.json", ATHLETES)
+
+
+def test_apply_stores_valid_rows(tmp_path):
+    backend = storage.FileBackend(str(tmp_path))
+    result = bulk_import.validate_file("Name,Alter\nAnna,16\nBen,0\n".encode("utf-8"), "a.csv", ATHLETES)
+    bulk_import.apply(backend, result)
+    units = bulk_import.validate_file(
+        "Plan,Datum,Schwerpunkt,Übung\nKraft,02.03.2026,Beine,Kniebeuge\n".encode("utf-8"), "e.csv", UNITS)
+    bulk_import.apply(backend, units)
+    backend.flush()
+
+    reloaded = storage.FileBackend(str(tmp_path))
+    assert reloaded.athletes()["Name"].tolist() == ["Anna"]
+    assert [u.schwerpunkt for u in reloaded.units("Kraft")] == ["Beine"]
@@ -0,0 +1,114 @@
+"""Kommandozeile: Export, Status, Zuordnung, Sicherung und Fehlerfälle."""
+import io
+import json
+import zipfile
+
+import pytest
+
+from athletikplus import cli, storage
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.delenv("ATHLETIKPLUS_BACKEND", raising=False)
+    backend = storage.FileBackend(str(tmp_path))
+    backend.add_athletes([{"Name": "Anna", "Mannschaft": "U17"}, {"Name": "Ben", "Mannschaft": "U19"}])
+    for name in ("Saison 2024 Kraft", "Saison 2024 Sprint", "Saison 2025"):
+        backend.create_plan(name)
+    backend.add_unit("Saison 2025", {"datum": "2026-03-02", "schwerpunkt": "Beine", "uebungen": [
+        {"name": "Kniebeuge", "saetze": 3, "wiederholungen": "5", "intensitaet": "80%"},
+        {"name": "Sprung", "wiederholungen": "8"},
+    ]})
+    backend.add_series("Saison 2024 Sprint", {"start": "2026-03-01", "ende": "2026-03-31", "wochentage": [2],
+                                              "schwerpunkt": "Tempo", "uebungen": [{"name": "30 m", "saetze": 6}]})
+    backend.flush()
+    return str(tmp_path)
+
+
+def run(data_dir: str, *argv) -> tuple:
+    out = io.StringIO()
+    code = cli.main(["--data", data_dir, *argv], out=out)
+    return code, out.getvalue()
+
+
+def test_info(data_dir):
+    code, text = run(data_dir, "info")
+    assert code == 0
+    assert "Pläne:    3 (3 aktiv)" in text and "Einheiten: 1" in text and "Serien:   1" in text
+
+
+def test_units_csv_and_json(data_dir):
+    code, text = run(data_dir, "units", "--von", "02.03.2026", "--bis", "2026-03-04")
+    assert code == 0
+    assert text.splitlines() == [
+        "Plan;Datum;Schwerpunkt;Übung;Sätze;Wiederholungen;Intensität",
+        "Saison 2025;2026-03-02;Beine;Kniebeuge;3;5;80%",
+        "Saison 2025;2026-03-02;Beine;Sprung;;8;",
+        "Saison 2024 Sprint;2026-03-04;Tempo;30 m;6;;",
+    ]
+    code, text = run(data_dir, "units", "--von", "2026-03-01", "--bis", "2026-03-31", "--format", "json",
+                     "--plan", "Saison 2024 Sprint")
+    units = json.loads(text)
+    assert [u["datum"] for u in units] == ["2026-03-04", "2026-03-11", "2026-03-18", "2026-03-25"]
+    assert all(u["plan"] == "Saison 2024 Sprint" and u["serie"] for u in units)
+
+
+def test_invalid_date_is_rejected(data_dir, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        run(data_dir, "units", "--von", "31.02.2026")
+    assert exit_info.value.code == 2 and "Ungültiges Datum" in capsys.readouterr().err
+
+
+def test_status_by_pattern_is_saved(data_dir, capsys):
+    code, text = run(data_dir, "status", "--inaktiv", "--muster", "Saison 2024*")
+    assert code == 0 and text == "2 von 2 Plänen auf inaktiv gesetzt.\n"
+    reloaded = storage.FileBackend(data_dir)
+    assert [reloaded.plan_status(name) for name in reloaded.plan_names()] == [False, False, True]
+
+    assert run(data_dir, "status", "--aktiv")[0] == 2  # ohne Auswahl wird nichts geändert
+    assert run(data_dir, "status", "Gibt es nicht")[0] == 1
+    assert "Unbekannte Pläne" in capsys.readouterr().err
+
+
+def test_assign_and_athletes_without_plan(data_dir):
+    code, text = run(data_dir, "assign", "Saison 2025", "--mannschaft", "U17")
+    assert code == 0 and "Mannschaften:\tU17" in text
+    code, text = run(data_dir, "athletes", "--ohne-plan")
+    assert code == 0 and [line.split(";")[1] for line in text.splitlines()[1:]] == ["Ben"]
+    code, text = run(data_dir, "units", "--von", "2026-03-01", "--bis", "2026-03-08", "--mannschaft", "U17")
+    assert {line.split(";")[0] for line in text.splitlines()[1:]} == {"Saison 2025"}
+
+    code, text = run(data_dir, "assign", "Saison 2025", "--keine")
+    assert "Mannschaften:\t-" in text
+    assert storage.FileBackend(data_dir).plan_assignment("Saison 2025")["teams"] == []
+
+
+def restored(data_dir: str, target) -> str:
+    assert run(data_dir, "backup", str(target / "daten.zip"))[0] == 0
+    with zipfile.ZipFile(target / "daten.zip") as zf:
+        zf.extractall(target / "daten")
+    return str(target / "daten")
+
+
+def test_backup_restores_same_state(data_dir, tmp_path_factory):
+    month = ("units", "--von", "2026-03-01", "--bis", "2026-03-31")
+    before = run(data_dir, *month)[1]
+    assert run(restored(data_dir, tmp_path_factory.mktemp("journal")), *month)[1] == before
+    assert run(data_dir, "compact")[0] == 0
+    assert run(data_dir, *month)[1] == before
+    assert run(restored(data_dir, tmp_path_factory.mktemp("snapshot")), *month)[1] == before
+
+
+def test_corrupt_file_is_reported(data_dir, capsys):
+    with open(f"{data_dir}/{storage.PLANS_FILE}", "w", encoding="utf-8") as f:
+        f.write('{"plans": ')
+    assert run(data_dir, "info")[0] == 1
+    assert storage.PLANS_FILE in capsys.readouterr().err
+
+
+def test_tenants(tmp_path):
+    code, text = run(str(tmp_path), "tenants", "--neu", "TSV U17")
+    tenant_id = text.split("\t")[0]
+    assert code == 0 and tenant_id
+    assert run(str(tmp_path), "--mandant", tenant_id, "info")[0] == 0
+    assert run(str(tmp_path), "--mandant", "unbekannt", "info")[0] == 1
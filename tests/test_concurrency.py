@@ -0,0 +1,86 @@
+"""Mehrere Backends (Prozesse) auf einem Datenverzeichnis: Zusammenführen, Konflikte, Kompaktierung."""
+import threading
+
+from athletikplus import storage
+
+
+def unit(schwerpunkt: str, datum: str = "2026-03-02") -> dict:
+    return {"datum": datum, "schwerpunkt": schwerpunkt,
+            "uebungen": [{"name": "Kniebeugen", "saetze": 3, "wiederholungen": "8", "intensitaet": "70%"}]}
+
+
+def test_two_backends_merge_plans_units_and_athletes(tmp_path):
+    a = storage.FileBackend(str(tmp_path))
+    b = storage.FileBackend(str(tmp_path))  # hat den Stand vor den Änderungen von a gelesen
+
+    a.create_plan("Kraft")
+    a.add_unit("Kraft", unit("A1"))
+    anna = a.add_athlete({"Name": "Anna", "Mannschaft": "U17"})
+    a.assign_plan("Kraft", athletes=[anna])
+    a.record_measurement(anna, "Sprint", "2026-03-02", 4.2)
+    a.flush()
+
+    b.create_plan("Ausdauer")
+    b.create_plan("Kraft")  # gleichzeitig angelegt: bleibt ein Plan
+    b.add_unit("Kraft", unit("B1"))
+    ben = b.add_athlete({"Name": "Ben", "Mannschaft": "U17"})
+    b.assign_plan("Ausdauer", athletes=[ben])
+    b.record_measurement(ben, "Sprint", "2026-03-02", 4.5)
+    b.flush()
+
+    merged = storage.FileBackend(str(tmp_path))
+    assert merged.plan_names() == ["Kraft", "Ausdauer"]
+    assert sorted(u.schwerpunkt for u in merged.units("Kraft")) == ["A1", "B1"]
+    # Zurückgegebene IDs bleiben gültig, auch in Zuordnungen und Messwerten
+    assert anna != ben
+    assert merged.athletes().at[anna, "Name"] == "Anna"
+    assert merged.athletes().at[ben, "Name"] == "Ben"
+    assert merged.plan_assignment("Kraft")["athletes"] == [anna]
+    assert merged.plan_assignment("Ausdauer")["athletes"] == [ben]
+    assert merged.measurements().series(ben, "Sprint").values.tolist() == [4.5]
+    # b hat beim Zusammenführen den Stand von a übernommen
+    assert sorted(b.athletes()["Name"]) == ["Anna", "Ben"]
+
+
+def test_version_conflict_is_logged(tmp_path):
+    setup = storage.FileBackend(str(tmp_path))
+    athlete_id = setup.add_athlete({"Name": "Anna", "Alter": 16})
+    setup.flush()
+
+    a = storage.FileBackend(str(tmp_path))
+    b = storage.FileBackend(str(tmp_path))
+    shown = b.athlete_versions([athlete_id])  # b zeigt die Zeile an
+
+    assert a.update_athletes({athlete_id: {"Alter": 17}}) == []
+    a.flush()
+
+    assert b.update_athletes({athlete_id: {"Alter": 18}}, shown) == []  # b weiß noch nichts davon
+    b.flush()
+
+    assert b.conflicts.count == 1
+    (_, message), = b.conflicts.since(0)
+    assert "Anna" in message and "Alter" in message
+    assert storage.FileBackend(str(tmp_path)).athletes().at[athlete_id, "Alter"] == 17
+
+
+def test_compaction_alongside_appends(tmp_path):
+    a = storage.FileBackend(str(tmp_path))
+    a.create_plan("Kraft")
+    for i in range(200):
+        a.add_unit("Kraft", unit(f"A{i}"))
+    a.flush()
+
+    b = storage.FileBackend(str(tmp_path))
+    compacting = threading.Thread(target=a.compact, args=(storage.PLANS,))
+    compacting.start()
+    for i in range(100):
+        b.add_unit("Kraft", unit(f"B{i}", "2026-03-03"))
+        if i % 10 == 9:
+            b.flush()
+    compacting.join()
+    a.add_unit("Kraft", unit("A-nach"))
+    a.flush()
+
+    units = storage.FileBackend(str(tmp_path)).units("Kraft")
+    assert len(units) == 301
+    assert len({u.id for u in units}) == 301
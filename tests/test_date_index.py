@@ -0,0 +1,66 @@
+"""Datumsindex: Abfragen nach Tag, Woche und Zeitraum, Nachführen bei Änderungen."""
+from datetime import date
+
+from athletikplus.date_index import DateIndex, week_range
+from athletikplus.models import Unit
+
+
+def unit(uid: str, datum: str) -> Unit:
+    return Unit(uid, datum, uid, (), datum, "")
+
+
+def ids(entries: list) -> list:
+    return [(plan, u.id) for plan, u in entries]
+
+
+def index() -> DateIndex:
+    return DateIndex({
+        "Kraft": [unit("k1", "2026-03-02"), unit("k2", "2026-03-04"), unit("k3", "2026-03-10")],
+        "Ausdauer": [unit("a1", "2026-03-03"), unit("a2", "2026-03-04")],
+    })
+
+
+def test_between_is_sorted_and_inclusive():
+    assert ids(index().between("2026-03-02", "2026-03-04")) == [
+        ("Kraft", "k1"), ("Ausdauer", "a1"), ("Ausdauer", "a2"), ("Kraft", "k2")]
+    assert ids(index().on("2026-03-10")) == [("Kraft", "k3")]
+    assert index().between("2026-04-01", "2026-04-30") == []
+
+
+def test_between_restricted_to_plans():
+    assert ids(index().between("2026-03-01", "2026-03-31", plans=["Ausdauer"])) == [
+        ("Ausdauer", "a1"), ("Ausdauer", "a2")]
+    assert index().between("2026-03-01", "2026-03-31", plans=["Unbekannt"]) == []
+
+
+def test_week():
+    assert week_range(date(2026, 3, 4)) == ("2026-03-02", "2026-03-08")
+    assert [u.id for _, u in index().week(date(2026, 3, 8))] == ["k1", "a1", "a2", "k2"]
+
+
+def test_add_move_and_remove():
+    idx = index()
+    idx.add("Kraft", unit("k4", "2026-03-03"))
+    idx.add("Kraft", unit("k1", "2026-03-09"))  # gleiche ID: verschoben, nicht doppelt
+    assert len(idx) == 6
+    assert ids(idx.on("2026-03-02")) == []
+    assert ids(idx.between("2026-03-03", "2026-03-09", plans=["Kraft"])) == [
+        ("Kraft", "k4"), ("Kraft", "k2"), ("Kraft", "k1")]
+    idx.remove("a1")
+    idx.remove("a2")
+    idx.remove("gibt-es-nicht")
+    assert idx.between("2026-03-01", "2026-03-31", plans=["Ausdauer"]) == []
+    assert len(idx) == 4
+
+
+def test_presorted_keys_give_same_result():
+    plain = index()
+    plans = {
+        "Kraft": [unit("k1", "2026-03-02"), unit("k2", "2026-03-04"), unit("k3", "2026-03-10")],
+        "Ausdauer": [unit("a1", "2026-03-03"), unit("a2", "2026-03-04")],
+    }
+    keys = sorted((u.datum, u.id) for units in plans.values() for u in units)
+    plan_keys = {name: sorted((u.datum, u.id) for u in units) for name, units in plans.items()}
+    prebuilt = DateIndex(plans, keys=keys, plan_keys=plan_keys)
+    assert ids(prebuilt.between("2026-03-01", "2026-03-31")) == ids(plain.between("2026-03-01", "2026-03-31"))
+    assert ids(prebuilt.week(date(2026, 3, 10))) == [("Kraft", "k3")]
@@ -0,0 +1,64 @@
+"""Suchindex der Athlet:innen: Filter, Nachführen und Aufbau aus dem Snapshot."""
+import pandas as pd
+
+from athletikplus import storage
+from athletikplus.roster_index import RosterIndex
+
+
+def roster() -> pd.DataFrame:
+    return pd.DataFrame({
+        "Name": ["Anna Maria Müller", "Ben Meyer", "Mia Mülheim", None],
+        "Alter": [16, 19, None, 30],
+        "Mannschaft": ["Erste", "Zweite", "Erste", ""],
+        "Sportart": ["Volleyball", "Leichtathletik", "Leichtathletik", None],
+    }, index=[1, 2, 3, 4])
+
+
+def test_search_filters_are_combined():
+    index = RosterIndex(roster())
+    assert index.search() == [1, 2, 3, 4]
+    assert index.search(name="mül") == [1, 3]          # auch ab dem Nachnamen
+    assert index.search(name="  MARIA   mü ") == [1]   # Groß-/Kleinschreibung und Leerzeichen egal
+    assert index.search(teams=["Erste"], sports=["Leichtathletik"]) == [3]
+    assert index.search(sports=["Volleyball", "Leichtathletik"]) == [1, 2, 3]
+    assert index.search(age_min=17) == [2, 4]
+    assert index.search(age_max=19, name="b") == [2]
+    assert index.search(teams=["Dritte"]) == []
+    assert index.teams() == ["Erste", "Zweite"] and index.age_bounds() == (16, 30)
+    assert index.groups(3) == ("Erste", "Leichtathletik") and index.groups(4) == (None, None)
+    assert index.members(teams=["Zweite"], sports=["Volleyball"]) == {1, 2}
+
+
+def test_update_and_remove():
+    df = roster()
+    index = RosterIndex(df)
+    df.loc[2, ["Name", "Alter", "Mannschaft"]] = ["Bea Meyer", 15, "Erste"]
+    df.loc[5] = ["Mülle", 20, "Zweite", "Volleyball"]
+    index.update(df, [2, 5])
+    index.remove([1])
+    assert 1 not in index and len(index) == 4
+    assert index.search(name="ben") == []
+    assert index.search(name="mül") == [3, 5]
+    assert index.search(teams=["Erste"]) == [2, 3]
+    assert index.search(age_max=16) == [2]
+    assert index.sports() == ["Leichtathletik", "Volleyball"]
+
+
+def test_from_lists_equals_fresh_index():
+    df = roster()
+    rebuilt = RosterIndex.from_lists(df, *RosterIndex(df).to_lists())
+    fresh = RosterIndex(df)
+    for query in ({}, {"name": "mü"}, {"teams": ["Erste"]}, {"age_min": 18}):
+        assert rebuilt.search(**query) == fresh.search(**query)
+    rebuilt.update(df.drop(index=[1]), [1])
+    assert rebuilt.search(name="anna") == [] and rebuilt.search(teams=["Erste"]) == [3]
+
+
+def test_backend_keeps_index_in_sync(tmp_path):
+    backend = storage.FileBackend(str(tmp_path))
+    anna, ben = backend.add_athletes([{"Name": "Anna", "Mannschaft": "Erste"}, {"Name": "Ben", "Mannschaft": "Erste"}])
+    backend.update_athletes({ben: {"Name": "Benedikt", "Mannschaft": "Zweite"}})
+    backend.delete_athletes([anna])
+    index = backend.athlete_index()
+    assert index.search(name="bene") == [ben]
+    assert index.search(teams=["Erste"]) == [] and index.teams() == ["Zweite"]
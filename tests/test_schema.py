@@ -0,0 +1,91 @@
+"""Dateischema: Migration älterer Versionen und Zahlenfelder der Dosierung."""
+import json
+
+import pytest
+
+from athletikplus import schema, storage
+
+
+def test_migrate_plans_from_version_0():
+    data, migrated = schema.migrate_plans({
+        "Kraft": [
+            {"datum": "2026-03-04", "schwerpunkt": "Beine", "uebungen": ["Kniebeuge"]},
+            {"datum": "2026-03-02", "schwerpunkt": "Oberkörper",
+             "uebungen": [{"name": "Bankdrücken", "saetze": "3-4", "wiederholungen": "8", "intensitaet": "60kg"}]},
+            None,
+        ],
+        "Leer": None,
+    })
+    assert migrated and data["schema_version"] == schema.PLANS_VERSION
+    assert data["statuses"] == {"Kraft": True, "Leer": True}
+    assert data["plans"]["Leer"] == [] and data["assignments"] == {}
+    first, second = data["plans"]["Kraft"]
+    assert [first["datum"], second["datum"]] == ["2026-03-02", "2026-03-04"]
+    assert first["id"] and second["id"] and first["id"] != second["id"]
+    assert first["uebungen"][0] == {
+        "name": "Bankdrücken", "saetze": None, "wiederholungen": "3-4 Sätze · 8", "intensitaet": "60kg",
+        "wdh_min": 8, "wdh_max": 8, "last_kg": 60.0, "prozent_1rm": None,
+    }
+    assert second["uebungen"][0]["name"] == "Kniebeuge" and second["uebungen"][0]["saetze"] is None
+
+
+def test_migrate_plans_from_version_1_keeps_status_series_and_ids():
+    data, migrated = schema.migrate_plans({
+        "plans": {"Kraft": [{"id": "u1", "datum": "2026-03-02", "schwerpunkt": "Beine",
+                             "uebungen": [{"name": "Kniebeuge", "saetze": "5", "wiederholungen": "5x5",
+                                           "intensitaet": "80 %"}]}]},
+        "statuses": {"Kraft": False},
+        "series": {"Kraft": [{"id": "s1", "start": "2026-03-01", "ende": "2026-03-31", "wochentage": [0],
+                              "schwerpunkt": "Sprint", "uebungen": [], "ausnahmen": ["2026-03-16", "2026-03-09"]}]},
+        "journal_seq": 7,
+    })
+    assert migrated and data["journal_seq"] == 7 and data["statuses"] == {"Kraft": False}
+    exercise = data["plans"]["Kraft"][0]["uebungen"][0]
+    assert data["plans"]["Kraft"][0]["id"] == "u1"
+    assert (exercise["saetze"], exercise["wdh_min"], exercise["wdh_max"], exercise["prozent_1rm"]) == (5, 5, 5, 80.0)
+    assert data["series"]["Kraft"][0]["ausnahmen"] == ["2026-03-09", "2026-03-16"]
+
+
+def test_migrate_plans_from_version_3_only_adds_assignments():
+    unit = {"id": "u1", "datum": "2026-03-02", "schwerpunkt": "Beine", "uebungen": []}
+    data, migrated = schema.migrate_plans({"schema_version": 3, "plans": {"Kraft": [unit]},
+                                           "statuses": {"Kraft": True}, "journal_seq": 2})
+    assert migrated and data["schema_version"] == schema.PLANS_VERSION
+    assert data["assignments"] == {} and data["plans"]["Kraft"][0] is unit
+
+
+def test_current_version_is_not_migrated():
+    current = schema.migrate_plans({"plans": {}})[0]
+    assert schema.migrate_plans(current) == (current, False)
+
+
+@pytest.mark.parametrize("wiederholungen, intensitaet, expected", [
+    ("8-12", "70-75 %", (8, 12, None, 72.5)),
+    ("12 bis 8", "", (8, 12, None, None)),
+    ("3x10", "40 kg", (10, 10, 40.0, None)),
+    ("3x30s", "Körpergewicht", (None, None, None, None)),
+    ("", "60-70kg", (None, None, 65.0, None)),
+    ("6", "22,5kg", (6, 6, 22.5, None)),
+])
+def test_parse_dosage(wiederholungen, intensitaet, expected):
+    assert schema.parse_dosage(wiederholungen, intensitaet) == expected
+
+
+def test_migrate_performance_maps_names_to_ids():
+    data = {"Anna": {"Sprint": [["2026-03-02", 7.1]]}, "Unbekannt": {"Sprint": []}, "notiz": "alt"}
+    assert schema.migrate_performance(data, {"Anna": 3, "notiz": 9}) == {
+        "3": {"Sprint": [["2026-03-02", 7.1]]}, "Unbekannt": {"Sprint": []}, "notiz": "alt"}
+
+
+def test_backend_migrates_performance_from_version_0(tmp_path):
+    (tmp_path / storage.ATHLETES_FILE).write_text(
+        "id,Löschen,Name,Alter,Größe (cm),Gewicht (kg),Mannschaft,Sportart\n"
+        "1,False,Anna,16,170,60,Erste,Volleyball\n", encoding="utf-8")
+    (tmp_path / storage.PERFORMANCE_FILE).write_text(
+        json.dumps({"Anna": {"Sprint": [["2026-03-02", 7.1]]}}), encoding="utf-8")
+
+    backend = storage.FileBackend(str(tmp_path))
+    assert backend.performance() == {"1": {"Sprint": [["2026-03-02", 7.1]]}}
+    backend.flush()
+    on_disk = json.loads((tmp_path / storage.PERFORMANCE_FILE).read_text(encoding="utf-8"))
+    assert on_disk["schema_version"] == schema.PERFORMANCE_VERSION and "1" in on_disk["data"]
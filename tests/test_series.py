@@ -0,0 +1,70 @@
+"""Serien: Termine aus der Regel, Ausnahmen und Abfragen über beide Backends."""
+import pytest
+
+from athletikplus import series, sqlite_store, storage
+
+RULE = {
+    "id": "s1", "start": "2026-03-01", "ende": "2026-03-15", "wochentage": [0, 2],
+    "schwerpunkt": "Kraft", "uebungen": [{"name": "Kniebeuge", "saetze": 3, "wiederholungen": "5"}],
+    "ausnahmen": ["2026-03-04"],
+}
+
+
+@pytest.fixture(params=["files", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "sqlite":
+        db = sqlite_store.SqliteBackend(str(tmp_path / storage.DB_FILE), data_dir=str(tmp_path))
+        yield db
+        db.close()
+    else:
+        yield storage.FileBackend(str(tmp_path))
+
+
+def test_occurrences_follow_weekdays_and_skip_exceptions():
+    days = [day.isoformat() for day in series.occurrences(RULE, "2026-01-01", "2026-12-31")]
+    assert days == ["2026-03-02", "2026-03-09", "2026-03-11"]
+    assert [d.isoformat() for d in series.occurrences(RULE, "2026-03-10", "2026-03-10")] == []
+    assert series.occurrences(RULE, "2026-04-01", "2026-04-30") == []
+
+
+def test_materialize_ids_and_shared_exercises():
+    units = series.materialize(RULE, "2026-03-01", "2026-03-31")
+    assert [u.id for u in units] == ["s1@2026-03-02", "s1@2026-03-09", "s1@2026-03-11"]
+    assert [u.datum_anzeige for u in units] == ["02.03.2026", "09.03.2026", "11.03.2026"]
+    assert all(u.serie == "s1" and u.schwerpunkt == "Kraft" for u in units)
+    assert units[0].uebungen is units[1].uebungen
+    assert units[0].uebungen[0].name == "Kniebeuge"
+    assert series.split_id(units[0].id) == ("s1", "2026-03-02")
+    assert series.split_id("einzeltermin") is None
+
+
+def test_describe():
+    assert series.describe(RULE) == "Mo, Mi · 01.03.2026–15.03.2026"
+
+
+def test_units_between_merges_single_units_and_series(backend):
+    backend.create_plan("Team")
+    backend.add_unit("Team", {"id": "u1", "datum": "2026-03-09", "schwerpunkt": "Sprint"})
+    backend.add_unit("Team", {"id": "u2", "datum": "2026-03-10", "schwerpunkt": "Technik"})
+    series_id = backend.add_series("Team", RULE)
+
+    found = backend.units_between("2026-03-08", "2026-03-12")
+    assert [(plan, u.id) for plan, u in found] == [
+        ("Team", "u1"), ("Team", f"{series_id}@2026-03-09"), ("Team", "u2"), ("Team", f"{series_id}@2026-03-11")]
+    assert backend.units_between("2026-03-08", "2026-03-12", plans=["Andere"]) == []
+
+    backend.skip_occurrence("Team", series_id, "2026-03-09")
+    found = backend.units_between("2026-03-08", "2026-03-12")
+    assert [u.id for _, u in found] == ["u1", "u2", f"{series_id}@2026-03-11"]
+    assert backend.series("Team")[0]["ausnahmen"] == ["2026-03-04", "2026-03-09"]
+
+
+def test_series_survive_reload(tmp_path):
+    backend = storage.FileBackend(str(tmp_path))
+    backend.create_plan("Team")
+    series_id = backend.add_series("Team", RULE)
+    backend.skip_occurrence("Team", series_id, "2026-03-11")
+    backend.flush()
+
+    reloaded = storage.FileBackend(str(tmp_path))
+    assert [u.id for _, u in reloaded.units_between("2026-03-01", "2026-03-31")] == [f"{series_id}@2026-03-02", f"{series_id}@2026-03-09"]
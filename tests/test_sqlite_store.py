@@ -0,0 +1,87 @@
+"""SQLite-Backend: Übernahme der Dateien beim ersten Öffnen, gleiches Verhalten wie das Datei-Backend."""
+import os
+
+import pytest
+
+from athletikplus import sqlite_store, storage
+
+
+def unit(schwerpunkt: str, datum: str = "2026-03-02") -> dict:
+    return {"datum": datum, "schwerpunkt": schwerpunkt,
+            "uebungen": [{"name": "Kniebeugen", "saetze": 3, "wiederholungen": "8", "intensitaet": "70%"}]}
+
+
+def file_data(tmp_path):
+    """Datenverzeichnis mit Snapshots und noch nicht kompaktierten Journal-Einträgen."""
+    files = storage.FileBackend(str(tmp_path))
+    files.set_setting("trainer_name", "Coach")
+    anna = files.add_athlete({"Name": "Anna", "Alter": 16, "Mannschaft": "U17"})
+    files.create_plan("Kraft")
+    files.add_unit("Kraft", unit("A1"))
+    files.assign_plan("Kraft", athletes=[anna])
+    files.flush()
+    for store in storage.JOURNALED:
+        files.compact(store)
+    files.add_unit("Kraft", unit("A2", "2026-03-04"))  # nur im Journal
+    files.set_plan_status("Kraft", False)
+    files.record_measurement(anna, "Sprint", "2026-03-02", 4.2)
+    files.flush()
+    return anna
+
+
+def open_sqlite(tmp_path):
+    return sqlite_store.SqliteBackend(str(tmp_path / storage.DB_FILE), data_dir=str(tmp_path))
+
+
+def test_import_reads_snapshots_and_journals_without_writing(tmp_path):
+    anna = file_data(tmp_path)
+    for path in tmp_path.glob("*.bin"):
+        path.unlink()  # ein FileBackend würde sie beim Lesen neu schreiben ...
+    for path in tmp_path.iterdir():
+        os.utime(path, (path.stat().st_atime - 60, path.stat().st_mtime - 60))  # ... sobald die Dateien alt genug sind
+    before = {path.name: path.stat().st_mtime_ns for path in tmp_path.iterdir()}
+
+    db = open_sqlite(tmp_path)
+    assert db.get_settings()["trainer_name"] == "Coach"
+    assert db.athletes().at[anna, "Name"] == "Anna"
+    assert [u.schwerpunkt for u in db.units("Kraft")] == ["A1", "A2"]
+    assert db.plan_status("Kraft") is False
+    assert db.plan_assignment("Kraft")["athletes"] == [anna]
+    assert db.measurements().series(anna, "Sprint").values.tolist() == [4.2]
+    db.close()
+    after = {path.name: path.stat().st_mtime_ns for path in tmp_path.iterdir()}
+    assert {name: after[name] for name in before} == before
+    assert set(after) - set(before) <= {storage.DB_FILE, storage.DB_FILE + "-wal", storage.DB_FILE + "-shm"}
+
+
+def test_failed_import_leaves_no_database_and_is_retried(tmp_path):
+    file_data(tmp_path)
+    plans = tmp_path / storage.PLANS_FILE
+    good = plans.read_text(encoding="utf-8")
+    plans.write_text("kaputt", encoding="utf-8")
+
+    with pytest.raises(storage.CorruptFileError):
+        open_sqlite(tmp_path)
+    assert not (tmp_path / storage.DB_FILE).exists()
+
+    plans.write_text(good, encoding="utf-8")
+    db = open_sqlite(tmp_path)
+    assert [u.schwerpunkt for u in db.units("Kraft")] == ["A1", "A2"]
+    db.close()
+
+
+def test_import_runs_once(tmp_path):
+    file_data(tmp_path)
+    open_sqlite(tmp_path).close()
+    db = open_sqlite(tmp_path)
+    assert len(db.units("Kraft")) == 2 and len(db.athletes()) == 1
+    db.close()
+
+
+def test_duplicate_plan_keeps_units(tmp_path):
+    db = open_sqlite(tmp_path)
+    db.create_plan("Kraft")
+    db.add_unit("Kraft", unit("A1"))
+    db.create_plan("Kraft")
+    assert db.plan_names() == ["Kraft"] and len(db.units("Kraft")) == 1
+    db.close()
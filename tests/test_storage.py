@@ -0,0 +1,58 @@
+"""Datei-Backend: Laden, Speichern je Speicher, beschädigte Dateien."""
+import os
+import stat
+
+import pytest
+
+from athletikplus import storage
+from athletikplus.fileio import atomic_write_json
+
+
+def unit(schwerpunkt: str) -> dict:
+    return {"datum": "2026-03-02", "schwerpunkt": schwerpunkt,
+            "uebungen": [{"name": "Kniebeugen", "saetze": 3, "wiederholungen": "8", "intensitaet": "70%"}]}
+
+
+@pytest.mark.parametrize("filename", [storage.PLANS_FILE, storage.PERFORMANCE_FILE, storage.SETTINGS_FILE])
+def test_corrupt_file_is_not_loaded_as_empty(tmp_path, filename):
+    path = tmp_path / filename
+    path.write_text('{"plans": {"Kraft": [', encoding="utf-8")
+    with pytest.raises(storage.CorruptFileError) as info:
+        storage.FileBackend(str(tmp_path))
+    assert info.value.path.endswith(filename)
+    assert path.read_text(encoding="utf-8") == '{"plans": {"Kraft": ['
+
+
+def test_non_object_plans_file_is_corrupt(tmp_path):
+    (tmp_path / storage.PLANS_FILE).write_text("[]", encoding="utf-8")
+    with pytest.raises(storage.CorruptFileError):
+        storage.load_plans(str(tmp_path / storage.PLANS_FILE))
+
+
+def test_file_corrupted_while_open_is_never_overwritten(tmp_path):
+    db = storage.FileBackend(str(tmp_path))
+    db.create_plan("Kraft")
+    db.add_unit("Kraft", unit("A1"))
+    db.compact(storage.PLANS)
+    path = tmp_path / storage.PLANS_FILE
+    path.write_text("kaputt", encoding="utf-8")
+
+    with pytest.raises(storage.CorruptFileError):
+        db.refresh()
+    with pytest.raises(storage.CorruptFileError):
+        db.refresh()  # bleibt gemeldet, solange die Datei kaputt ist
+    db.add_unit("Kraft", unit("A2"))
+    with pytest.raises(storage.CorruptFileError):
+        db.flush()
+    with pytest.raises(storage.CorruptFileError):
+        db.compact(storage.PLANS)
+    assert path.read_text(encoding="utf-8") == "kaputt"
+    assert [u.schwerpunkt for u in db.units("Kraft")] == ["A1", "A2"]  # eigene Änderung bleibt vorgemerkt
+
+
+def test_atomic_write_keeps_file_mode(tmp_path):
+    path = tmp_path / "a.json"
+    atomic_write_json(str(path), 1)
+    os.chmod(path, 0o640)
+    atomic_write_json(str(path), 2)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
@@ -0,0 +1,30 @@
+"""Mandanten: Katalog und getrennte Speicher."""
+import os
+
+from athletikplus import storage, tenants
+
+
+def test_sqlite_database_per_tenant(tmp_path, monkeypatch):
+    catalog = tenants.Catalog(str(tmp_path))
+    other = catalog.add("TSV U17")
+    monkeypatch.delenv("ATHLETIKPLUS_DB", raising=False)
+    paths = {t: storage.sqlite_path(catalog.data_dir(t), t) for t in catalog.tenants()}
+    assert paths[other] == os.path.join(catalog.data_dir(other), storage.DB_FILE)
+    assert len(set(paths.values())) == 2
+
+    # Ohne Platzhalter nur für den Standard-Mandanten
+    monkeypatch.setenv("ATHLETIKPLUS_DB", str(tmp_path / "alt.db"))
+    default_dir = catalog.data_dir(tenants.DEFAULT_TENANT)
+    assert storage.sqlite_path(default_dir, tenants.DEFAULT_TENANT) == str(tmp_path / "alt.db")
+    assert storage.sqlite_path(catalog.data_dir(other), other) == paths[other]
+
+    monkeypatch.setenv("ATHLETIKPLUS_DB", str(tmp_path / "{mandant}.db"))
+    assert storage.sqlite_path(catalog.data_dir(other), other) == str(tmp_path / f"{other}.db")
+
+
+def test_concurrent_catalog_entries_are_kept(tmp_path):
+    a = tenants.Catalog(str(tmp_path))
+    b = tenants.Catalog(str(tmp_path))
+    first = a.add("Verein A")
+    second = b.add("Verein B")
+    assert set(tenants.Catalog(str(tmp_path)).tenants()) == {tenants.DEFAULT_TENANT, first, second}
@@ -0,0 +1,113 @@
+"""Trainingslast (ACWR, Wochensummen) und Messwert-Speicher, auf beiden Backends."""
+import math
+
+import pytest
+
+from athletikplus import sqlite_store, storage
+from athletikplus.timeseries import MeasurementStore, to_days, week_of
+
+LAST_DAY = int(to_days(["2026-03-29"])[0])
+
+
+@pytest.fixture(params=["files", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "sqlite":
+        db = sqlite_store.SqliteBackend(str(tmp_path / storage.DB_FILE), data_dir=str(tmp_path))
+        yield db
+        db.close()
+    else:
+        yield storage.FileBackend(str(tmp_path))
+
+
+def fill(backend):
+    """Kraft: drei Wochen täglich 1000 kg (Serie), dann eine Woche täglich 2000 kg; Technik: 30 Wdh. ohne Last."""
+    anna, ben, cem = backend.add_athletes([{"Name": "Anna", "Mannschaft": "Erste"},
+                                           {"Name": "Ben", "Mannschaft": "Zweite"}, {"Name": "Cem"}])
+    backend.create_plan("Kraft")
+    backend.create_plan("Technik")
+    backend.add_series("Kraft", {"start": "2026-03-02", "ende": "2026-03-22", "wochentage": list(range(7)),
+                                 "schwerpunkt": "Grundlage", "uebungen": [
+                                     {"name": "Kniebeuge", "saetze": 2, "wiederholungen": "10", "intensitaet": "50 kg"}]})
+    for day in range(23, 30):
+        backend.add_unit("Kraft", {"datum": f"2026-03-{day}", "schwerpunkt": "Aufbau", "uebungen": [
+            {"name": "Kniebeuge", "saetze": 4, "wiederholungen": "10", "intensitaet": "50 kg"}]})
+    backend.add_unit("Technik", {"datum": "2026-03-29", "schwerpunkt": "Sprung", "uebungen": [
+        {"name": "Box Jump", "saetze": 3, "wiederholungen": "8-12", "intensitaet": "Körpergewicht"}]})
+    backend.assign_plan("Kraft", teams=["Erste"])
+    backend.assign_plan("Technik", athletes=[ben])
+    return anna, ben, cem
+
+
+def test_acwr_values(backend):
+    fill(backend)
+    load = backend.training_load()
+
+    days, acute, chronic, ratio = load.acwr(plans=["Kraft"])
+    assert days[0] == to_days(["2026-03-02"])[0] and days[-1] == LAST_DAY
+    assert acute[-1] == 7 * 2000
+    assert chronic[-1] == (21 * 1000 + 7 * 2000) / 4
+    assert ratio[-1] == pytest.approx(1.6)
+    assert ratio[20] == pytest.approx(7000 / (21000 / 4))  # letzter Tag der Serie
+
+    by_plan = load.acwr_by_plan(day=LAST_DAY)
+    assert by_plan["Kraft"] == pytest.approx((14000, 8750, 1.6))
+    assert by_plan["Technik"][:2] == (0, 0) and math.isnan(by_plan["Technik"][2])
+    assert load.acwr_by_plan("wiederholungen", day=LAST_DAY)["Technik"] == pytest.approx((30, 7.5, 4.0))
+
+
+def test_acwr_by_athlete_follows_assignments(backend):
+    anna, ben, cem = fill(backend)
+    by_athlete = backend.training_load().acwr_by_athlete(backend.assignment_index(), backend.athlete_index(),
+                                                         "wiederholungen", day=LAST_DAY)
+    assert set(by_athlete) == {anna, ben}  # Cem hat keinen Plan
+    assert by_athlete[anna] == pytest.approx((7 * 40, (21 * 20 + 7 * 40) / 4, 280 / 175))
+    assert by_athlete[ben] == pytest.approx((30, 7.5, 4.0))
+
+
+def test_weekly_and_intensity(backend):
+    fill(backend)
+    load = backend.training_load()
+    weeks, sums = load.weekly("volumen", plans=["Kraft"])
+    assert weeks[0] == week_of(to_days(["2026-03-02"]))[0]
+    assert sums.tolist() == [7000, 7000, 7000, 14000]
+    assert load.weekly("saetze", plans=["Technik"])[1].tolist() == [3]
+    assert load.intensity_distribution().tolist() == [0] * 5  # keine %1RM-Angaben
+
+
+def test_cache_is_dropped_on_change(backend):
+    fill(backend)
+    before = backend.training_load().weekly("saetze", plans=["Technik"])[1].tolist()
+    backend.add_unit("Technik", {"datum": "2026-03-28", "schwerpunkt": "Sprung", "uebungen": [
+        {"name": "Hürden", "saetze": 5, "wiederholungen": "6", "intensitaet": "85 %"}]})
+    load = backend.training_load()
+    assert before == [3] and load.weekly("saetze", plans=["Technik"])[1].tolist() == [8]
+    assert load.intensity_distribution().tolist() == [0, 0, 0, 5, 0]
+
+
+def test_measurement_store():
+    store = MeasurementStore.from_performance({
+        "1": {"Sprint": [["2026-03-10", 4.2], ["2026-03-02", 4.4], ["kaputt", 1.0], ["2026-03-03", 4.3]]},
+        "2": {"Sprint": [["2026-03-02", 4.0], ["2026-03-03", 4.2]]},
+        "Anna": {"Sprint": [["2026-03-02", 9.9]]},  # ohne ID: wird nicht zugeordnet
+        "notiz": "alt",
+    })
+    assert store.athletes() == [1, 2] and len(store) == 5
+    assert store.series(1, "Sprint").values.tolist() == [4.4, 4.3, 4.2]
+    assert store.rolling_mean(1, "Sprint", 7).tolist() == pytest.approx([4.4, 4.35, 4.2])
+    assert store.personal_best(1, "Sprint", lower_is_better=True) == (int(to_days(["2026-03-10"])[0]), 4.2)
+    weeks, means, delta = store.week_over_week(1, "Sprint")
+    assert means.tolist() == pytest.approx([4.35, 4.2]) and delta[1] == pytest.approx(-0.15)
+
+    store.add(2, "Sprint", "2026-03-01", 5.0)  # vor dem ersten Wert: wird einsortiert
+    assert store.series(2, "Sprint").values.tolist() == [5.0, 4.0, 4.2]
+    weeks, team = store.team_aggregate([1, 2], "Sprint", how="max")
+    assert team.tolist() == pytest.approx([5.0, 4.35, 4.2])
+    assert store.team_aggregate([1, 2], "Sprint", how="count")[1].tolist() == [1, 2, 1]
+
+
+def test_backend_measurements_follow_records(backend):
+    anna, _, _ = fill(backend)
+    backend.record_measurement(anna, "CMJ", "2026-03-09", 41.0)
+    backend.measurements()  # aufgebaut, danach nur noch nachgeführt
+    backend.record_measurement(anna, "CMJ", "2026-03-02", 39.5)
+    assert backend.measurements().series(anna, "CMJ").values.tolist() == [39.5, 41.0]